@@ -0,0 +1,121 @@
+"""Benchmark element_detection.js on large generated DOMs.
+
+Runs the detection script against synthetic pages of increasing size and
+reports the median evaluate time. Pass ``--baseline`` with another version
+of the script to compare, e.g.
+
+    git show <rev>:src/donew/scripts/web/element_detection.js > /tmp/old.js
+    python benchmarks/bench_element_detection.py --baseline /tmp/old.js
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from playwright.async_api import Page, async_playwright
+from tabulate import tabulate
+
+SCRIPT = (
+    Path(__file__).resolve().parent.parent
+    / "src"
+    / "donew"
+    / "scripts"
+    / "web"
+    / "element_detection.js"
+)
+
+
+def generate_page(sections: int) -> str:
+    """A page with nested containers, labelled forms, links, buttons and hidden blocks."""
+    parts = ["<html><body><main>"]
+    for i in range(sections):
+        parts.append(f'<section class="s{i}"><div><div><h2>Section {i}</h2>')
+        parts.append(
+            f'<form><label for="name-{i}">Name {i}</label><input id="name-{i}" type="text">'
+            f"<label>Email <input type=\"email\" name=\"email-{i}\"></label>"
+            f'<select id="choice-{i}"><option>a</option><option>b</option></select>'
+            f'<textarea aria-label="Notes {i}"></textarea>'
+            f"<button type=\"submit\">Send {i}</button></form>"
+        )
+        parts.append("<ul>")
+        for j in range(5):
+            parts.append(f'<li><a href="/item/{i}/{j}">Item {i}.{j}</a></li>')
+        parts.append("</ul>")
+        parts.append(
+            f'<div style="display:none"><div><span>Hidden {i}</span>'
+            f"<button>Hidden action</button></div></div>"
+        )
+        parts.append(f'<p>Paragraph <em>{i}</em> with <b>inline</b> text.</p>')
+        parts.append("</div></div></section>")
+    parts.append("</main></body></html>")
+    return "".join(parts)
+
+
+async def time_script(page: Page, html: str, script: str, runs: int) -> Dict[str, float]:
+    """Median and best evaluate time over fresh copies of the page."""
+    samples: List[float] = []
+    count = 0
+    for _ in range(runs):
+        await page.set_content(html)
+        start = time.perf_counter()
+        result = await page.evaluate(script)
+        samples.append((time.perf_counter() - start) * 1000)
+        count = len(result)
+    return {
+        "median_ms": statistics.median(samples),
+        "best_ms": min(samples),
+        "elements": count,
+    }
+
+
+async def main(sizes: List[int], runs: int, baseline: Optional[Path], executable: Optional[str]) -> None:
+    scripts = {"current": SCRIPT.read_text()}
+    if baseline:
+        scripts["baseline"] = baseline.read_text()
+
+    launch = {"headless": True}
+    if executable:
+        launch["executable_path"] = executable
+
+    rows = []
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(**launch)
+        page = await browser.new_page()
+        for size in sizes:
+            html = generate_page(size)
+            nodes = await page.evaluate(
+                "html => new DOMParser().parseFromString(html, 'text/html').getElementsByTagName('*').length",
+                html,
+            )
+            results = {
+                name: await time_script(page, html, script, runs)
+                for name, script in scripts.items()
+            }
+            row = [size, nodes]
+            for name in scripts:
+                row += [results[name]["elements"], f"{results[name]['median_ms']:.1f}"]
+            if baseline:
+                speedup = results["baseline"]["median_ms"] / results["current"]["median_ms"]
+                row.append(f"{speedup:.2f}x")
+            rows.append(row)
+        await browser.close()
+
+    headers = ["sections", "nodes"]
+    for name in scripts:
+        headers += [f"{name} elements", f"{name} ms"]
+    if baseline:
+        headers.append("speedup")
+    print(tabulate(rows, headers=headers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, help="Another element_detection.js to compare")
+    parser.add_argument("--executable", help="Chromium executable to launch")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.runs, args.baseline, args.executable))
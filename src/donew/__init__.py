@@ -59,6 +59,35 @@ Please use the async methods (A_browse, A_new) instead.""",
 
         Args:
             **kwargs: Optional configuration dictionary {headless: bool, chrome_path: str}
+                - pool: Reuse warm browser contexts across sessions. True for defaults,
+                  or a dict of ContextPool options {min_size, max_size, idle_timeout}
+                - cdp_endpoint: Attach to a browser served by another process
+                  (see BrowserHost.serve) instead of launching one
+                - settle: Dict of SettleConfig options {quiet_ms, timeout_ms, long_request_ms,
+                  ignore_patterns} controlling when a page counts as loaded
+                - detection: "full" (default) re-detects elements per document, "incremental"
+                  keeps IDs stable and syncs only DOM changes after each action
+                - routing: Block requests by profile, "text-only", "no-media", "no-ads" or
+                  "no-third-party", or a dict {profile, allow, deny, block, third_party}
+                  with regex allow/deny patterns and resource types to block
+                - har: Record traffic to a HAR file or replay one offline, a dict of HarConfig
+                  options {path, mode: "record" | "replay", url, not_found: "abort" | "fallback"}
+                - cache: Share a disk cache of static assets across sessions. True for defaults,
+                  or a dict of AssetCache options {path, max_bytes, resource_types}
+                - history: Page history window, a dict of {keep, spill_dir}. Only the last
+                  `keep` pages stay in memory; older ones are spilled to disk and reloaded on access
+                - interactions: Interaction log, a dict of {capacity, sink, format, batch_size,
+                  flush_interval}. The last `capacity` records stay in memory; a `sink` path
+                  (.jsonl file or .parquet directory) streams every record to disk
+                - interaction_profile: How clicks and typing are performed, "human" (default,
+                  stepped pointer moves, pauses, key-by-key typing), "fast" (direct clicks,
+                  inputs filled at once) or "adaptive" (fast, human on sites where that fails).
+                  Each action's latency is recorded in the interaction log
+                - metrics: Collect site timings for WebBrowser.metrics(): long tasks, and the
+                  navigation and resource timings of pages a tab has left, which are kept when
+                  the tab navigates on. Off by default, as it adds an init script to every page
+                - state: Start from a browser state saved by WebBrowser.save_state(), a file
+                  path or dict of cookies, localStorage, sessionStorage and IndexedDB
 
         Returns:
             WebBrowser instance or sequence of WebBrowser instances
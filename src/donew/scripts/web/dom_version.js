@@ -0,0 +1,47 @@
+(() => {
+    // Counts changes to this document, so artifacts derived from it can be
+    // reused until the page actually changes. Installed as an init script.
+    if (window.DoSeeDom) {
+        return;
+    }
+    const state = {
+        // Tells documents apart, since every new document starts again at 0
+        document: Math.random().toString(36).slice(2),
+        version: 0
+    };
+    window.DoSeeDom = state;
+
+    function bump() {
+        state.version++;
+    }
+
+    function isOurs(node) {
+        // Annotation overlays
+        return node.nodeType === Node.ELEMENT_NODE && node.classList.contains('DoSee-highlight');
+    }
+
+    const observer = new MutationObserver(records => {
+        for (const record of records) {
+            if (record.type === 'attributes' && record.attributeName.startsWith('data-dosee')) {
+                continue;  // element IDs written by detection
+            }
+            if (record.type === 'childList' &&
+                [...record.addedNodes, ...record.removedNodes].every(isOurs)) {
+                continue;
+            }
+            bump();
+            return;
+        }
+    });
+    observer.observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true
+    });
+
+    // Form values are not mutations, and media queries follow the viewport
+    window.addEventListener('input', bump, true);
+    window.addEventListener('change', bump, true);
+    window.addEventListener('resize', bump);
+})();
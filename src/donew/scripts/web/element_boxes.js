@@ -0,0 +1,45 @@
+(ids) => {
+    // Current document-coordinate boxes of elements, for cropping them out of
+    // one page capture. Elements that a full-page capture does not show where
+    // their box says (fixed or sticky, or outside the page) are not croppable.
+    // The scroll offsets map page coordinates back to the viewport.
+    const nodes = (window.DoSee && window.DoSee.nodes) || new Map();
+    const root = document.documentElement;
+    const pageWidth = root.scrollWidth;
+    const pageHeight = root.scrollHeight;
+
+    function isPinned(node) {
+        for (let el = node; el; el = el.parentElement) {
+            const position = window.getComputedStyle(el).position;
+            if (position === 'fixed' || position === 'sticky') {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    const boxes = {};
+    for (const id of ids) {
+        const node = nodes.get(id) || document.querySelector(`[data-dosee-element-id='${id}']`);
+        if (!node || !node.isConnected) {
+            boxes[id] = null;
+            continue;
+        }
+        const rect = node.getBoundingClientRect();
+        if (rect.width <= 0 || rect.height <= 0) {
+            boxes[id] = { hidden: true };
+            continue;
+        }
+        const x = rect.x + window.scrollX;
+        const y = rect.y + window.scrollY;
+        const inside = x >= 0 && y >= 0 && x + rect.width <= pageWidth && y + rect.height <= pageHeight;
+        boxes[id] = {
+            x: x,
+            y: y,
+            width: rect.width,
+            height: rect.height,
+            croppable: inside && !isPinned(node)
+        };
+    }
+    return { scrollX: window.scrollX, scrollY: window.scrollY, boxes: boxes };
+}
@@ -1,35 +1,115 @@
-(() => {
-    function generateXPath(element) {
-        // If element has an ID that's not "undefined", use it
-        if (element.id && element.id !== "undefined") {
-            return `xpath=//*[@id="${element.id}"]`;
+(options) => {
+    options = options || {};
+    const DoSee = window.DoSee = window.DoSee || {};
+
+    const INTERACTIVE_ROLES = new Set(['option', 'menuitem', 'tab', 'switch', 'checkbox', 'radio', 'button', 'link']);
+    const FORM_TAGS = new Set(['INPUT', 'SELECT', 'TEXTAREA']);
+
+    // XPaths are built top-down during the walk: each parent numbers its children once,
+    // and paths restart from the nearest ancestor with a document-unique ID.
+    function createIdIndex() {
+        const counts = new Map();
+        for (const element of document.querySelectorAll('[id]')) {
+            counts.set(element.id, (counts.get(element.id) || 0) + 1);
         }
+        return {
+            anchor(element) {
+                const id = element.id;
+                if (!id || id === 'undefined' || id.includes('"') || counts.get(id) !== 1) {
+                    return null;
+                }
+                return `//*[@id="${id}"]`;
+            }
+        };
+    }
 
-        // Generate path without relying on ID
-        const path = [];
-        let current = element;
+    function childPaths(parent, parentPath, ids) {
+        // One pass to count tags, one to assign positions; XPath indices count every same-tag sibling
+        const children = parent.children;
+        const counts = new Map();
+        for (const child of children) {
+            counts.set(child.tagName, (counts.get(child.tagName) || 0) + 1);
+        }
+        const seen = new Map();
+        const paths = new Array(children.length);
+        for (let i = 0; i < children.length; i++) {
+            const child = children[i];
+            const index = (seen.get(child.tagName) || 0) + 1;
+            seen.set(child.tagName, index);
+
+            const anchor = ids.anchor(child);
+            if (anchor) {
+                paths[i] = anchor;
+            } else if (counts.get(child.tagName) > 1) {
+                paths[i] = `${parentPath}/${child.tagName.toLowerCase()}[${index}]`;
+            } else {
+                paths[i] = `${parentPath}/${child.tagName.toLowerCase()}`;
+            }
+        }
+        return paths;
+    }
 
+    function pathOf(element, ids) {
+        // Bottom-up path for the root of a walk; everything below it is built top-down
+        const segments = [];
+        let current = element;
         while (current && current.nodeType === Node.ELEMENT_NODE) {
+            const anchor = ids.anchor(current);
+            if (anchor) {
+                return [anchor, ...segments].join('/');
+            }
             let selector = current.tagName.toLowerCase();
-
-            // Add index if there are siblings
-            const siblings = Array.from(current.parentNode?.children || [])
-                .filter(e => e.tagName === current.tagName);
-
-            if (siblings.length > 1) {
-                const index = siblings.indexOf(current) + 1;
-                selector += `[${index}]`;
+            const parent = current.parentNode;
+            if (parent && parent.children) {
+                let index = 0;
+                let total = 0;
+                for (const sibling of parent.children) {
+                    if (sibling.tagName === current.tagName) {
+                        total++;
+                        if (sibling === current) {
+                            index = total;
+                        }
+                    }
+                }
+                if (total > 1) {
+                    selector += `[${index}]`;
+                }
             }
+            segments.unshift(selector);
+            current = parent;
+        }
+        return `//${segments.join('/')}`;
+    }
 
-            path.unshift(selector);
-            current = current.parentNode;
+    // Label lookups are indexed once per pass instead of queried per element
+    function createLabelIndex() {
+        const byFor = new Map();
+        for (const label of document.querySelectorAll('label[for]')) {
+            const key = label.getAttribute('for');
+            if (!byFor.has(key)) {
+                byFor.set(key, label);
+            }
         }
+        const wrappingText = new Map();
 
-        // Return XPath with xpath= prefix
-        return `xpath=//${path.join('/')}`;
+        return {
+            forId(id) {
+                const label = byFor.get(id);
+                return label ? label.textContent.trim() : undefined;
+            },
+            wrapping(label) {
+                // Label text excluding the inputs it wraps, computed once per label
+                if (!wrappingText.has(label)) {
+                    const clone = label.cloneNode(true);
+                    clone.querySelectorAll('input, select, textarea').forEach(input => input.remove());
+                    wrappingText.set(label, clone.textContent.trim());
+                }
+                return wrappingText.get(label);
+            }
+        };
     }
 
-    function findElementLabel(element) {
+    function findElementLabel(element, ctx, labels) {
         // Case 1: Check for aria-label attribute
         const ariaLabel = element.getAttribute('aria-label');
         if (ariaLabel) {
@@ -47,23 +127,15 @@
 
         // Case 3: Check for associated label using 'for' attribute
         if (element.id) {
-            const labelElement = document.querySelector(`label[for="${element.id}"]`);
-            if (labelElement) {
-                return labelElement.textContent.trim();
+            const labelText = labels.forId(element.id);
+            if (labelText !== undefined) {
+                return labelText;
             }
         }
 
         // Case 4: Check if element is wrapped in a label
-        let parent = element.parentElement;
-        while (parent) {
-            if (parent.tagName === 'LABEL') {
-                // Get label text excluding the input's own text
-                const clone = parent.cloneNode(true);
-                const inputs = clone.querySelectorAll('input, select, textarea');
-                inputs.forEach(input => input.remove());
-                return clone.textContent.trim();
-            }
-            parent = parent.parentElement;
+        if (ctx.label) {
+            return labels.wrapping(ctx.label);
         }
 
         // Case 5: Check for placeholder as fallback
@@ -75,50 +147,50 @@
         return null;
     }
 
-    function processClickableElement(element) {
-        // Process buttons and links
-        let elementType = 'text';
-        if (element.tagName === 'BUTTON' || element.getAttribute('role') === 'button') {
-            elementType = 'button';
-        } else if (element.tagName === 'A') {
-            elementType = 'link';
-        }
-
-        return {
-            elementType,
-            isInteractive: true
-        };
-    }
-
-    function processFormElement(element) {
-        // Process input, select, and textarea elements
-        const elementType = 'input';
-        const elementLabel = findElementLabel(element);
+    function classifyElement(element, style, ctx, labels) {
+        const tag = element.tagName;
 
-        return {
-            elementType,
-            elementLabel,
-            isInteractive: true
-        };
-    }
+        if (tag.toUpperCase() === 'SVG') {
+            return { elementType: 'image', elementLabel: null, isInteractive: false };
+        }
+        if (tag === 'BUTTON' || tag === 'A') {
+            // Process buttons and links
+            let elementType = 'text';
+            if (tag === 'BUTTON' || element.getAttribute('role') === 'button') {
+                elementType = 'button';
+            } else if (tag === 'A') {
+                elementType = 'link';
+            }
+            return { elementType, elementLabel: null, isInteractive: true };
+        }
+        if (FORM_TAGS.has(tag)) {
+            return { elementType: 'input', elementLabel: findElementLabel(element, ctx, labels), isInteractive: true };
+        }
+        if (tag === 'IMG' || element.getAttribute('role') === 'img') {
+            return { elementType: 'image', elementLabel: null, isInteractive: false };
+        }
+        if (tag === 'TABLE') {
+            return { elementType: 'table', elementLabel: null, isInteractive: false };
+        }
 
-    function processElementsPotentiallyClickable(element) {
+        // Elements that are potentially clickable
         let isInteractive = false;
         let elementType = 'text';
 
         // Check for interactive ARIA roles
         const role = element.getAttribute('role');
-        const interactiveRoles = ['option', 'menuitem', 'tab', 'switch', 'checkbox', 'radio', 'button', 'link'];
-        if (role && interactiveRoles.includes(role.toLowerCase())) {
+        if (role && INTERACTIVE_ROLES.has(role.toLowerCase())) {
             isInteractive = true;
             elementType = role.toLowerCase();
         }
 
         // Check for tabindex attribute which indicates focusability
-        const tabindexAttr = element.getAttribute('tabindex');
-        if (!isInteractive && tabindexAttr !== null && !isNaN(parseInt(tabindexAttr, 10)) && parseInt(tabindexAttr, 10) >= 0) {
-            isInteractive = true;
-            elementType = 'clickable';
+        if (!isInteractive) {
+            const tabindex = parseInt(element.getAttribute('tabindex'), 10);
+            if (!isNaN(tabindex) && tabindex >= 0) {
+                isInteractive = true;
+                elementType = 'clickable';
+            }
         }
 
         // Check for inline onclick attribute or defined onclick property
@@ -127,28 +199,26 @@
             elementType = 'clickable';
         }
 
-        // Check computed style for pointer cursor
-        if (!isInteractive) {
-            const computedStyle = window.getComputedStyle(element);
-            if (computedStyle.cursor === 'pointer') {
-                isInteractive = true;
-                elementType = 'clickable';
-            }
+        // Check computed style for pointer cursor (hidden subtrees have no style)
+        if (!isInteractive && style && style.cursor === 'pointer') {
+            isInteractive = true;
+            elementType = 'clickable';
         }
 
-        // Derive a label if available using the existing findElementLabel function
-        const elementLabel = findElementLabel(element);
-
-        return {
-            elementType,
-            elementLabel,
-            isInteractive
-        };
+        return { elementType, elementLabel: findElementLabel(element, ctx, labels), isInteractive };
     }
 
-    function getElementMetadata(element, elementId) {
-        const rect = element.getBoundingClientRect();
-        const computedStyle = window.getComputedStyle(element);
+    function readMetadata(element, elementId, ctx, labels, path) {
+        // Read-only: nothing here may write to the DOM, so layout is computed once per pass.
+        // Subtrees under display:none are never rendered, so their style and layout reads are skipped.
+        const rect = ctx.hidden ? null : element.getBoundingClientRect();
+
+        // Empty leaves without area cannot be seen or clicked and pass nothing on to children,
+        // so their style is only read when their markup alone makes them interactive
+        const bare = !!rect && element.childElementCount === 0 && (rect.width === 0 || rect.height === 0);
+        let elementInfo = bare ? classifyElement(element, null, ctx, labels) : null;
+        const style = ctx.hidden || (bare && !elementInfo.isInteractive) ? null : window.getComputedStyle(element);
+        elementInfo = elementInfo || classifyElement(element, style, ctx, labels);
 
         // Get attributes
         const attributes = {};
@@ -156,107 +226,418 @@
             attributes[attr.name] = attr.value;
         }
 
-        // Process by element type
-        let elementInfo = {
-            elementType: 'text',
-            elementLabel: null,
-            isInteractive: false
-        };
+        // Positioned elements with a z-index open a stacking context; everything else paints at its parent's level
+        const zIndex = style && style.position !== 'static' && style.zIndex !== 'auto'
+            ? parseInt(style.zIndex, 10)
+            : NaN;
 
-        if (element.tagName.toUpperCase() === 'SVG') {
-            elementInfo = { elementType: 'image', isInteractive: false };
-        } else if (['BUTTON', 'A'].includes(element.tagName)) {
-            elementInfo = processClickableElement(element);
-        } else if (['INPUT', 'SELECT', 'TEXTAREA'].includes(element.tagName)) {
-            elementInfo = processFormElement(element);
-        } else if (element.tagName === 'IMG' || element.getAttribute('role') === 'img') {
-            elementInfo = { elementType: 'image', isInteractive: false };
-        } else if (element.tagName === 'TABLE') {
-            elementInfo = { elementType: 'table', isInteractive: false };
-        } else {
-            elementInfo = processElementsPotentiallyClickable(element);
-        }
-
-        // Return the same ElementMetadata structure as before
         return {
             element_id: elementId,
             element_name: element.tagName.toLowerCase(),
-            element_html: element.outerHTML,
             element_label: elementInfo.elementLabel,
-            xpath: generateXPath(element),
-            bounding_box: {
-                x: rect.x,
-                y: rect.y,
-                width: rect.width,
-                height: rect.height
-            },
+            xpath: `xpath=${path}`,
+            bounding_box: rect
+                ? { x: rect.x, y: rect.y, width: rect.width, height: rect.height }
+                : { x: 0, y: 0, width: 0, height: 0 },
             is_interactive: elementInfo.isInteractive,
             element_type: elementInfo.elementType,
             attributes: attributes,
-            computed_styles: {
-                display: computedStyle.display,
-                visibility: computedStyle.visibility,
-                position: computedStyle.position
-            },
+            computed_styles: style
+                ? { display: style.display, visibility: style.visibility, position: style.position }
+                : null,
             listeners: Object.keys(element).filter(key => key.startsWith('on')),
-            parent_id: element.parentElement ? parseInt(element.parentElement.dataset.doseeElementId) : null,
-            children_ids: Array.from(element.children)
-                .map(child => parseInt(child.dataset.doseeElementId))
-                .filter(id => !isNaN(id)),
+            parent_id: ctx.parentId,
+            z_index: isNaN(zIndex) ? ctx.z : zIndex,
+            children_ids: [],
+            unstyled: bare && !style,  // not known to be hidden, see isHidden
             state: {
-                isVisible: computedStyle.display !== 'none' && computedStyle.visibility !== 'hidden',
+                isVisible: !!style && style.display !== 'none' && style.visibility !== 'hidden',
                 isEnabled: !element.disabled,
                 isChecked: element.checked
             }
         };
     }
 
-    function detectElements() {
-        const elements = {};
-        let elementId = 1;
+    // Only these fields go back to Python; the rest stays in window.DoSeeElements until asked for
+    const SUMMARY_FIELDS = ['element_id', 'element_name', 'element_label', 'xpath', 'bounding_box',
+        'is_interactive', 'element_type', 'parent_id', 'children_ids', 'z_index'];
+
+    function summarize(elements) {
+        const summaries = {};
+        for (const id in elements) {
+            const metadata = elements[id];
+            const summary = {};
+            for (const key of SUMMARY_FIELDS) {
+                summary[key] = metadata[key];
+            }
+            summaries[id] = summary;
+        }
+        return summaries;
+    }
 
-        function processElement(element) {
-            // Skip script and style elements
-            if (!element || element.tagName === 'SCRIPT' || element.tagName === 'STYLE') {
-                return;
+    function elementDetails(ids, generation) {
+        // Heavy fields for the requested elements, or null if a newer detection replaced them
+        if (generation !== DoSee.generation) {
+            return null;
+        }
+        const elements = window.DoSeeElements || {};
+        const details = {};
+        for (const id of ids) {
+            const metadata = elements[id];
+            const node = DoSee.nodes.get(id);
+            if (!metadata) {
+                continue;
             }
+            details[id] = {
+                // outerHTML is only built on request, it grows with nesting depth
+                element_html: node ? node.outerHTML : '',
+                attributes: metadata.attributes,
+                computed_styles: metadata.computed_styles,
+                listeners: metadata.listeners,
+                state: metadata.state
+            };
+        }
+        return details;
+    }
 
-            // Set unique element ID
-            element.dataset.doseeElementId = elementId;
+    function isSkipped(element) {
+        // Skip script and style elements, and our own annotation overlays
+        return !element
+            || element.tagName === 'SCRIPT'
+            || element.tagName === 'STYLE'
+            || (element.classList && element.classList.contains('DoSee-highlight'));
+    }
+
+    function trackedId(node) {
+        // IDs live in a WeakMap so clones (which copy data attributes) are never mistaken for originals
+        const id = node ? DoSee.ids.get(node) : undefined;
+        return id === undefined ? NaN : id;
+    }
+
+    function isHidden(metadata) {
+        // Without styles the element was either under display:none or a bare leaf, which may gain children later
+        if (!metadata || !metadata.computed_styles) {
+            return !metadata || !metadata.unstyled;
+        }
+        return metadata.computed_styles.display === 'none';
+    }
 
-            // Get element metadata
-            elements[elementId] = getElementMetadata(element, elementId);
-            elementId++;
+    function walk(root, rootCtx, elements, labels, ids, writes) {
+        // Iterative pre-order traversal; children are pushed in reverse so IDs follow document order
+        const stack = [[root, rootCtx, pathOf(root, ids)]];
+        while (stack.length) {
+            const [element, ctx, path] = stack.pop();
+            if (isSkipped(element)) {
+                continue;
+            }
+
+            // Keep the ID of elements we have seen before, so unchanged nodes stay stable
+            let elementId = trackedId(element);
+            if (isNaN(elementId)) {
+                elementId = DoSee.nextId++;
+                DoSee.ids.set(element, elementId);
+                writes.push([element, elementId]);
+            }
+            DoSee.nodes.set(elementId, element);
+
+            const metadata = readMetadata(element, elementId, ctx, labels, path);
+            elements[elementId] = metadata;
+            if (ctx.parent) {
+                ctx.parent.children_ids.push(elementId);
+            }
 
             // Skip processing children for SVG elements
             if (element.tagName.toUpperCase() === 'SVG') {
-                return;
+                continue;
             }
 
-            // Process children
-            for (const child of element.children) {
-                processElement(child);
+            const childCtx = {
+                parentId: elementId,
+                parent: metadata,
+                hidden: isHidden(metadata),
+                label: element.tagName === 'LABEL' ? element : ctx.label,
+                z: metadata.z_index
+            };
+            const paths = childPaths(element, path, ids);
+            for (let i = element.children.length - 1; i >= 0; i--) {
+                stack.push([element.children[i], childCtx, paths[i]]);
             }
         }
+    }
+
+    function applyWrites(writes) {
+        // All DOM writes happen after all reads
+        for (const [element, elementId] of writes) {
+            element.dataset.doseeElementId = elementId;
+        }
+    }
+
+    function contextFor(node, elements) {
+        // Rebuild the traversal context of a node from its tracked parent
+        const parentId = trackedId(node.parentElement);
+        const parent = isNaN(parentId) ? null : elements[parentId];
+        return {
+            parentId: parent ? parentId : null,
+            parent: null,
+            hidden: parent ? isHidden(parent) : false,
+            label: node.parentElement ? node.parentElement.closest('label') : null,
+            z: parent ? parent.z_index : 0
+        };
+    }
+
+    function detectElements() {
+        const elements = {};
+        const writes = [];
+        DoSee.nextId = 1;
+        DoSee.nodes = new Map();
+        DoSee.ids = new WeakMap();
 
         // Start processing from documentElement (html) or body if available
-        const startElement = document.body || document.documentElement;
+        const startElement = document.body || document.documentElement || document.firstElementChild;
         if (startElement) {
-            processElement(startElement);
-        } else {
-            // If no html/body (e.g. raw SVG), process the first child
-            const firstElement = document.firstElementChild;
-            if (firstElement) {
-                processElement(firstElement);
-            }
+            walk(startElement, { parentId: null, parent: null, hidden: false, label: null, z: 0 }, elements, createLabelIndex(), createIdIndex(), writes);
         }
+        applyWrites(writes);
 
         // Store elements globally for annotation system
         window.DoSeeElements = elements;
 
-        return elements;
+        return summarize(elements);
+    }
+
+    function refreshPaths(root, ids, elements, delta) {
+        // Sibling positions under root may have shifted; re-derive the paths of its tracked subtree
+        const stack = [[root, pathOf(root, ids)]];
+        while (stack.length) {
+            const [element, path] = stack.pop();
+            const id = trackedId(element);
+            const metadata = isNaN(id) ? null : elements[id];
+            if (metadata && metadata.xpath !== `xpath=${path}`) {
+                metadata.xpath = `xpath=${path}`;
+                if (!delta.added[id]) {
+                    delta.changed[id] = metadata;
+                }
+            }
+            if (isSkipped(element) || element.tagName.toUpperCase() === 'SVG') {
+                continue;
+            }
+            const paths = childPaths(element, path, ids);
+            for (let i = element.children.length - 1; i >= 0; i--) {
+                stack.push([element.children[i], paths[i]]);
+            }
+        }
+    }
+
+    function refreshBoxes(roots, elements, delta) {
+        // Descendants can only move if their ancestor's box did or something inside it changed,
+        // so the walk stops at clean subtrees whose root kept its box. Null roots read every box.
+        const onPath = new Set();
+        for (const root of roots || []) {
+            for (let node = root; node && !onPath.has(node); node = node.parentElement) {
+                onPath.add(node);
+            }
+        }
+        const start = document.body || document.documentElement;
+        const stack = start ? [start] : [];
+        while (stack.length) {
+            const node = stack.pop();
+            const id = trackedId(node);
+            const metadata = isNaN(id) ? null : elements[id];
+            let moved = false;
+            if (metadata && !isHidden(metadata) && !delta.added[id] && !delta.changed[id]) {
+                const rect = node.getBoundingClientRect();
+                const box = metadata.bounding_box;
+                if (box.x !== rect.x || box.y !== rect.y || box.width !== rect.width || box.height !== rect.height) {
+                    metadata.bounding_box = { x: rect.x, y: rect.y, width: rect.width, height: rect.height };
+                    delta.boxes[id] = metadata.bounding_box;
+                    moved = true;
+                }
+            }
+            if (roots && !moved && !onPath.has(node)) {
+                continue;
+            }
+            if (isSkipped(node) || (metadata && isHidden(metadata)) || node.tagName.toUpperCase() === 'SVG') {
+                continue;
+            }
+            for (const child of node.children) {
+                stack.push(child);
+            }
+        }
+    }
+
+    // Events after which boxes may have moved without any DOM mutation
+    const LAYOUT_EVENTS = ['scroll', 'resize', 'load', 'transitionend', 'animationend'];
+
+    function stopObserving() {
+        if (DoSee.observer) {
+            DoSee.observer.disconnect();
+        }
+        if (DoSee.resizes) {
+            DoSee.resizes.disconnect();
+        }
+        if (DoSee.onLayout) {
+            for (const type of LAYOUT_EVENTS) {
+                window.removeEventListener(type, DoSee.onLayout, true);
+            }
+        }
+        DoSee.observing = false;
+    }
+
+    function installObserver() {
+        stopObserving();
+        DoSee.dirty = { added: new Set(), removed: new Set(), changed: new Set(), moved: new Set(), layout: new Set(), viewport: false };
+
+        // Scrolling, loaded images and fonts, transitions and animations move boxes without
+        // mutating the DOM; the window scrolling or resizing moves all of them
+        DoSee.onLayout = event => {
+            const target = event.target;
+            if (target && target.nodeType === Node.ELEMENT_NODE) {
+                DoSee.dirty.layout.add(target);
+            } else if (event.type === 'scroll' || event.type === 'resize') {
+                DoSee.dirty.viewport = true;
+            }
+        };
+        for (const type of LAYOUT_EVENTS) {
+            window.addEventListener(type, DoSee.onLayout, { capture: true, passive: true });
+        }
+
+        // Reflows that change an element's size, e.g. a late web font or a media query
+        DoSee.resizes = new ResizeObserver(entries => {
+            const elements = window.DoSeeElements || {};
+            for (const entry of entries) {
+                const metadata = elements[trackedId(entry.target)];
+                const size = entry.borderBoxSize && entry.borderBoxSize[0];
+                // Observing reports every element once; skip the ones still at their recorded size
+                if (metadata && size && metadata.bounding_box.width === size.inlineSize
+                    && metadata.bounding_box.height === size.blockSize) {
+                    continue;
+                }
+                DoSee.dirty.layout.add(entry.target);
+            }
+        });
+        for (const node of DoSee.nodes.values()) {
+            DoSee.resizes.observe(node);
+        }
+
+        DoSee.observer = new MutationObserver(records => {
+            const dirty = DoSee.dirty;
+            for (const record of records) {
+                const target = record.type === 'characterData'
+                    ? record.target.parentElement
+                    : record.target;
+                if (!target || (target.closest && target.closest('.DoSee-highlight'))) {
+                    continue;
+                }
+                if (record.type === 'attributes' && record.attributeName === 'data-dosee-element-id') {
+                    continue;
+                }
+                dirty.changed.add(target);
+                if (record.type === 'childList' || record.attributeName === 'id') {
+                    // Paths below this node may no longer hold
+                    dirty.moved.add(target);
+                }
+                if (record.type === 'childList') {
+                    record.addedNodes.forEach(node => {
+                        if (node.nodeType === Node.ELEMENT_NODE) dirty.added.add(node);
+                    });
+                    record.removedNodes.forEach(node => {
+                        if (node.nodeType === Node.ELEMENT_NODE) dirty.removed.add(node);
+                    });
+                }
+            }
+        });
+        DoSee.observer.observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            characterData: true
+        });
+        DoSee.observing = true;
+    }
+
+    function collectDelta() {
+        const elements = window.DoSeeElements || {};
+        const dirty = DoSee.dirty;
+        DoSee.dirty = { added: new Set(), removed: new Set(), changed: new Set(), moved: new Set(), layout: new Set(), viewport: false };
+        const delta = { added: {}, removed: [], changed: {}, boxes: {} };
+        const labels = createLabelIndex();
+        const ids = createIdIndex();
+        const writes = [];
+
+        // Removed subtrees: forget every tracked node that left the document
+        for (const node of dirty.removed) {
+            if (node.isConnected) {
+                continue;  // moved, handled as added
+            }
+            const subtree = [node, ...node.querySelectorAll('[data-dosee-element-id]')];
+            for (const el of subtree) {
+                const id = trackedId(el);
+                if (!isNaN(id)) {
+                    DoSee.resizes.unobserve(el);
+                    DoSee.nodes.delete(id);
+                    delete elements[id];
+                    delta.removed.push(id);
+                }
+            }
+        }
+
+        // Added subtrees get new IDs; moved nodes keep theirs
+        for (const node of dirty.added) {
+            if (!node.isConnected || isSkipped(node) || delta.added[trackedId(node)]) {
+                continue;  // gone again, ignored, or covered by an added ancestor
+            }
+            const fresh = {};
+            walk(node, contextFor(node, elements), fresh, labels, ids, writes);
+            for (const [id, metadata] of Object.entries(fresh)) {
+                elements[id] = metadata;
+                delta.added[id] = metadata;
+                DoSee.resizes.observe(DoSee.nodes.get(Number(id)));
+            }
+            if (node.parentElement) {
+                dirty.changed.add(node.parentElement);
+            }
+        }
+
+        // Changed attributes, text or children: refresh the element's own metadata
+        for (const node of dirty.changed) {
+            const id = trackedId(node);
+            if (isNaN(id) || !node.isConnected || delta.added[id]) {
+                continue;
+            }
+            const metadata = readMetadata(node, id, contextFor(node, elements), labels, pathOf(node, ids));
+            metadata.children_ids = Array.from(node.children).map(trackedId).filter(child => !isNaN(child));
+            elements[id] = metadata;
+            delta.changed[id] = metadata;
+        }
+
+        // Layout may have shifted around the mutations; only ship boxes that moved
+        refreshBoxes(dirty.viewport ? null : [...dirty.changed, ...dirty.added, ...dirty.moved, ...dirty.layout], elements, delta);
+
+        // Inserted or removed siblings shift the positions in later paths
+        for (const node of dirty.moved) {
+            if (node.isConnected && node.nodeType === Node.ELEMENT_NODE) {
+                refreshPaths(node, ids, elements, delta);
+            }
+        }
+
+        applyWrites(writes);
+        window.DoSeeElements = elements;
+        delta.added = summarize(delta.added);
+        delta.changed = summarize(delta.changed);
+        return delta;
     }
 
+    DoSee.detect = detectElements;
+    DoSee.delta = collectDelta;
+    DoSee.details = elementDetails;
+    DoSee.generation = options.generation;
+
     // Execute and return results
-    return detectElements();
-})(); 
\ No newline at end of file
+    const result = detectElements();
+    if (options.observe) {
+        installObserver();
+    } else {
+        stopObserving();
+    }
+    return result;
+}
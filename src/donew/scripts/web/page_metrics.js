@@ -0,0 +1,59 @@
+(slowest) => {
+    // Navigation Timing phases, Resource Timing summed per initiator type
+    // with the slowest resources, and the long tasks seen so far.
+    const round = value => Math.round(value * 10) / 10;
+    const navigation = {};
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        const phases = {
+            redirect: [nav.redirectStart, nav.redirectEnd],
+            dns: [nav.domainLookupStart, nav.domainLookupEnd],
+            connect: [nav.connectStart, nav.connectEnd],
+            tls: [nav.secureConnectionStart, nav.connectEnd],
+            ttfb: [nav.requestStart, nav.responseStart],
+            download: [nav.responseStart, nav.responseEnd],
+            // Milestones, from the start of the navigation
+            dom_interactive: [null, nav.domInteractive],
+            dom_content_loaded: [null, nav.domContentLoadedEventEnd],
+            load: [null, nav.loadEventEnd]
+        };
+        for (const [name, [start, end]] of Object.entries(phases)) {
+            // A start of 0 means the phase did not happen (no redirect, plain http)
+            if (end > 0 && start !== 0) {
+                navigation[name] = round(end - (start || 0));
+            }
+        }
+        navigation.transfer_bytes = nav.transferSize;
+    }
+
+    const resources = {};
+    const entries = performance.getEntriesByType('resource');
+    for (const entry of entries) {
+        const type = entry.initiatorType || 'other';
+        const summary = resources[type] || (resources[type] = { count: 0, duration_ms: 0, transfer_bytes: 0 });
+        summary.count++;
+        summary.duration_ms = round(summary.duration_ms + entry.duration);
+        summary.transfer_bytes += entry.transferSize || 0;
+    }
+    const slowestResources = [...entries]
+        .sort((a, b) => b.duration - a.duration)
+        .slice(0, slowest)
+        .map(entry => ({
+            url: entry.name,
+            type: entry.initiatorType,
+            start_ms: round(entry.startTime),
+            duration_ms: round(entry.duration),
+            transfer_bytes: entry.transferSize || 0
+        }));
+
+    const perf = window.DoSeePerf || { longTasks: [] };
+    return {
+        navigation: navigation,
+        resources: resources,
+        slowest: slowestResources,
+        longTasks: perf.longTasks.map(task => ({
+            start_ms: round(task.start_ms),
+            duration_ms: round(task.duration_ms)
+        }))
+    };
+}
@@ -0,0 +1,24 @@
+(() => {
+    // Long tasks are only reported to observers, so they are collected from
+    // the start of every document. Installed as an init script.
+    if (window.DoSeePerf) {
+        return;
+    }
+    const perf = { longTasks: [], dropped: 0 };
+    window.DoSeePerf = perf;
+    try {
+        // The default buffer of 250 entries fills up on heavy pages
+        performance.setResourceTimingBufferSize(2000);
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) {
+                if (perf.longTasks.length < 500) {
+                    perf.longTasks.push({ start_ms: entry.startTime, duration_ms: entry.duration });
+                } else {
+                    perf.dropped++;
+                }
+            }
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {
+        // Long tasks are not supported by this browser
+    }
+})();
@@ -0,0 +1,47 @@
+async ({ quietMs, timeoutMs }) => {
+    // Resolves once the DOM and layout have been unchanged for quietMs
+    const start = performance.now();
+    let lastChange = start;
+    let mutations = 0;
+
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastChange = performance.now();
+    });
+    observer.observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true
+    });
+
+    function layoutSignature() {
+        const root = document.documentElement;
+        if (!root) {
+            return '';
+        }
+        return `${root.scrollWidth}x${root.scrollHeight}:${document.body ? document.body.childElementCount : 0}`;
+    }
+
+    let layout = layoutSignature();
+
+    return await new Promise(resolve => {
+        function check() {
+            const now = performance.now();
+            const current = layoutSignature();
+            if (current !== layout) {
+                layout = current;
+                lastChange = now;
+            }
+
+            const quiet = now - lastChange >= quietMs;
+            if (quiet || now - start >= timeoutMs) {
+                observer.disconnect();
+                resolve({ elapsed: now - start, mutations, timedOut: !quiet });
+                return;
+            }
+            setTimeout(check, Math.min(50, quietMs));
+        }
+        setTimeout(check, Math.min(50, quietMs));
+    });
+}
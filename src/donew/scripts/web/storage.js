@@ -0,0 +1,30 @@
+(state) => {
+    // Apply and read localStorage and sessionStorage in one round trip.
+    // A null value removes the key. Keys written by state seeding are hidden.
+    const MARKER = '__dosee_state__';
+
+    function apply(storage, items) {
+        for (const [key, value] of Object.entries(items || {})) {
+            if (value === null || value === undefined) {
+                storage.removeItem(key);
+            } else {
+                storage.setItem(key, String(value));
+            }
+        }
+    }
+
+    function read(storage) {
+        return Object.fromEntries(
+            Object.entries(storage).filter(([key]) => !key.startsWith(MARKER))
+        );
+    }
+
+    if (state) {
+        apply(localStorage, state.localStorage);
+        apply(sessionStorage, state.sessionStorage);
+    }
+    return {
+        localStorage: read(localStorage),
+        sessionStorage: read(sessionStorage)
+    };
+}
@@ -0,0 +1,32 @@
+(seed) => {
+    // Seed saved Web Storage into documents of the saved origins. Each
+    // storage area of an origin is seeded once per saved state, marked by a
+    // key, so changes the page makes afterwards are kept across navigations.
+    const entry = seed.origins[location.origin];
+    if (!entry) {
+        return;
+    }
+    const marker = `__dosee_state__:${seed.id}`;
+
+    function fill(name, items) {
+        if (!items || !items.length) {
+            return;
+        }
+        let storage;
+        try {
+            storage = window[name];  // throws in sandboxed and opaque origins
+        } catch (e) {
+            return;
+        }
+        if (storage.getItem(marker) !== null) {
+            return;
+        }
+        for (const item of items) {
+            storage.setItem(item.name, item.value);
+        }
+        storage.setItem(marker, '1');
+    }
+
+    fill('localStorage', entry.localStorage);
+    fill('sessionStorage', entry.sessionStorage);
+}
@@ -0,0 +1,225 @@
+(elementId) => {
+    /**
+     * Serialize the visible text of the page, or of one element, the way
+     * innerText would, with interactive elements replaced by
+     * "@<id> - <text>" markers. Reads only, the page is never modified.
+     *
+     * Only the ancestors of interactive elements are walked here; every
+     * other subtree contributes its native innerText.
+     */
+    const elements = window.DoSeeElements || {};
+    const nodes = window.DoSee && window.DoSee.nodes;
+
+    function nodeOf(id) {
+        return (nodes && nodes.get(Number(id))) ||
+            document.querySelector(`[data-dosee-element-id='${id}']`);
+    }
+
+    /**
+     * Fallback label for interactive elements without visible text:
+     * aria-label, image alt texts, title, child aria-labels and SVG text,
+     * form values and placeholders, and the selected option of selects.
+     *
+     * Common cases handled:
+     * - <a href="..."><img alt="Logo"></a>
+     * - <a href="..." aria-label="Search"><i class="fa fa-search"></i></a>
+     * - <button aria-label="Close"><svg>...</svg></button>
+     * - <input type="submit" value="Submit">
+     * - <select><option value="1">Option 1</option></select>
+     */
+    function extractElementText(elem) {
+        let texts = [];
+
+        // Direct text content (excluding child element texts)
+        const directText = Array.from(elem.childNodes)
+            .filter(node => node.nodeType === Node.TEXT_NODE)
+            .map(node => node.textContent.trim())
+            .filter(text => text.length > 0);
+        texts.push(...directText);
+
+        const ariaLabel = elem.getAttribute('aria-label');
+        if (ariaLabel) texts.push(ariaLabel);
+
+        for (const img of elem.getElementsByTagName('img')) {
+            const alt = img.getAttribute('alt');
+            if (alt) texts.push(alt);
+        }
+
+        const title = elem.getAttribute('title');
+        if (title) texts.push(title);
+
+        for (const child of elem.children) {
+            const childAriaLabel = child.getAttribute('aria-label');
+            if (childAriaLabel) texts.push(childAriaLabel);
+
+            // For SVGs, check both aria-label and nested text
+            if (child.tagName.toLowerCase() === 'svg') {
+                const svgText = child.textContent.trim();
+                if (svgText) texts.push(svgText);
+            }
+        }
+
+        const tagName = elem.tagName.toLowerCase();
+        if (tagName === 'input' || tagName === 'button') {
+            const value = elem.getAttribute('value');
+            if (value) texts.push(value);
+            if (tagName === 'input') {
+                const placeholder = elem.getAttribute('placeholder');
+                if (placeholder) texts.push(placeholder);
+            }
+        } else if (tagName === 'select') {
+            const selectedOption = elem.querySelector('option[selected]') || elem.options[elem.selectedIndex];
+            if (selectedOption) {
+                const optionText = selectedOption.textContent.trim();
+                if (optionText) texts.push(optionText);
+            }
+            // Also add placeholder-like first option if no selection
+            if (!elem.value && elem.options.length > 0) {
+                const firstOptionText = elem.options[0].textContent.trim();
+                if (firstOptionText) texts.push(`(${firstOptionText})`);
+            }
+        }
+
+        return [...new Set(texts)].join(' ');
+    }
+
+    // Interactive elements, and every element containing one
+    const markers = new Map();
+    for (const [id, metadata] of Object.entries(elements)) {
+        if (metadata.is_interactive) {
+            const elem = nodeOf(id);
+            if (elem && elem.isConnected) {
+                markers.set(elem, id);
+            }
+        }
+    }
+    const mixed = new Set();
+    for (const elem of markers.keys()) {
+        for (let p = elem.parentElement; p && !mixed.has(p); p = p.parentElement) {
+            mixed.add(p);
+        }
+    }
+
+    // Output is a list of strings and required line break counts
+    const out = [];
+
+    function atLineStart() {
+        const last = out[out.length - 1];
+        return last === undefined || typeof last === 'number' || /\s$/.test(last);
+    }
+
+    function inline(text) {
+        // Collapsed text node: leading whitespace vanishes at the start of a line
+        const collapsed = text.replace(/\s+/g, ' ');
+        const trimmed = atLineStart() ? collapsed.replace(/^ /, '') : collapsed;
+        if (trimmed) {
+            out.push(trimmed);
+        }
+    }
+
+    function breaksFor(elem, style) {
+        if (elem.tagName === 'P') {
+            return 2;
+        }
+        return /^(block|flex|grid|list-item|table|table-row|table-caption|flow-root)$/.test(style.display) ? 1 : 0;
+    }
+
+    function isPre(style) {
+        return /^(pre|pre-wrap|pre-line|break-spaces)$/.test(style.whiteSpace);
+    }
+
+    function emit(elem, style, write) {
+        const gap = breaksFor(elem, style);
+        if (gap) {
+            out.push(gap);
+        }
+        write();
+        if (style.display === 'table-cell' && elem.nextElementSibling) {
+            out.push('\t');
+        }
+        if (gap) {
+            out.push(gap);
+        }
+    }
+
+    function marker(elem, id, style) {
+        if (style.visibility === 'hidden') {
+            return;
+        }
+        let label = ['INPUT', 'TEXTAREA'].includes(elem.tagName)
+            ? elem.value.trim()
+            : (elem.innerText || '').trim().replace(/\s+/g, ' ');
+        if (!label) {
+            label = extractElementText(elem);
+        }
+        emit(elem, style, () => out.push(`@${id}${label ? ' - ' + label : ''}`));
+    }
+
+    function visit(elem) {
+        if (elem.tagName === 'BR') {
+            out.push('\n');
+            return;
+        }
+        const style = window.getComputedStyle(elem);
+        if (style.display === 'none') {
+            return;  // innerText of unrendered elements is their raw textContent
+        }
+        if (markers.has(elem)) {
+            marker(elem, markers.get(elem), style);
+        } else if (!mixed.has(elem)) {
+            emit(elem, style, () => {
+                if (elem.innerText !== undefined) {
+                    out.push(elem.innerText);
+                } else {
+                    inline(elem.textContent);  // SVG elements have no innerText
+                }
+            });
+        } else {
+            emit(elem, style, () => {
+                for (const child of elem.childNodes) {
+                    if (child.nodeType === Node.ELEMENT_NODE) {
+                        visit(child);
+                    } else if (child.nodeType === Node.TEXT_NODE && style.visibility !== 'hidden') {
+                        if (isPre(style)) {
+                            out.push(child.data);
+                        } else {
+                            inline(child.data);
+                        }
+                    }
+                }
+            });
+        }
+    }
+
+    function join() {
+        let result = '';
+        let pending = 0;
+        for (const part of out) {
+            if (typeof part === 'number') {
+                pending = Math.max(pending, part);
+                continue;
+            }
+            if (!part) {
+                continue;
+            }
+            if (pending && result) {
+                // Line breaks already written count towards the required ones
+                result = result.replace(/[ \t]+$/, '');
+                const written = result.length - result.replace(/\n+$/, '').length;
+                result += '\n'.repeat(Math.max(pending - written, 0));
+            }
+            pending = 0;
+            result += part;
+        }
+        return result.replace(/[ \t]+$/, '');
+    }
+
+    const root = elementId === null || elementId === undefined
+        ? document.body || document.documentElement
+        : nodeOf(elementId);
+    if (!root) {
+        return null;
+    }
+    visit(root);
+    return join();
+}
@@ -17,6 +17,7 @@ from typing import (
     Mapping,
 )
 from dataclasses import dataclass, field
+import base64
 import inspect
 from functools import wraps
 import uuid
@@ -127,13 +128,18 @@ class BaseTarget:
     Each target should implement both sync and async interfaces.
     """
 
-    _annotated_image: str = ""  # base64 encoded
-    _raw_image: str = ""  # base64 encoded
+    _annotated_image: bytes = b""  # encoded image bytes, base64 only on request
+    _raw_image: bytes = b""
     _text_content: List[str] = field(default_factory=list)
     _debug_info: Dict[str, Any] = field(default_factory=dict)
     _metadata: Dict[str, Any] = field(default_factory=dict)
     _kg_analyzer: Optional[KnowledgeGraph] = None
 
+    def image_base64(self, annotated: bool = False) -> str:
+        """Base64 of the last captured (or annotated) image, encoded on demand."""
+        data = self._annotated_image if annotated else self._raw_image
+        return base64.b64encode(data).decode("ascii") if data else ""
+
     def _sync(self, coro: Any) -> Any:
         """Run an async operation synchronously.
 
@@ -0,0 +1,78 @@
+"""Batched action scripts for WebBrowser.run_actions.
+
+A batch runs its actions back to back in one task, then waits for one
+settle and one element update, instead of crossing the sync bridge and
+waiting on the page once per action.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from .settle import SettleTiming
+
+# Action name and the arguments it takes besides element_id
+ACTIONS: Dict[str, Sequence[str]] = {
+    "click": (),
+    "type": ("text",),
+    "scroll": (),
+}
+
+
+@dataclass
+class Action:
+    """One step of a batch."""
+
+    action: str  # click, type or scroll
+    element_id: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ActionTiming:
+    """How one action of a batch went."""
+
+    action: str
+    element_id: int
+    ms: float
+    error: Optional[str] = None  # set if the action failed
+    skipped: bool = False  # not run, after a failure or a navigation
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch: per-action timings and what changed on the page."""
+
+    actions: List[ActionTiming]
+    total_ms: float
+    settle: Optional[SettleTiming]  # the single wait at the end
+    url: str
+    navigated: bool  # a new document was loaded during the batch
+    dom_changed: bool
+    added: List[int] = field(default_factory=list)  # element IDs new since the batch started
+    removed: List[int] = field(default_factory=list)  # element IDs gone since then
+
+    @property
+    def ok(self) -> bool:
+        return all(a.error is None and not a.skipped for a in self.actions)
+
+
+def parse_actions(actions: Sequence[Mapping[str, Any]]) -> List[Action]:
+    """Check a batch before running any of it.
+
+    Each action is a dict like ``{"action": "type", "element_id": 3, "text": "hi"}``.
+    """
+    parsed = []
+    for index, spec in enumerate(actions):
+        if not isinstance(spec, Mapping):
+            raise ValueError(f"Action {index} must be a dict")
+        name = spec.get("action")
+        if name not in ACTIONS:
+            raise ValueError(f"Action {index}: unknown action {name!r}, expected one of {sorted(ACTIONS)}")
+        element_id = spec.get("element_id")
+        if not isinstance(element_id, int) or isinstance(element_id, bool):
+            raise ValueError(f"Action {index}: element_id must be an int")
+        missing = [arg for arg in ACTIONS[name] if arg not in spec]
+        if missing:
+            raise ValueError(f"Action {index}: {name} needs {', '.join(missing)}")
+        parsed.append(Action(name, element_id, {arg: spec[arg] for arg in ACTIONS[name]}))
+    return parsed
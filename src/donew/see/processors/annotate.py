@@ -0,0 +1,104 @@
+"""Annotated screenshots drawn in Python.
+
+Boxes and ID labels are drawn over a plain capture instead of being
+injected into the page as overlay elements, so annotating never mutates
+the DOM, never triggers layout or mutation observers, and the same capture
+serves both the raw and the annotated image.
+"""
+
+import io
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from .capture import encode
+
+# Same palette as the in-page overlay (highlight_elements.js)
+COLORS = {
+    "button": (0xFF, 0x6B, 0x6B),
+    "link": (0x4E, 0xCD, 0xC4),
+    "input": (0x45, 0xB7, 0xD1),
+    "icon": (0x96, 0xCE, 0xB4),
+    "text": (0xFF, 0xEE, 0xAD),
+}
+
+_FONT_SIZE = 12
+_PADDING = (6, 2)  # label padding, horizontal and vertical
+
+
+def render_annotations(
+    capture: bytes,
+    origin: Tuple[float, float],
+    ids: Sequence[int],
+    boxes: np.ndarray,
+    types: Sequence[str],
+    format: str = "png",
+    quality: Optional[int] = None,
+    max_dimension: Optional[int] = None,
+) -> bytes:
+    """Draw element boxes and ID labels over a capture and encode it.
+
+    Args:
+        capture: Image of a page region, one pixel per CSS pixel.
+        origin: Page coordinates of the capture's top-left corner.
+        ids: Element IDs, one per box.
+        boxes: (n, 4) array of page-coordinate x, y, width, height.
+        types: Element type per box, picking its color.
+    """
+    image = Image.open(io.BytesIO(capture))
+    image.load()
+    image = image.convert("RGB")
+
+    rects = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    width, height = image.size
+    # Page boxes to the capture's pixel grid, outline pixels inclusive
+    left = np.floor(rects[:, 0] - origin[0]).astype(np.int64)
+    top = np.floor(rects[:, 1] - origin[1]).astype(np.int64)
+    right = np.ceil(rects[:, 0] + rects[:, 2] - origin[0]).astype(np.int64) - 1
+    bottom = np.ceil(rects[:, 1] + rects[:, 3] - origin[1]).astype(np.int64) - 1
+    shown = np.flatnonzero(
+        (right >= 0) & (bottom >= 0) & (left < width) & (top < height) & (right >= left) & (bottom >= top)
+    )
+    palette = np.array([COLORS.get(type, COLORS["text"]) for type in types], dtype=np.uint8).reshape(-1, 3)
+
+    # Every outline pixel of every box, written in one indexed assignment
+    pixels = np.array(image)
+    x1, x2 = np.clip(left[shown], 0, width - 1), np.clip(right[shown], 0, width - 1)
+    y1, y2 = np.clip(top[shown], 0, height - 1), np.clip(bottom[shown], 0, height - 1)
+    rows, cols, owners = [], [], []
+    for edge, inside in ((top, True), (bottom, True), (left, False), (right, False)):
+        line = edge[shown]
+        limit = height if inside else width
+        keep = (line >= 0) & (line < limit)
+        start, stop = (x1, x2) if inside else (y1, y2)
+        along, owner = _spans(start[keep], stop[keep] - start[keep] + 1)
+        across = np.repeat(line[keep], stop[keep] - start[keep] + 1)
+        rows.append(across if inside else along)
+        cols.append(along if inside else across)
+        owners.append(shown[keep][owner])
+    owner = np.concatenate(owners)
+    pixels[np.concatenate(rows), np.concatenate(cols)] = palette[owner]
+    image = Image.fromarray(pixels)
+
+    # Labels sit above their box like the overlay's, drawn after every outline
+    font = ImageFont.load_default(size=_FONT_SIZE)
+    draw = ImageDraw.Draw(image)
+    for i in shown.tolist():
+        label = str(ids[i])
+        tx1, ty1, tx2, ty2 = draw.textbbox((0, 0), label, font=font)
+        label_width = tx2 - tx1 + 2 * _PADDING[0]
+        label_height = ty2 - ty1 + 2 * _PADDING[1]
+        x = min(max(int(left[i]), 0), max(width - label_width, 0))
+        y = max(int(top[i]) - label_height, 0)
+        draw.rectangle((x, y, x + label_width - 1, y + label_height - 1), fill=tuple(palette[i].tolist()))
+        draw.text((x + _PADDING[0] - tx1, y + _PADDING[1] - ty1), label, fill="white", font=font)
+
+    return encode(image, format, quality, max_dimension)
+
+
+def _spans(starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions covered by runs of ``lengths`` from ``starts``, and the run of each."""
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return starts[owner] + offsets, owner
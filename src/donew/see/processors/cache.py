@@ -0,0 +1,366 @@
+"""Shared on-disk HTTP cache for static assets.
+
+Every fresh browser context starts with an empty HTTP cache, so each
+session refetches the same bundles, stylesheets and fonts. AssetCache sits
+in front of the network as a context route: cacheable GET responses are
+stored content-addressed on disk, served while fresh, and revalidated
+with their ETag / Last-Modified once stale.
+
+Bodies live under ``blobs/`` named by their SHA-256, so identical assets
+served from several URLs are stored once. A SQLite index maps URLs to
+bodies and tracks access times for LRU eviction under a size cap.
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from playwright.async_api import APIResponse, BrowserContext, Request, Route
+
+from ...envpaths import get_data_path_for
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "font", "image"}
+
+# Headers that describe the stored body rather than the resource, or that
+# belong to the session which fetched it and must not be replayed to others
+_DROPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "set-cookie",
+    "set-cookie2",
+}
+
+# Stale responses without explicit freshness keep 10% of their age, up to a day
+_HEURISTIC_FRACTION = 0.1
+_HEURISTIC_MAX = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def _cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness(headers: Dict[str, str], now: float) -> Optional[float]:
+    """When a response goes stale, or None if it must not be stored.
+
+    Responses that may be stored but not reused without revalidation
+    (``no-cache``, or validators without freshness) are stale immediately.
+    """
+    directives = _cache_control(headers)
+    if "no-store" in directives or "private" in directives:
+        return None
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return None  # the URL alone does not identify the variant
+    has_validator = "etag" in headers or "last-modified" in headers
+
+    if "no-cache" in directives:
+        return now if has_validator else None
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            age = float(headers.get("age", 0))
+            return now + max(float(max_age) - age, 0)
+        except ValueError:
+            pass
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or now
+        return now + max(expires - date, 0)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        date = _http_date(headers.get("date")) or now
+        return now + min(max(date - last_modified, 0) * _HEURISTIC_FRACTION, _HEURISTIC_MAX)
+    return now if has_validator else None
+
+
+class AssetCache:
+    """Content-addressed disk cache consulted through context request routing.
+
+    Args:
+        path: Cache directory; defaults to the donew data directory.
+        max_bytes: Size cap for stored bodies; least recently used entries go first.
+        resource_types: Resource types routed through the cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        resource_types: Iterable[str] = CACHEABLE_RESOURCE_TYPES,
+    ):
+        self.path = Path(path or get_data_path_for(["http-cache"]))
+        self.max_bytes = max_bytes
+        self.resource_types = set(resource_types)
+        (self.path / "blobs").mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.path / "index.db", isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+            "evicted": 0,
+            "bytes_served": 0,
+        }
+
+    async def install(self, context: BrowserContext) -> None:
+        """Route the context's cacheable requests through this cache."""
+        await context.route("**/*", self._handle)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the current size of the cache."""
+        entries, size = self._db.execute(
+            "SELECT (SELECT COUNT(*) FROM entries), COALESCE((SELECT SUM(size) FROM blobs), 0)"
+        ).fetchone()
+        return {**self._counters, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        """Drop every entry and stored body."""
+        self._db.execute("DELETE FROM entries")
+        self._evict_orphans()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def cacheable(self, request: Request) -> bool:
+        """Whether a request may be answered from the cache."""
+        if request.method != "GET" or request.resource_type not in self.resource_types:
+            return False
+        if not request.url.startswith(("http://", "https://")):
+            return False
+        headers = request.headers
+        return "range" not in headers and "authorization" not in headers
+
+    async def _handle(self, route: Route, request: Request) -> None:
+        if not self.cacheable(request):
+            await route.fallback()
+            return
+        try:
+            await self._serve(route, request)
+        except Exception as e:
+            # Leave the request to the browser rather than failing the page
+            logger.debug(f"Asset cache bypassed for {request.url}: {e}")
+            try:
+                await route.fallback()
+            except Exception:
+                pass  # already answered before the failure
+
+    async def _serve(self, route: Route, request: Request) -> None:
+        now = time.time()
+        entry = self._lookup(request.url)
+        if entry and entry["expires_at"] > now:
+            body = await self._read(entry["digest"])
+            if body is not None:
+                self._touch(request.url, now)
+                await self._fulfill(route, entry["status"], entry["headers"], body)
+                self._counters["hits"] += 1
+                return
+
+        headers = dict(request.headers)
+        if entry:
+            if entry["etag"]:
+                headers["if-none-match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["if-modified-since"] = entry["last_modified"]
+        response = await route.fetch(headers=headers)
+
+        if response.status == 304 and entry:
+            body = await self._read(entry["digest"])
+            if body is not None:
+                # The stored body is still good; only freshness changes
+                merged = {**entry["headers"], **self._stored_headers(response.headers)}
+                expires = freshness(merged, now)
+                self._update(request.url, merged, now if expires is None else expires, now)
+                await self._fulfill(route, entry["status"], merged, body)
+                self._counters["revalidated"] += 1
+                return
+            response = await route.fetch()
+
+        body = await response.body()
+        self._counters["misses"] += 1
+        if response.status == 200:
+            await self._store(request.url, response, body, now)
+        await route.fulfill(response=response, body=body)
+
+    async def _fulfill(
+        self, route: Route, status: int, headers: Dict[str, str], body: bytes
+    ) -> None:
+        await route.fulfill(status=status, headers=headers, body=body)
+        self._counters["bytes_served"] += len(body)
+
+    @staticmethod
+    def _stored_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        return {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS}
+
+    # Index
+
+    def _lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT digest, status, headers, expires_at, etag, last_modified FROM entries WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        digest, status, headers, expires_at, etag, last_modified = row
+        return {
+            "digest": digest,
+            "status": status,
+            "headers": self._stored_headers(json.loads(headers)),  # entries from older versions
+            "expires_at": expires_at,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+    def _touch(self, url: str, now: float) -> None:
+        self._db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, url))
+
+    def _update(self, url: str, headers: Dict[str, str], expires_at: float, now: float) -> None:
+        self._db.execute(
+            "UPDATE entries SET headers = ?, expires_at = ?, etag = ?, last_modified = ?, accessed_at = ? WHERE url = ?",
+            (
+                json.dumps(headers),
+                expires_at,
+                headers.get("etag"),
+                headers.get("last-modified"),
+                now,
+                url,
+            ),
+        )
+
+    async def _store(self, url: str, response: APIResponse, body: bytes, now: float) -> None:
+        headers = self._stored_headers(response.headers)
+        expires_at = freshness(headers, now)
+        if expires_at is None or len(body) > self.max_bytes:
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        if not self._db.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone():
+            await asyncio.to_thread(self._write, digest, body)
+            self._db.execute(
+                "INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(body))
+            )
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                digest,
+                response.status,
+                json.dumps(headers),
+                expires_at,
+                headers.get("etag"),
+                headers.get("last-modified"),
+                now,
+            ),
+        )
+        self._counters["stored"] += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until stored bodies fit the size cap."""
+        (size,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        if size <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT e.url, b.size FROM entries e JOIN blobs b ON b.digest = e.digest ORDER BY e.accessed_at"
+        ).fetchall()
+        stale = []
+        for url, entry_size in rows:
+            if size <= self.max_bytes:
+                break
+            stale.append((url,))
+            size -= entry_size  # approximate when bodies are shared
+        self._db.executemany("DELETE FROM entries WHERE url = ?", stale)
+        self._counters["evicted"] += len(stale)
+        self._evict_orphans()
+
+    def _evict_orphans(self) -> None:
+        orphans = self._db.execute(
+            "SELECT digest FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)"
+        ).fetchall()
+        for (digest,) in orphans:
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+        self._db.executemany("DELETE FROM blobs WHERE digest = ?", orphans)
+
+    # Blobs
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.path / "blobs" / digest[:2] / digest
+
+    def _write(self, digest: str, body: bytes) -> None:
+        target = self._blob_path(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial body
+        fd, temp = tempfile.mkstemp(dir=target.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(temp, target)
+
+    async def _read(self, digest: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._blob_path(digest).read_bytes)
+        except FileNotFoundError:
+            return None
+
+
+_CACHES: Dict[Tuple[str, str], AssetCache] = {}
+
+
+def shared_cache(
+    path: Optional[Union[str, Path]] = None, **options: Any
+) -> AssetCache:
+    """Get the process-wide cache for a directory, opening it on first use."""
+    resolved = str(Path(path or get_data_path_for(["http-cache"])).resolve())
+    key = (resolved, repr(sorted(options.items())))
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = _CACHES[key] = AssetCache(resolved, **options)
+    return cache
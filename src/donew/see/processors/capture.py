@@ -0,0 +1,260 @@
+"""Screenshots encoded and scaled by the browser.
+
+Playwright screenshots are PNG or JPEG at full device resolution. Through
+CDP, Chromium can also encode WebP and downscale while rendering, so large
+captures never travel or sit in memory at full size.
+
+Batches of element images are cropped locally, with NumPy and Pillow, out
+of one capture of the region covering them all, instead of one
+scroll-and-capture per element.
+
+A screencast streams compressed frames as the page repaints. Each frame is
+acknowledged only once the consumer is done with it, so Chromium, which
+keeps few frames in flight, slows down to the pace of the consumer; at
+most a couple of frames wait in memory, and the oldest is dropped first.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+from playwright.async_api import CDPSession, Page
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = ("png", "jpeg", "webp")
+SCREENCAST_FORMATS = ("png", "jpeg")
+
+_PIL_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+# Screencast frames received but not yet consumed
+_SCREENCAST_BUFFER = 2
+
+
+def check_image_options(
+    format: str, quality: Optional[int] = None, max_dimension: Optional[int] = None
+) -> None:
+    """Raise ValueError for unsupported image options."""
+    if format not in IMAGE_FORMATS:
+        raise ValueError(f"format must be one of {IMAGE_FORMATS}")
+    if quality is not None:
+        if format == "png":
+            raise ValueError("quality does not apply to png images")
+        if not 0 <= quality <= 100:
+            raise ValueError("quality must be between 0 and 100")
+    if max_dimension is not None and max_dimension < 1:
+        raise ValueError("max_dimension must be at least 1")
+
+
+async def _session(page: Page) -> CDPSession:
+    try:
+        return await page.context.new_cdp_session(page)
+    except Exception as e:
+        raise ValueError(f"Browser-side encoding needs a Chromium browser: {e}") from e
+
+
+async def capture(
+    page: Page,
+    clip: Optional[Dict[str, float]] = None,
+    full_page: bool = False,
+    format: str = "png",
+    quality: Optional[int] = None,
+    max_dimension: Optional[int] = None,
+) -> bytes:
+    """Capture the viewport, the full page or a region.
+
+    Args:
+        clip: Region in CSS pixels relative to the viewport, like Playwright's.
+        full_page: Capture the whole scrollable page when no clip is given.
+        format: "png", "jpeg" or "webp".
+        quality: Compression quality for jpeg and webp, 0-100.
+        max_dimension: Longest side of the image in pixels; larger captures are scaled down.
+    """
+    check_image_options(format, quality, max_dimension)
+    session = await _session(page)
+    try:
+        metrics = await session.send("Page.getLayoutMetrics")
+        view = metrics["cssVisualViewport"]
+        if clip is not None:
+            region = {**clip, "x": clip["x"] + view["pageX"], "y": clip["y"] + view["pageY"]}
+        elif full_page:
+            size = metrics["cssContentSize"]
+            region = {"x": 0, "y": 0, "width": size["width"], "height": size["height"]}
+        else:
+            region = {
+                "x": view["pageX"],
+                "y": view["pageY"],
+                "width": view["clientWidth"],
+                "height": view["clientHeight"],
+            }
+
+        # Output pixels are CSS pixels times the device pixel ratio times the clip scale
+        scale = 1.0
+        if max_dimension:
+            ratio = await page.evaluate("window.devicePixelRatio") or 1
+            longest = max(region["width"], region["height"]) * ratio
+            scale = min(1.0, max_dimension / longest) if longest else 1.0
+
+        outside = (
+            region["x"] < view["pageX"]
+            or region["y"] < view["pageY"]
+            or region["x"] + region["width"] > view["pageX"] + view["clientWidth"]
+            or region["y"] + region["height"] > view["pageY"] + view["clientHeight"]
+        )
+        params: Dict[str, Any] = {
+            "format": format,
+            "clip": {**region, "scale": scale},
+            "captureBeyondViewport": outside,
+        }
+        if quality is not None:
+            params["quality"] = quality
+        result = await session.send("Page.captureScreenshot", params)
+        return base64.b64decode(result["data"])
+    finally:
+        await session.detach()
+
+
+def crop_images(
+    capture: bytes,
+    origin: Tuple[float, float],
+    boxes: Dict[int, Dict[str, float]],
+    format: str = "png",
+    quality: Optional[int] = None,
+    max_dimension: Optional[int] = None,
+) -> Dict[int, bytes]:
+    """Cut element images out of one capture and encode each of them.
+
+    Args:
+        capture: Image of a page region, one pixel per CSS pixel.
+        origin: Page coordinates of the capture's top-left corner.
+        boxes: Page-coordinate boxes (x, y, width, height) per element ID.
+    """
+    image = Image.open(io.BytesIO(capture))
+    image.load()
+
+    ids = list(boxes)
+    rects = np.array(
+        [[boxes[id]["x"], boxes[id]["y"], boxes[id]["width"], boxes[id]["height"]] for id in ids],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    # Page boxes to whole capture pixels, clamped to the capture
+    left = np.floor(rects[:, 0] - origin[0])
+    top = np.floor(rects[:, 1] - origin[1])
+    right = np.ceil(rects[:, 0] + rects[:, 2] - origin[0])
+    bottom = np.ceil(rects[:, 1] + rects[:, 3] - origin[1])
+    crops = np.stack(
+        [
+            np.clip(left, 0, image.width),
+            np.clip(top, 0, image.height),
+            np.clip(right, 0, image.width),
+            np.clip(bottom, 0, image.height),
+        ],
+        axis=1,
+    ).astype(np.int64)
+
+    images: Dict[int, bytes] = {}
+    for id, (x1, y1, x2, y2) in zip(ids, crops.tolist()):
+        if x2 > x1 and y2 > y1:
+            images[id] = encode(image.crop((x1, y1, x2, y2)), format, quality, max_dimension)
+    return images
+
+
+def encode(
+    image: Image.Image,
+    format: str = "png",
+    quality: Optional[int] = None,
+    max_dimension: Optional[int] = None,
+) -> bytes:
+    """Encode an image, scaled down to ``max_dimension`` first if given."""
+    if format == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    if max_dimension and max(image.size) > max_dimension:
+        image = image.copy()
+        image.thumbnail((max_dimension, max_dimension))
+    options: Dict[str, Any] = {"quality": quality} if quality is not None else {}
+    buffer = io.BytesIO()
+    image.save(buffer, _PIL_FORMATS[format], **options)
+    return buffer.getvalue()
+
+
+@dataclass
+class Frame:
+    """One screencast frame."""
+
+    data: bytes
+    timestamp: float  # seconds since epoch, when the frame was painted
+    width: int  # CSS size of the captured viewport
+    height: int
+    scroll_x: float
+    scroll_y: float
+
+
+async def stream_screencast(
+    page: Page,
+    format: str = "jpeg",
+    quality: Optional[int] = 80,
+    max_width: Optional[int] = None,
+    max_height: Optional[int] = None,
+    every_nth_frame: int = 1,
+) -> AsyncIterator[Frame]:
+    """Stream compressed frames of the viewport as the page repaints.
+
+    A page that does not repaint sends no frames. Stop by closing the
+    iterator (``break`` out of the ``async for``).
+    """
+    if format not in SCREENCAST_FORMATS:
+        raise ValueError(f"screencast format must be one of {SCREENCAST_FORMATS}")
+    if format == "png":
+        quality = None
+    session = await _session(page)
+    frames: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=_SCREENCAST_BUFFER)
+    acks: Set["asyncio.Future[Any]"] = set()  # acks of dropped frames in flight
+
+    def ack(event: Dict[str, Any]) -> None:
+        task = asyncio.ensure_future(
+            session.send("Page.screencastFrameAck", {"sessionId": event["sessionId"]})
+        )
+        acks.add(task)
+        task.add_done_callback(acks.discard)
+
+    def on_frame(event: Dict[str, Any]) -> None:
+        if frames.full():
+            # Keep the newest frames; the dropped one still has to be acked
+            ack(frames.get_nowait())
+        frames.put_nowait(event)
+
+    session.on("Page.screencastFrame", on_frame)
+
+    params: Dict[str, Any] = {"format": format, "everyNthFrame": every_nth_frame}
+    if quality is not None:
+        params["quality"] = quality
+    if max_width:
+        params["maxWidth"] = max_width
+    if max_height:
+        params["maxHeight"] = max_height
+    await session.send("Page.startScreencast", params)
+    try:
+        while True:
+            event = await frames.get()
+            metadata = event["metadata"]
+            yield Frame(
+                data=base64.b64decode(event["data"]),
+                timestamp=metadata.get("timestamp", 0.0),
+                width=int(metadata["deviceWidth"]),
+                height=int(metadata["deviceHeight"]),
+                scroll_x=metadata["scrollOffsetX"],
+                scroll_y=metadata["scrollOffsetY"],
+            )
+            # Asked for the next frame: the consumer is done with this one
+            await session.send("Page.screencastFrameAck", {"sessionId": event["sessionId"]})
+    finally:
+        try:
+            await session.send("Page.stopScreencast")
+            await session.detach()
+        except Exception as e:
+            logger.debug(f"Failed to stop screencast: {e}")
@@ -0,0 +1,491 @@
+"""Compact columnar storage for detected page elements.
+
+A page can hold tens of thousands of elements, and every WebPage in a
+session keeps its own. Instead of one dataclass (and several dicts) per
+element, ElementStore keeps bounding boxes and flags in NumPy arrays,
+tag and type names as codes into an interned string table, and labels,
+xpaths and child lists as spans into shared buffers. ElementMetadata is a
+slotted view onto one row.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .spatial import SpatialIndex
+
+if TYPE_CHECKING:
+    from .web import WebPage
+
+# Fields that stay in the page until accessed, with their value when unavailable
+HEAVY_FIELDS: Dict[str, Any] = {
+    "element_html": "",
+    "attributes": {},
+    "computed_styles": None,
+    "listeners": [],
+    "state": {},
+}
+
+# Row flags
+ALIVE = 1
+INTERACTIVE = 2
+HAS_BOX = 4
+HAS_LABEL = 8
+
+BOX_KEYS = ("x", "y", "width", "height")
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return an array with room for ``size`` rows, doubling capacity as needed."""
+    if size <= len(array):
+        return array
+    grown = np.zeros((max(size, 2 * len(array), 64),) + array.shape[1:], array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class _Columns:
+    """One generation of column arrays. Views keep theirs alive across compaction."""
+
+    __slots__ = (
+        "rows",
+        "ids",
+        "flags",
+        "boxes",
+        "tags",
+        "types",
+        "parents",
+        "z",
+        "labels",
+        "xpaths",
+        "children",
+        "text",
+        "child_ids",
+        "child_count",
+    )
+
+    def __init__(self, capacity: int = 0):
+        self.rows = 0
+        self.ids = np.zeros(capacity, np.int64)
+        self.flags = np.zeros(capacity, np.uint8)
+        self.boxes = np.zeros((capacity, 4), np.float64)
+        self.tags = np.zeros(capacity, np.int32)
+        self.types = np.zeros(capacity, np.int32)
+        self.parents = np.full(capacity, -1, np.int64)
+        self.z = np.zeros(capacity, np.int64)  # effective z-index
+        self.labels = np.zeros((capacity, 2), np.int64)  # [start, end) into text
+        self.xpaths = np.zeros((capacity, 2), np.int64)
+        self.children = np.zeros((capacity, 2), np.int64)  # [start, end) into child_ids
+        self.text = bytearray()
+        self.child_ids = np.zeros(0, np.int64)
+        self.child_count = 0
+
+    def reserve(self, rows: int) -> None:
+        for name in ("ids", "flags", "boxes", "tags", "types", "z", "labels", "xpaths", "children"):
+            setattr(self, name, _grow(getattr(self, name), rows))
+        if rows > len(self.parents):
+            parents = _grow(self.parents, rows)
+            parents[len(self.parents) :] = -1
+            self.parents = parents
+
+    def span(self, data: bytes) -> Tuple[int, int]:
+        start = len(self.text)
+        self.text += data
+        return start, len(self.text)
+
+    def string(self, span: np.ndarray) -> str:
+        return self.text[span[0] : span[1]].decode()
+
+
+class ElementMetadata:
+    """Rich element metadata incorporating parsing patterns.
+
+    A lightweight view onto one row of an ElementStore. Detection only
+    transfers the summary fields. ``element_html``, ``attributes``,
+    ``computed_styles``, ``listeners`` and ``state`` are fetched from the
+    page on first access and cached by the page.
+    """
+
+    __slots__ = ("_store", "_columns", "_row")
+
+    def __init__(self, store: "ElementStore", columns: _Columns, row: int):
+        self._store = store
+        self._columns = columns
+        self._row = row
+
+    @property
+    def element_id(self) -> int:
+        return int(self._columns.ids[self._row])
+
+    @property
+    def element_name(self) -> str:  # HTML tag name
+        return self._store._strings[self._columns.tags[self._row]]
+
+    @property
+    def element_label(self) -> Optional[str]:  # HTML label attribute
+        if not self._columns.flags[self._row] & HAS_LABEL:
+            return None
+        return self._columns.string(self._columns.labels[self._row])
+
+    @property
+    def xpath(self) -> str:  # Unique XPath
+        return self._columns.string(self._columns.xpaths[self._row])
+
+    @property
+    def bounding_box(self) -> Optional[Dict[str, float]]:
+        if not self._columns.flags[self._row] & HAS_BOX:
+            return None
+        return dict(zip(BOX_KEYS, self._columns.boxes[self._row].tolist()))
+
+    @bounding_box.setter
+    def bounding_box(self, box: Optional[Dict[str, float]]) -> None:
+        _write_box(self._columns, self._row, box)
+        self._store._spatial = None
+
+    @property
+    def is_interactive(self) -> bool:
+        return bool(self._columns.flags[self._row] & INTERACTIVE)
+
+    @property
+    def element_type(self) -> str:  # button, link, input, icon, text
+        return self._store._strings[self._columns.types[self._row]]
+
+    @property
+    def parent_id(self) -> Optional[int]:  # Parent element ID
+        parent = int(self._columns.parents[self._row])
+        return None if parent < 0 else parent
+
+    @property
+    def children_ids(self) -> List[int]:  # Child element IDs
+        start, end = self._columns.children[self._row]
+        return self._columns.child_ids[start:end].tolist()
+
+    @property
+    def z_index(self) -> int:  # Effective z-index, inherited from the stacking context
+        return int(self._columns.z[self._row])
+
+    def _detail(self, name: str) -> Any:
+        page = self._store._page
+        if page is None:
+            return HEAVY_FIELDS[name]
+        return page._element_details(self.element_id)[name]
+
+    @property
+    def element_html(self) -> str:  # Element outer HTML
+        return self._detail("element_html")
+
+    @property
+    def attributes(self) -> Dict[str, str]:  # All HTML attributes
+        return self._detail("attributes")
+
+    @property
+    def computed_styles(self) -> Optional[Dict[str, str]]:  # Key CSS properties
+        return self._detail("computed_styles")
+
+    @property
+    def listeners(self) -> List[str]:  # Event listeners
+        return self._detail("listeners")
+
+    @property
+    def state(self) -> Dict[str, Any]:  # Element state
+        return self._detail("state")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The summary fields as a plain dict, in the shape detection returns them."""
+        return {
+            "element_id": self.element_id,
+            "element_name": self.element_name,
+            "element_label": self.element_label,
+            "xpath": self.xpath,
+            "bounding_box": self.bounding_box,
+            "is_interactive": self.is_interactive,
+            "element_type": self.element_type,
+            "parent_id": self.parent_id,
+            "children_ids": self.children_ids,
+            "z_index": self.z_index,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ElementMetadata):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items())
+        return f"ElementMetadata({fields})"
+
+
+def _write_box(columns: _Columns, row: int, box: Optional[Dict[str, float]]) -> None:
+    if box is None:
+        columns.flags[row] &= ~np.uint8(HAS_BOX)
+        columns.boxes[row] = np.nan
+    else:
+        columns.flags[row] |= HAS_BOX
+        columns.boxes[row] = [box[key] for key in BOX_KEYS]
+
+
+class ElementStore(Mapping[int, ElementMetadata]):
+    """Columnar map of element ID to ElementMetadata views.
+
+    Rows are looked up by binary search over the ID-sorted rows of the last
+    compaction, plus a small dict for rows written since. Updates tombstone
+    the old row and append a new one; the store compacts itself once dead
+    rows pile up.
+
+    Args:
+        records: Element summaries as returned by detection.
+        page: The page heavy fields are fetched from.
+    """
+
+    def __init__(
+        self, records: Iterable[Dict[str, Any]] = (), page: Optional["WebPage"] = None
+    ):
+        self._page = page
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._columns = _Columns()
+        self._sorted = np.zeros(0, np.int64)  # IDs of rows [0, len) in ID order
+        self._recent: Dict[int, int] = {}  # ID -> row for rows appended since compaction
+        self._live = 0
+        self._spatial: Optional[SpatialIndex] = None
+        self._load(records)
+
+    # Mapping interface
+
+    def __getitem__(self, element_id: int) -> ElementMetadata:
+        row = self._row(element_id)
+        if row is None:
+            raise KeyError(element_id)
+        return ElementMetadata(self, self._columns, row)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids().tolist())
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, element_id: object) -> bool:
+        return isinstance(element_id, (int, np.integer)) and self._row(int(element_id)) is not None
+
+    # Pickling, for spilling page history to disk; the page is re-bound on load
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_page"] = None
+        state["_spatial"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+    # Vectorized access
+
+    def ids(self) -> np.ndarray:
+        """IDs of all live elements, ascending."""
+        columns = self._columns
+        alive = columns.flags[: columns.rows] & ALIVE > 0
+        return np.sort(columns.ids[: columns.rows][alive])
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Live rows as ID-ordered arrays, for vectorized filtering.
+
+        ``boxes`` is an (n, 4) array of x, y, width, height with NaN where an
+        element has no bounding box. ``types`` and ``tags`` hold codes; use
+        ``code()`` to turn a name into one.
+        """
+        columns = self._columns
+        rows = np.flatnonzero(columns.flags[: columns.rows] & ALIVE)
+        rows = rows[np.argsort(columns.ids[rows], kind="stable")]
+        return {
+            "ids": columns.ids[rows],
+            "boxes": columns.boxes[rows],
+            "interactive": columns.flags[rows] & INTERACTIVE > 0,
+            "types": columns.types[rows],
+            "tags": columns.tags[rows],
+            "parents": columns.parents[rows],
+            "z": columns.z[rows],
+        }
+
+    def code(self, name: str) -> int:
+        """Code of an interned tag or type name, or -1 if no element uses it."""
+        return self._codes.get(name, -1)
+
+    def subset(self, element_ids: Iterable[int]) -> Dict[int, ElementMetadata]:
+        """Views for the given IDs, skipping unknown ones."""
+        return {
+            int(id): ElementMetadata(self, self._columns, row)
+            for id in element_ids
+            if (row := self._row(int(id))) is not None
+        }
+
+    def spatial(self) -> SpatialIndex:
+        """Spatial index over the current boxes, rebuilt after any update."""
+        if self._spatial is None:
+            columns = self.columns()
+            self._spatial = SpatialIndex(columns["ids"], columns["boxes"], columns["z"])
+        return self._spatial
+
+    def type_counts(self) -> Dict[str, int]:
+        """Number of live elements of each element type."""
+        types = self.columns()["types"]
+        codes, counts = np.unique(types, return_counts=True)
+        return {self._strings[code]: int(count) for code, count in zip(codes, counts)}
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and buffers."""
+        columns = self._columns
+        arrays = sum(
+            getattr(columns, name).nbytes
+            for name in ("ids", "flags", "boxes", "tags", "types", "parents", "z", "labels", "xpaths", "children", "child_ids")
+        )
+        return arrays + len(columns.text) + self._sorted.nbytes
+
+    # Updates
+
+    def apply(
+        self,
+        removed: Sequence[int] = (),
+        upserts: Iterable[Dict[str, Any]] = (),
+        boxes: Optional[Mapping[int, Optional[Dict[str, float]]]] = None,
+    ) -> None:
+        """Apply a detection delta.
+
+        Args:
+            removed: IDs of elements that left the document.
+            upserts: Summaries of added or changed elements.
+            boxes: New bounding boxes for otherwise unchanged elements.
+        """
+        self._spatial = None
+        for element_id in removed:
+            self._kill(int(element_id))
+
+        upserts = list(upserts)
+        columns = self._columns
+        columns.reserve(columns.rows + len(upserts))
+        for record in upserts:
+            element_id = int(record["element_id"])
+            self._kill(element_id)
+            row = columns.rows
+            columns.rows += 1
+            self._write(row, element_id, record)
+            self._recent[element_id] = row
+            self._live += 1
+
+        for element_id, box in (boxes or {}).items():
+            row = self._row(int(element_id))
+            if row is not None:
+                _write_box(columns, row, box)
+
+        dead = columns.rows - self._live
+        if self._recent and (dead > max(64, self._live // 4) or len(self._recent) > max(256, self._live // 4)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rebuild the columns from live rows in ID order, dropping tombstones.
+
+        Existing views keep reading the previous columns.
+        """
+        old = self._columns
+        rows = np.flatnonzero(old.flags[: old.rows] & ALIVE)
+        rows = rows[np.argsort(old.ids[rows], kind="stable")]
+
+        new = _Columns(len(rows))
+        new.rows = len(rows)
+        for name in ("ids", "flags", "boxes", "tags", "types", "parents", "z"):
+            getattr(new, name)[:] = getattr(old, name)[rows]
+
+        # Re-pack the text and child buffers in row order
+        text = bytearray()
+        child_parts = []
+        child_count = 0
+        for i, row in enumerate(rows.tolist()):
+            for name in ("labels", "xpaths"):
+                start, end = getattr(old, name)[row]
+                getattr(new, name)[i] = (len(text), len(text) + end - start)
+                text += old.text[start:end]
+            start, end = old.children[row]
+            new.children[i] = (child_count, child_count + end - start)
+            child_parts.append(old.child_ids[start:end])
+            child_count += end - start
+        new.text = text
+        new.child_ids = np.concatenate(child_parts) if child_parts else np.zeros(0, np.int64)
+        new.child_count = child_count
+
+        self._columns = new
+        self._sorted = new.ids[: new.rows].copy()
+        self._recent = {}
+
+    # Internals
+
+    def _load(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Write a full detection straight into ID-sorted rows."""
+        records = sorted(records, key=lambda record: int(record["element_id"]))
+        columns = self._columns
+        columns.reserve(len(records))
+        for row, record in enumerate(records):
+            self._write(row, int(record["element_id"]), record)
+        columns.rows = self._live = len(records)
+        self._sorted = columns.ids[: columns.rows].copy()
+
+    def _row(self, element_id: int) -> Optional[int]:
+        columns = self._columns
+        row = self._recent.get(element_id)
+        if row is None:
+            index = int(np.searchsorted(self._sorted, element_id))
+            if index >= len(self._sorted) or self._sorted[index] != element_id:
+                return None
+            row = index
+        return row if columns.flags[row] & ALIVE else None
+
+    def _kill(self, element_id: int) -> None:
+        row = self._row(element_id)
+        if row is not None:
+            self._columns.flags[row] &= ~np.uint8(ALIVE)
+            self._recent.pop(element_id, None)
+            self._live -= 1
+
+    def _intern(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._strings)
+            self._strings.append(name)
+        return code
+
+    def _write(self, row: int, element_id: int, record: Dict[str, Any]) -> None:
+        columns = self._columns
+        columns.ids[row] = element_id
+        flags = ALIVE
+        if record.get("is_interactive"):
+            flags |= INTERACTIVE
+        label = record.get("element_label")
+        if label is not None:
+            flags |= HAS_LABEL
+            columns.labels[row] = columns.span(str(label).encode())
+        else:
+            columns.labels[row] = (0, 0)
+        columns.flags[row] = flags
+        _write_box(columns, row, record.get("bounding_box"))
+        columns.tags[row] = self._intern(record.get("element_name") or "")
+        columns.types[row] = self._intern(record.get("element_type") or "")
+        parent = record.get("parent_id")
+        columns.parents[row] = -1 if parent is None else int(parent)
+        columns.z[row] = int(record.get("z_index") or 0)
+        columns.xpaths[row] = columns.span((record.get("xpath") or "").encode())
+
+        children = record.get("children_ids") or []
+        start = columns.child_count
+        columns.child_ids = _grow(columns.child_ids, start + len(children))
+        columns.child_ids[start : start + len(children)] = children
+        columns.child_count = start + len(children)
+        columns.children[row] = (start, columns.child_count)
@@ -0,0 +1,75 @@
+"""Bounded page history for long browsing sessions.
+
+Every navigation adds a WebPage to the browser's history, and each one
+used to keep its elements forever. With a history window, only the last
+``keep`` pages stay fully in memory. Older pages are compacted down to
+their URL, title and timeline, and their element snapshots are spilled to
+disk, to be reloaded when accessed again.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class HistoryConfig:
+    """How much page history a WebBrowser keeps in memory.
+
+    Args:
+        keep: Pages kept fully in memory; None keeps every page.
+        spill_dir: Directory for compacted page snapshots; a temporary one by default.
+    """
+
+    keep: Optional[int] = None
+    spill_dir: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.keep is not None and self.keep < 1:
+            raise ValueError("history keep must be at least 1")
+
+
+@dataclass
+class PageSummary:
+    """What stays in memory for a page in history."""
+
+    url: str
+    title: str
+    timeline: List[Tuple[float, str, Dict[str, Any]]]
+    element_count: int
+    compacted: bool
+
+
+class HistorySpill:
+    """Writes compacted page snapshots to disk and reads them back."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._owned = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="donew-history-")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, snapshot: Dict[str, Any]) -> str:
+        """Store a snapshot and return its path."""
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.pickle")
+        with open(path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def read(self, path: str) -> Dict[str, Any]:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def discard(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def cleanup(self) -> None:
+        """Remove the spill directory if this spill created it."""
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
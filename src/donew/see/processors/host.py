@@ -0,0 +1,208 @@
+"""Process-level Playwright driver and shared browsers.
+
+Every WebProcessor used to start its own Playwright driver and Chromium
+process, and closing a WebBrowser only closed its context, so both leaked.
+BrowserHost owns one driver per event loop and one browser per launch
+configuration. Sessions attach to it with their own contexts, and the host
+closes browsers and the driver once nothing references them.
+
+A browser can also be shared across processes: ``serve()`` launches one
+with a CDP endpoint, and other processes attach with
+``DO.Browse(cdp_endpoint=...)``.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedBrowser:
+    """A browser (or persistent context) and the contexts attached to it."""
+
+    key: str
+    browser: Optional[Browser] = None
+    contexts: int = 0
+    served: bool = False  # kept alive until the host closes
+
+
+class BrowserHost:
+    """Owns the Playwright driver and browsers shared by WebProcessor instances."""
+
+    _hosts: Dict[int, "BrowserHost"] = {}
+
+    def __init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[str, SharedBrowser] = {}
+        self._owners: Dict[int, str] = {}  # id(context) -> browser key
+        self._lock = asyncio.Lock()
+        self._counters = {
+            "drivers_started": 0,
+            "drivers_stopped": 0,
+            "browsers_launched": 0,
+            "browsers_connected": 0,
+            "browsers_closed": 0,
+            "contexts_opened": 0,
+            "contexts_closed": 0,
+        }
+
+    @classmethod
+    def current(cls) -> "BrowserHost":
+        """Get the host for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        host = cls._hosts.get(id(loop))
+        if host is None or host._loop is not loop:
+            host = cls()
+            cls._hosts[id(loop)] = host
+        return host
+
+    async def new_context(
+        self,
+        launch_kwargs: Optional[Dict[str, Any]] = None,
+        context_kwargs: Optional[Dict[str, Any]] = None,
+        cdp_endpoint: Optional[str] = None,
+    ) -> BrowserContext:
+        """Open a context on the shared browser for this configuration.
+
+        Args:
+            launch_kwargs: Arguments for ``chromium.launch``.
+            context_kwargs: Arguments for ``browser.new_context``.
+            cdp_endpoint: Attach to an already running browser instead of launching.
+        """
+        launch_kwargs = launch_kwargs or {}
+        key = (
+            f"cdp:{cdp_endpoint}"
+            if cdp_endpoint
+            else f"launch:{sorted(launch_kwargs.items())!r}"
+        )
+        async with self._lock:
+            shared = self._browsers.get(key)
+            if shared is None or not shared.browser or not shared.browser.is_connected():
+                playwright = await self._driver()
+                if cdp_endpoint:
+                    browser = await playwright.chromium.connect_over_cdp(cdp_endpoint)
+                    self._counters["browsers_connected"] += 1
+                else:
+                    browser = await playwright.chromium.launch(**launch_kwargs)
+                    self._counters["browsers_launched"] += 1
+                shared = SharedBrowser(key=key, browser=browser)
+                self._browsers[key] = shared
+            shared.contexts += 1
+
+        try:
+            context = await shared.browser.new_context(**(context_kwargs or {}))  # type: ignore
+        except Exception:
+            async with self._lock:
+                shared.contexts -= 1
+                await self._collect(shared)
+            raise
+        self._owners[id(context)] = key
+        self._counters["contexts_opened"] += 1
+        return context
+
+    async def new_persistent_context(self, **kwargs: Any) -> BrowserContext:
+        """Launch a persistent (user data dir) context on the shared driver."""
+        async with self._lock:
+            playwright = await self._driver()
+            context = await playwright.chromium.launch_persistent_context(**kwargs)
+            key = f"persistent:{id(context)}"
+            self._browsers[key] = SharedBrowser(key=key, contexts=1)
+            self._counters["browsers_launched"] += 1
+        self._owners[id(context)] = key
+        self._counters["contexts_opened"] += 1
+        return context
+
+    async def close_context(self, context: BrowserContext) -> None:
+        """Close a context and release its browser and driver when unused."""
+        key = self._owners.pop(id(context), None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
+        self._counters["contexts_closed"] += 1
+        if key is None:
+            return
+
+        async with self._lock:
+            shared = self._browsers.get(key)
+            if shared:
+                shared.contexts -= 1
+                await self._collect(shared)
+
+    async def serve(self, port: int = 9222, **launch_kwargs: Any) -> str:
+        """Launch a browser other processes can attach to over CDP.
+
+        Args:
+            port: Local remote-debugging port.
+            **launch_kwargs: Arguments for ``chromium.launch``.
+
+        Returns:
+            The endpoint to pass as ``cdp_endpoint`` to ``DO.Browse``.
+        """
+        endpoint = f"http://127.0.0.1:{port}"
+        key = f"cdp:{endpoint}"
+        args = list(launch_kwargs.pop("args", []))
+        args += [f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+        async with self._lock:
+            if key not in self._browsers:
+                playwright = await self._driver()
+                browser = await playwright.chromium.launch(args=args, **launch_kwargs)
+                self._counters["browsers_launched"] += 1
+                self._browsers[key] = SharedBrowser(key=key, browser=browser, served=True)
+        return endpoint
+
+    async def close(self) -> None:
+        """Close every browser and stop the driver."""
+        async with self._lock:
+            for shared in list(self._browsers.values()):
+                shared.served = False
+                shared.contexts = 0
+                await self._collect(shared)
+            self._owners.clear()
+            await self._stop_driver()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lifecycle counters and the live contexts on each shared browser."""
+        return {
+            **self._counters,
+            "driver_running": self._playwright is not None,
+            "browsers": {
+                key: shared.contexts for key, shared in self._browsers.items()
+            },
+            "live_contexts": len(self._owners),
+        }
+
+    async def _driver(self) -> Playwright:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+            self._counters["drivers_started"] += 1
+        return self._playwright
+
+    async def _collect(self, shared: SharedBrowser) -> None:
+        """Close a browser nobody uses anymore, then the driver if it is idle.
+
+        Must be called with the lock held.
+        """
+        if shared.contexts > 0 or shared.served:
+            return
+        self._browsers.pop(shared.key, None)
+        if shared.browser:
+            try:
+                await shared.browser.close()
+            except Exception as e:
+                logger.warning(f"Failed to close browser: {e}")
+        self._counters["browsers_closed"] += 1
+        if not self._browsers:
+            await self._stop_driver()
+
+    async def _stop_driver(self) -> None:
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            self._counters["drivers_stopped"] += 1
@@ -0,0 +1,232 @@
+"""Bounded interaction log with an optional streaming sink.
+
+Every click, type, scroll and navigation becomes one InteractionRecord,
+resolved against the page's elements when it happens, so building a
+timeline never walks the element stores again. The log keeps the last
+``capacity`` records in a ring buffer; an InteractionSink streams every
+record to disk from a background thread, so long sessions can be
+audited in full without holding them in memory.
+"""
+
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SINK_FORMATS = ("jsonl", "parquet")
+
+
+class InteractionRecord(NamedTuple):
+    """One entry of the interaction log."""
+
+    timestamp: float
+    interaction_type: str  # goto, click, type, scroll, navigation_error
+    url: str
+    element_id: int  # -1 for navigations
+    data: Dict[str, Any]
+    element_type: Optional[str] = None
+    element_label: Optional[str] = None
+    xpath: Optional[str] = None
+    page: int = -1  # which of the session's pages, in the order they were opened
+
+
+class InteractionSink:
+    """Streams interaction records to disk from a background thread.
+
+    JSONL sinks append to one file. Parquet sinks need ``pyarrow`` and write
+    a directory of part files, one per flushed batch. A batch is flushed
+    once it holds ``batch_size`` records, after ``flush_interval`` seconds
+    without new records, on ``flush()`` and on ``close()``.
+
+    Args:
+        path: Output file (jsonl) or directory (parquet).
+        format: "jsonl" or "parquet"; inferred from the path suffix if omitted.
+        batch_size: Records per write.
+        flush_interval: Idle seconds before a partial batch is written.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        format: Optional[str] = None,
+        batch_size: int = 256,
+        flush_interval: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.format = format or ("parquet" if self.path.suffix == ".parquet" else "jsonl")
+        if self.format not in SINK_FORMATS:
+            raise ValueError(f"sink format must be one of {SINK_FORMATS}")
+        if self.format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "Parquet interaction sinks require pyarrow: pip install pyarrow"
+                ) from None
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._parts = len(list(self.path.glob("part-*.parquet")))
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="donew-interaction-sink", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, record: InteractionRecord) -> None:
+        """Queue a record for writing; never blocks on disk."""
+        if not self._closed:
+            self._queue.put(record)
+
+    def flush(self) -> None:
+        """Block until every queued record is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def read(self) -> Iterator[InteractionRecord]:
+        """Every record written so far, oldest first."""
+        self.flush()
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            for part in sorted(self.path.glob("part-*.parquet")):
+                for row in pq.read_table(part).to_pylist():
+                    row["data"] = json.loads(row["data"])
+                    yield InteractionRecord(**row)
+        elif self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield InteractionRecord(**json.loads(line))
+
+    def _run(self) -> None:
+        batch: List[InteractionRecord] = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval if batch else None)
+            except queue.Empty:
+                item = threading.Event()  # idle, write the partial batch
+            if isinstance(item, InteractionRecord):
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    logger.warning(f"Failed to write {len(batch)} interaction records: {e}")
+                batch = []
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _write_batch(self, batch: List[InteractionRecord]) -> None:
+        if self.format == "jsonl":
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(r._asdict(), default=str) + "\n" for r in batch)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns: Dict[str, List[Any]] = {name: [] for name in InteractionRecord._fields}
+        for record in batch:
+            for name, value in zip(InteractionRecord._fields, record):
+                columns[name].append(value)
+        columns["data"] = [json.dumps(d, default=str) for d in columns["data"]]
+        table = pa.table(
+            columns,
+            schema=pa.schema(
+                [
+                    ("timestamp", pa.float64()),
+                    ("interaction_type", pa.string()),
+                    ("url", pa.string()),
+                    ("element_id", pa.int64()),
+                    ("data", pa.string()),
+                    ("element_type", pa.string()),
+                    ("element_label", pa.string()),
+                    ("xpath", pa.string()),
+                    ("page", pa.int64()),
+                ]
+            ),
+        )
+        pq.write_table(table, self.path / f"part-{self._parts:06d}.parquet")
+        self._parts += 1
+
+
+class InteractionLog:
+    """Ring buffer of the most recent interaction records, optionally streamed to a sink.
+
+    Args:
+        capacity: Records kept in memory; older ones are dropped from the buffer.
+        sink: Where every record is also written.
+    """
+
+    def __init__(self, capacity: int = 1000, sink: Optional[InteractionSink] = None):
+        if capacity < 1:
+            raise ValueError("interaction log capacity must be at least 1")
+        self._buffer: Deque[InteractionRecord] = deque(maxlen=capacity)
+        self.sink = sink
+        self.total = 0  # records logged, including the ones dropped from the buffer
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]]) -> "InteractionLog":
+        """Build a log from {capacity, sink, format, batch_size, flush_interval}."""
+        options = dict(options or {})
+        path = options.pop("sink", None)
+        capacity = options.pop("capacity", 1000)
+        if options and not path:
+            raise ValueError(f"interaction sink options {sorted(options)} need a sink path")
+        return cls(capacity, InteractionSink(path, **options) if path else None)
+
+    def append(self, record: InteractionRecord) -> None:
+        self._buffer.append(record)
+        self.total += 1
+        if self.sink:
+            self.sink.write(record)
+
+    def extend(self, records: Iterable[InteractionRecord]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __iter__(self) -> Iterator[InteractionRecord]:
+        return iter(self._buffer)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def dropped(self) -> int:
+        """Records no longer in the buffer."""
+        return self.total - len(self._buffer)
+
+    def records(self, full: bool = False) -> List[InteractionRecord]:
+        """Buffered records, or every record from the sink with ``full``."""
+        if full and self.sink:
+            return list(self.sink.read())
+        return list(self._buffer)
+
+    def close(self) -> None:
+        if self.sink:
+            self.sink.close()
@@ -0,0 +1,62 @@
+"""Per-page performance records.
+
+A page's time goes to the site (navigation phases, resource downloads,
+long tasks on the main thread, read from the Performance APIs) or to
+DoNew's own steps (every ``page.evaluate`` it makes, timed by step, and the
+settle waits). PageMetrics holds both, so a slow site can be told apart
+from a slow step.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+from .settle import SettleTiming
+
+
+@dataclass
+class StepTiming:
+    """Accumulated duration of one kind of DoNew step on a page."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class StepTimings:
+    """Durations of DoNew's calls into a page, by step name."""
+
+    def __init__(self) -> None:
+        self._steps: Dict[str, StepTiming] = {}
+
+    def add(self, step: str, ms: float) -> None:
+        timing = self._steps.get(step)
+        if timing is None:
+            timing = self._steps[step] = StepTiming()
+        timing.count += 1
+        timing.total_ms += ms
+        timing.max_ms = max(timing.max_ms, ms)
+
+    def snapshot(self) -> Dict[str, StepTiming]:
+        return {
+            step: StepTiming(t.count, round(t.total_ms, 1), round(t.max_ms, 1))
+            for step, t in self._steps.items()
+        }
+
+
+@dataclass
+class PageMetrics:
+    """Where the time went on one page."""
+
+    url: str
+    # Navigation Timing phases in ms (dns, connect, ttfb, dom_content_loaded, load, ...)
+    navigation: Dict[str, float] = field(default_factory=dict)
+    # Resource Timing per initiator type: count, duration_ms, transfer_bytes
+    resources: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    slowest_resources: List[Dict[str, Any]] = field(default_factory=list)
+    long_tasks: List[Dict[str, float]] = field(default_factory=list)  # start_ms, duration_ms
+    steps: Dict[str, StepTiming] = field(default_factory=dict)  # DoNew's page.evaluate calls
+    settle: List[SettleTiming] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, JSON-serializable form for export."""
+        return asdict(self)
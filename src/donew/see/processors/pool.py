@@ -0,0 +1,276 @@
+"""Pre-warmed browser context pool for WebProcessor.
+
+Launching Playwright and Chromium dominates the cost of a short browsing
+session. A ContextPool draws contexts from the shared BrowserHost browser
+and hands warm ones out to WebBrowser instances, resetting them when they
+are released.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from playwright.async_api import BrowserContext
+
+from .host import BrowserHost
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledContext:
+    """Bookkeeping for a context owned by the pool."""
+
+    context: BrowserContext
+    created_at: float = field(default_factory=time.monotonic)
+    released_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+class ContextPool:
+    """Keeps warm browser contexts and hands them out to WebBrowser instances.
+
+    Released contexts are reset (pages closed, cookies, permissions and
+    request routes cleared) and go back to the pool. Contexts that picked up origin storage
+    or fail to reset are closed and replaced, since Playwright cannot wipe
+    storage in place. Idle contexts above ``min_size`` are evicted after
+    ``idle_timeout`` seconds.
+
+    Args:
+        min_size: Number of contexts kept warm.
+        max_size: Upper bound on live contexts; ``acquire`` waits beyond it.
+        idle_timeout: Seconds an idle context may sit before it is evicted.
+        launch_kwargs: Arguments for ``chromium.launch``.
+        context_kwargs: Arguments for ``browser.new_context``.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        launch_kwargs: Optional[Dict[str, Any]] = None,
+        context_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._launch_kwargs = launch_kwargs or {}
+        self._context_kwargs = context_kwargs or {}
+
+        self._host: Optional[BrowserHost] = None
+        self._idle: List[PooledContext] = []
+        self._leased: Dict[int, PooledContext] = {}
+        self._size = 0  # idle + leased + being created
+        self._condition = asyncio.Condition()
+        self._start_lock = asyncio.Lock()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._closed = False
+        self._counters = {"created": 0, "reused": 0, "recycled": 0, "evicted": 0}
+
+    async def start(self) -> "ContextPool":
+        """Attach to the shared browser and warm up ``min_size`` contexts."""
+        async with self._start_lock:
+            if self._closed:
+                raise ValueError("Context pool is closed")
+            if self._host is None:
+                self._host = BrowserHost.current()
+        await self._fill()
+        return self
+
+    async def acquire(self) -> BrowserContext:
+        """Get a warm context, creating one if the pool is below ``max_size``."""
+        await self.start()
+
+        entry: Optional[PooledContext] = None
+        async with self._condition:
+            stale = self._evict_idle()
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._counters["reused"] += 1
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                await self._condition.wait()
+        await self._close_all(stale)
+
+        if entry is None:
+            try:
+                entry = PooledContext(context=await self._new_context())
+            except Exception:
+                async with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+
+        entry.uses += 1
+        self._leased[id(entry.context)] = entry
+        self._schedule_fill()
+        return entry.context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Reset a context and return it to the pool."""
+        entry = self._leased.pop(id(context), None)
+        if entry is None:
+            # Not one of ours, nothing to hand back
+            await BrowserHost.current().close_context(context)
+            return
+
+        reusable = not self._closed and await self._reset(entry.context)
+        async with self._condition:
+            if reusable:
+                entry.released_at = time.monotonic()
+                self._idle.append(entry)
+            else:
+                self._size -= 1
+                self._counters["recycled"] += 1
+            stale = self._evict_idle()
+            self._condition.notify()
+
+        if not reusable:
+            await self._close_all([entry])
+        await self._close_all(stale)
+
+    async def close(self) -> None:
+        """Close every context, releasing the shared browser once unused."""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        async with self._condition:
+            entries = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased.clear()
+            self._size = 0
+            self._condition.notify_all()
+        await self._close_all(entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Pool occupancy and lifetime counters."""
+        return {
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "size": self._size,
+            **self._counters,
+        }
+
+    async def _new_context(self) -> BrowserContext:
+        if self._host is None:
+            raise ValueError("Context pool is not started")
+        context = await self._host.new_context(
+            self._launch_kwargs, self._context_kwargs
+        )
+        self._counters["created"] += 1
+        return context
+
+    async def _reset(self, context: BrowserContext) -> bool:
+        """Bring a context back to a clean state. Returns False if it must be recycled."""
+        try:
+            for page in list(context.pages):
+                await page.close()
+            # Web storage and IndexedDB cannot be cleared from outside a page;
+            # IndexedDB is only reported when asked for
+            state = await context.storage_state(indexed_db=True)
+            if any(
+                origin.get("localStorage") or origin.get("indexedDB")
+                for origin in state.get("origins", [])
+            ):
+                return False
+            await context.clear_cookies()
+            await context.clear_permissions()
+            # Routes belong to the session that installed them
+            await context.unroute_all(behavior="ignoreErrors")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled context: {e}")
+            return False
+
+    def _evict_idle(self) -> List[PooledContext]:
+        """Pop idle contexts past their timeout, keeping ``min_size`` warm.
+
+        Must be called with the condition held.
+        """
+        now = time.monotonic()
+        stale = []
+        # Oldest releases sit at the front of the idle list
+        while (
+            self._idle
+            and len(self._idle) > self.min_size
+            and now - self._idle[0].released_at > self.idle_timeout
+        ):
+            stale.append(self._idle.pop(0))
+        self._size -= len(stale)
+        self._counters["evicted"] += len(stale)
+        return stale
+
+    async def _fill(self) -> None:
+        """Create contexts until ``min_size`` are warm."""
+        while not self._closed:
+            async with self._condition:
+                if len(self._idle) >= self.min_size or self._size >= self.max_size:
+                    return
+                self._size += 1
+            try:
+                entry = PooledContext(context=await self._new_context())
+            except Exception as e:
+                logger.warning(f"Failed to warm up pooled context: {e}")
+                async with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                return
+            async with self._condition:
+                self._idle.insert(0, entry)
+                self._condition.notify()
+
+    def _schedule_fill(self) -> None:
+        if self._closed or len(self._idle) >= self.min_size:
+            return
+        task = asyncio.create_task(self._fill())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _close_all(self, entries: List[PooledContext]) -> None:
+        for entry in entries:
+            if self._host:
+                await self._host.close_context(entry.context)
+            else:
+                await entry.context.close()
+
+
+_POOLS: Dict[Tuple[Any, ...], Tuple[asyncio.AbstractEventLoop, ContextPool]] = {}
+
+
+def shared_pool(
+    launch_kwargs: Dict[str, Any],
+    context_kwargs: Dict[str, Any],
+    **options: Any,
+) -> ContextPool:
+    """Get the process-wide pool for a launch/context configuration.
+
+    Pools are bound to the running event loop, since Playwright objects
+    cannot cross loops.
+    """
+    loop = asyncio.get_running_loop()
+    key = (
+        id(loop),
+        repr(sorted(launch_kwargs.items())),
+        repr(sorted(context_kwargs.items())),
+        repr(sorted(options.items())),
+    )
+    found = _POOLS.get(key)
+    if found and found[0] is loop and not found[1]._closed:
+        return found[1]
+
+    pool = ContextPool(
+        launch_kwargs=launch_kwargs, context_kwargs=context_kwargs, **options
+    )
+    _POOLS[key] = (loop, pool)
+    return pool
@@ -0,0 +1,169 @@
+"""Interaction profiles: how clicks and typing are performed.
+
+The human profile moves the pointer in steps, pauses between mouse down
+and up and types key by key, which costs hundreds of milliseconds per
+action but looks like a person. The fast profile dispatches clicks at the
+element's center and fills inputs in one go. The adaptive profile acts fast
+and falls back to human behavior, for the rest of the session, on sites
+where a fast action fails.
+
+Every action returns the name of the behavior that performed it, recorded
+with its latency in the page's interaction log.
+"""
+
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import Locator, Page
+
+Box = Dict[str, float]
+
+
+def pointer_target(box: Box, jitter: float = 0.1) -> Tuple[float, float]:
+    """A point near the center of a box, off by up to ``jitter`` of its size."""
+    x = box["x"] + box["width"] / 2 + random.uniform(-box["width"] * jitter, box["width"] * jitter)
+    y = box["y"] + box["height"] / 2 + random.uniform(-box["height"] * jitter, box["height"] * jitter)
+    return x, y
+
+
+class InteractionProfile(ABC):
+    """Performs clicks and typing on elements of a page."""
+
+    name: str = "custom"
+
+    @abstractmethod
+    async def click(self, page: Page, box: Optional[Box], locator: Locator) -> str:
+        """Click the element with viewport box ``box``. Returns the behavior used."""
+
+    @abstractmethod
+    async def type(self, page: Page, box: Optional[Box], locator: Locator, text: str) -> str:
+        """Enter ``text`` into the element. Returns the behavior used."""
+
+
+class HumanProfile(InteractionProfile):
+    """Stepped pointer movement, pauses and key-by-key typing."""
+
+    name = "human"
+
+    def __init__(self, steps: int = 10, pause: float = 0.1):
+        self.steps = steps
+        self.pause = pause
+
+    async def _press(self, page: Page, box: Optional[Box], hover: bool = False) -> None:
+        if not box:
+            raise ValueError("Element does not have a bounding box")
+        x, y = pointer_target(box)
+        await page.mouse.move(x, y, steps=self.steps)
+        if hover:
+            await asyncio.sleep(self.pause)
+        await page.mouse.down()
+        await asyncio.sleep(self.pause)
+        await page.mouse.up()
+
+    async def click(self, page: Page, box: Optional[Box], locator: Locator) -> str:
+        await self._press(page, box)
+        return self.name
+
+    async def type(self, page: Page, box: Optional[Box], locator: Locator, text: str) -> str:
+        await self._press(page, box, hover=True)
+        await asyncio.sleep(self.pause)
+        await page.keyboard.type(text)
+        return self.name
+
+
+class FastProfile(InteractionProfile):
+    """Clicks dispatched at the element's center, inputs filled at once.
+
+    Filling replaces the value of an input; elements that cannot be filled
+    are clicked and get the text inserted at the caret.
+    """
+
+    name = "fast"
+
+    def __init__(self, timeout_ms: float = 5000):
+        self.timeout_ms = timeout_ms
+
+    async def click(self, page: Page, box: Optional[Box], locator: Locator) -> str:
+        if box:
+            await page.mouse.click(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+        else:
+            await locator.click(timeout=self.timeout_ms)
+        return self.name
+
+    async def type(self, page: Page, box: Optional[Box], locator: Locator, text: str) -> str:
+        try:
+            await locator.fill(text, timeout=self.timeout_ms)
+        except Exception:
+            await self.click(page, box, locator)
+            await page.keyboard.insert_text(text)
+        return self.name
+
+
+class AdaptiveProfile(InteractionProfile):
+    """Fast actions, with human behavior on sites where they fail.
+
+    A failed fast action is retried the human way, and the site's origin
+    stays human for the rest of the session. ``escalate`` switches a site
+    by hand, e.g. once a bot check shows up.
+    """
+
+    name = "adaptive"
+
+    def __init__(self, fast: Optional[InteractionProfile] = None, human: Optional[InteractionProfile] = None):
+        self.fast = fast or FastProfile()
+        self.human = human or HumanProfile()
+        self._human_origins: Set[str] = set()
+
+    def escalate(self, url: str) -> None:
+        """Use human behavior on the site of ``url`` from now on."""
+        self._human_origins.add(_origin(url))
+
+    def mode(self, url: str) -> str:
+        """The behavior used on the site of ``url``, "fast" or "human"."""
+        return "human" if _origin(url) in self._human_origins else "fast"
+
+    async def click(self, page: Page, box: Optional[Box], locator: Locator) -> str:
+        if self.mode(page.url) == "fast":
+            try:
+                return await self.fast.click(page, box, locator)
+            except Exception:
+                self.escalate(page.url)
+        return await self.human.click(page, box, locator)
+
+    async def type(self, page: Page, box: Optional[Box], locator: Locator, text: str) -> str:
+        if self.mode(page.url) == "fast":
+            try:
+                return await self.fast.type(page, box, locator, text)
+            except Exception:
+                self.escalate(page.url)
+        return await self.human.type(page, box, locator, text)
+
+
+PROFILES = {
+    "human": HumanProfile,
+    "fast": FastProfile,
+    "adaptive": AdaptiveProfile,
+}
+
+
+def resolve_interaction_profile(
+    profile: Union[str, InteractionProfile, None]
+) -> InteractionProfile:
+    """Build an interaction profile from its name, defaulting to human behavior."""
+    if profile is None:
+        return HumanProfile()
+    if isinstance(profile, InteractionProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown interaction profile {profile!r}, expected one of {sorted(PROFILES)}"
+        )
+    return PROFILES[profile]()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
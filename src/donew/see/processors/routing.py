@@ -0,0 +1,264 @@
+"""Request routing profiles for WebProcessor.
+
+Pages download images, fonts, media, ads and analytics even when only
+text and elements are wanted. A RequestRouter intercepts every request in
+a browser context and aborts the ones its RouteProfile blocks, keeping
+per-page counters of what it blocked.
+
+Handlers call ``route.fallback()`` for requests they let through, so other
+context routes (recording, caching) still see them.
+
+HarConfig records a session's traffic to a HAR file, or replays one with
+no network access.
+"""
+
+import logging
+import re
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Set, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page, Request, Route
+
+logger = logging.getLogger(__name__)
+
+# Ad and tracking hosts; analytics overlaps with the settle detector's ignore list
+AD_PATTERNS: List[str] = [
+    r"doubleclick\.net",
+    r"googlesyndication\.com",
+    r"googleadservices\.com",
+    r"adservice\.google\.",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"amazon-adsystem\.com",
+    r"adnxs\.com",
+    r"criteo\.(com|net)",
+    r"taboola\.com",
+    r"outbrain\.com",
+    r"scorecardresearch\.com",
+    r"facebook\.com/tr",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"segment\.(io|com)",
+    r"mixpanel\.com",
+]
+
+# Typical transfer sizes per resource type, in bytes. Aborted requests are
+# never downloaded, so blocked bytes can only be estimated.
+TYPICAL_BYTES: Dict[str, int] = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 30_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+
+@dataclass
+class RouteProfile:
+    """What a RequestRouter blocks.
+
+    Documents are never blocked. ``allow_patterns`` win over everything
+    else; ``deny_patterns`` block regardless of resource type.
+    """
+
+    name: str = "custom"
+    block_resource_types: Set[str] = field(default_factory=set)
+    deny_patterns: Sequence[str] = field(default_factory=list)
+    allow_patterns: Sequence[str] = field(default_factory=list)
+    block_third_party: bool = False  # block subresources from other sites than the page
+
+
+PROFILES: Dict[str, RouteProfile] = {
+    "text-only": RouteProfile(
+        name="text-only",
+        block_resource_types={"image", "media", "font", "stylesheet"},
+        deny_patterns=AD_PATTERNS,
+    ),
+    "no-media": RouteProfile(
+        name="no-media",
+        block_resource_types={"image", "media", "font"},
+    ),
+    "no-ads": RouteProfile(name="no-ads", deny_patterns=AD_PATTERNS),
+    "no-third-party": RouteProfile(name="no-third-party", block_third_party=True),
+}
+
+
+def resolve_profile(
+    routing: Union[str, Dict, RouteProfile, None]
+) -> Optional[RouteProfile]:
+    """Build a RouteProfile from a profile name, an options dict or a profile.
+
+    A dict may name a base ``profile`` and add ``allow``/``deny`` patterns,
+    ``block`` resource types and ``third_party`` blocking on top of it.
+    """
+    if routing is None or isinstance(routing, RouteProfile):
+        return routing
+    if isinstance(routing, str):
+        routing = {"profile": routing}
+    if not isinstance(routing, dict):
+        raise ValueError("routing must be a profile name, a dict or a RouteProfile")
+
+    name = routing.get("profile")
+    if name is not None and name not in PROFILES:
+        raise ValueError(
+            f"Unknown routing profile {name!r}, expected one of {sorted(PROFILES)}"
+        )
+    base = PROFILES[name] if name else RouteProfile()
+    return RouteProfile(
+        name=name or "custom",
+        block_resource_types=set(base.block_resource_types) | set(routing.get("block", [])),
+        deny_patterns=list(base.deny_patterns) + list(routing.get("deny", [])),
+        allow_patterns=list(base.allow_patterns) + list(routing.get("allow", [])),
+        block_third_party=bool(routing.get("third_party", base.block_third_party)),
+    )
+
+
+@dataclass
+class RouteStats:
+    """Requests a router let through or blocked for one page."""
+
+    url: str = ""
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    blocked_bytes: int = 0  # estimated from TYPICAL_BYTES
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+def _site(url: str) -> str:
+    """Rough registrable domain: the last two host labels."""
+    host = urlsplit(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+class RequestRouter:
+    """Applies a RouteProfile to every request of a browser context."""
+
+    def __init__(self, profile: RouteProfile):
+        self.profile = profile
+        self._deny: List[Pattern[str]] = [re.compile(p) for p in profile.deny_patterns]
+        self._allow: List[Pattern[str]] = [re.compile(p) for p in profile.allow_patterns]
+        self._stats: "weakref.WeakKeyDictionary[Page, RouteStats]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def install(self, context: BrowserContext) -> None:
+        """Start routing the context's requests through this profile."""
+        await context.route("**/*", self._handle)
+
+    async def remove(self, context: BrowserContext) -> None:
+        """Stop routing the context's requests."""
+        try:
+            await context.unroute("**/*", self._handle)
+        except Exception as e:
+            logger.debug(f"Failed to remove request routes: {e}")
+
+    def stats(self, page: Page) -> RouteStats:
+        """Counters for one page."""
+        stats = self._stats.get(page)
+        if stats is None:
+            stats = self._stats[page] = RouteStats()
+        stats.url = page.url
+        return stats
+
+    def blocks(self, request: Request) -> bool:
+        """Whether the profile blocks a request."""
+        if request.is_navigation_request() or request.resource_type == "document":
+            return False
+        url = request.url
+        if any(p.search(url) for p in self._allow):
+            return False
+        if request.resource_type in self.profile.block_resource_types:
+            return True
+        if any(p.search(url) for p in self._deny):
+            return True
+        if self.profile.block_third_party:
+            page_url = self._page_url(request)
+            if page_url.startswith("http") and _site(url) != _site(page_url):
+                return True
+        return False
+
+    async def _handle(self, route: Route, request: Request) -> None:
+        page = self._page_of(request)
+        if not self.blocks(request):
+            if page:
+                self.stats(page).allowed_requests += 1
+            await route.fallback()
+            return
+
+        if page:
+            stats = self.stats(page)
+            stats.blocked_requests += 1
+            stats.blocked_bytes += TYPICAL_BYTES.get(request.resource_type, TYPICAL_BYTES["other"])
+            stats.blocked_by_type[request.resource_type] = (
+                stats.blocked_by_type.get(request.resource_type, 0) + 1
+            )
+        await route.abort("blockedbyclient")
+
+    @staticmethod
+    def _page_of(request: Request) -> Optional[Page]:
+        # Service worker requests have no frame
+        try:
+            return request.frame.page
+        except Exception:
+            return None
+
+    def _page_url(self, request: Request) -> str:
+        page = self._page_of(request)
+        return page.url if page else ""
+
+
+@dataclass
+class HarConfig:
+    """Record a session's network traffic to a HAR file, or replay one offline.
+
+    Recording goes through the context's ``record_har_path`` option, so the
+    file is written when the context closes. Replay serves matching
+    requests from the file; with ``not_found="abort"`` anything missing
+    from it fails instead of reaching the network.
+
+    Args:
+        path: HAR file; a ``.zip`` path stores bodies as separate entries.
+        mode: "record" or "replay".
+        url: Glob or regex limiting which requests are recorded or replayed.
+        not_found: In replay, "abort" or "fallback" (to the network) for unknown requests.
+        content: In record, "embed", "attach" or "omit" response bodies.
+    """
+
+    path: str
+    mode: str = "replay"
+    url: Optional[Union[str, Pattern[str]]] = None
+    not_found: str = "abort"
+    content: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.mode not in ("record", "replay"):
+            raise ValueError("har mode must be 'record' or 'replay'")
+        if self.not_found not in ("abort", "fallback"):
+            raise ValueError("har not_found must be 'abort' or 'fallback'")
+        if self.mode == "replay" and not Path(self.path).exists():
+            raise ValueError(f"HAR file not found: {self.path}")
+
+    def context_kwargs(self) -> Dict[str, Any]:
+        """Context options that record traffic, empty in replay mode."""
+        if self.mode != "record":
+            return {}
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        kwargs: Dict[str, Any] = {"record_har_path": self.path}
+        if self.url is not None:
+            kwargs["record_har_url_filter"] = self.url
+        if self.content is not None:
+            kwargs["record_har_content"] = self.content
+        return kwargs
+
+    async def install(self, context: BrowserContext) -> None:
+        """Serve the context's requests from the HAR file (replay mode only)."""
+        if self.mode != "replay":
+            return
+        await context.route_from_har(self.path, url=self.url, not_found=self.not_found)  # type: ignore
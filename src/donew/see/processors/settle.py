@@ -0,0 +1,154 @@
+"""Event-driven page settle detection.
+
+Replaces fixed sleeps and ``networkidle`` waits. A page counts as settled
+once the DOM and layout have been quiet for ``quiet_ms`` and no fetch/XHR
+request is in flight. Websockets, event streams, known analytics beacons
+and long-polling requests are ignored, so they cannot hold the wait open.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Sequence
+
+from playwright.async_api import Page, Request
+
+logger = logging.getLogger(__name__)
+
+# Analytics and telemetry endpoints that never matter for page content
+DEFAULT_IGNORE_PATTERNS: List[str] = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"analytics\.google\.com",
+    r"doubleclick\.net",
+    r"facebook\.com/tr",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"segment\.(io|com)",
+    r"mixpanel\.com",
+    r"amplitude\.com",
+    r"sentry\.io",
+    r"nr-data\.net",
+    r"newrelic\.com",
+    r"/collect\?",
+    r"/beacon",
+]
+
+# Resource types that can hold content up; everything else is left to the load event
+TRACKED_RESOURCE_TYPES = {"fetch", "xhr"}
+
+
+@dataclass
+class SettleConfig:
+    """Tuning knobs for SettleDetector."""
+
+    quiet_ms: int = 300  # DOM and layout must be unchanged for this long
+    timeout_ms: int = 5000  # give up waiting after this long
+    long_request_ms: int = 3000  # requests older than this count as long-polling
+    ignore_patterns: Sequence[str] = field(
+        default_factory=lambda: list(DEFAULT_IGNORE_PATTERNS)
+    )
+
+
+@dataclass
+class SettleTiming:
+    """How long one settle wait took and what it waited on."""
+
+    url: str
+    total_ms: float
+    dom_ms: float  # time spent waiting for DOM and layout quiet
+    network_ms: float  # time spent waiting for fetch/XHR to drain
+    mutations: int
+    pending_requests: int  # tracked requests still in flight at the end
+    timed_out: bool
+
+
+class SettleDetector:
+    """Tracks a tab's in-flight requests and waits for the page to go quiet."""
+
+    def __init__(self, page: Page, script: str, config: Optional[SettleConfig] = None):
+        self._page = page
+        self._script = script
+        self.config = config or SettleConfig()
+        self._ignore: List[Pattern[str]] = [
+            re.compile(p) for p in self.config.ignore_patterns
+        ]
+        self._pending: Dict[Request, float] = {}
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _tracked(self, request: Request) -> bool:
+        if request.resource_type not in TRACKED_RESOURCE_TYPES:
+            return False
+        return not any(p.search(request.url) for p in self._ignore)
+
+    def _on_request(self, request: Request) -> None:
+        if self._tracked(request):
+            self._pending[request] = time.monotonic()
+
+    def _on_request_done(self, request: Request) -> None:
+        self._pending.pop(request, None)
+
+    def pending(self) -> int:
+        """Tracked requests in flight, not counting long-polling ones."""
+        cutoff = time.monotonic() - self.config.long_request_ms / 1000
+        return sum(1 for started in self._pending.values() if started > cutoff)
+
+    async def wait(self, timeout_ms: Optional[int] = None) -> SettleTiming:
+        """Wait until the DOM, layout and network are quiet, or the timeout passes."""
+        timeout = (self.config.timeout_ms if timeout_ms is None else timeout_ms) / 1000
+        start = time.monotonic()
+        deadline = start + timeout
+        dom_time = network_time = 0.0
+        mutations = 0
+        timed_out = False
+
+        while True:
+            # Wait for the DOM and layout to stop changing
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            step = time.monotonic()
+            try:
+                result = await self._page.evaluate(
+                    self._script,
+                    {"quietMs": self.config.quiet_ms, "timeoutMs": remaining * 1000},
+                )
+                mutations += result["mutations"]
+                dom_quiet = not result["timedOut"]
+            except Exception as e:
+                # The document was replaced mid-wait; start over on the new one
+                logger.debug(f"Settle check interrupted: {e}")
+                dom_quiet = False
+                await asyncio.sleep(0.05)
+            dom_time += time.monotonic() - step
+
+            # Then for fetch/XHR to drain
+            step = time.monotonic()
+            had_pending = self.pending() > 0
+            while self.pending() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            network_time += time.monotonic() - step
+
+            if self.pending():
+                timed_out = True
+                break
+            # Responses that arrived may have changed the DOM again
+            if dom_quiet and not had_pending:
+                break
+
+        return SettleTiming(
+            url=self._page.url,
+            total_ms=(time.monotonic() - start) * 1000,
+            dom_ms=dom_time * 1000,
+            network_ms=network_time * 1000,
+            mutations=mutations,
+            pending_requests=self.pending(),
+            timed_out=timed_out,
+        )
@@ -0,0 +1,188 @@
+"""Uniform-grid spatial index over detected element boxes.
+
+Built from the ElementStore columns after each detection. Boxes are
+bucketed into square cells, so region and point queries only test the
+elements in the cells they touch. Elements spanning many cells (page
+wrappers, backgrounds) are kept on a separate list that every query
+checks, so they do not bloat the cells.
+
+Painting order approximates the browser's: a higher ``z_index`` wins,
+then later document order (descendants paint over their ancestors).
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+Rect = Tuple[float, float, float, float]  # x1, y1, x2, y2
+
+# Cell keys pack (column, row) into one int64; rows are offset so negative
+# coordinates (content scrolled above the viewport) still sort in order
+_ROW_OFFSET = 1 << 31
+
+
+def _key(cx, cy):
+    return (cx << 32) + (cy + _ROW_OFFSET)
+
+
+class SpatialIndex:
+    """Grid index answering containment, intersection, hit-test and nearest queries.
+
+    Args:
+        ids: Element IDs, in document order.
+        boxes: (n, 4) array of x, y, width, height; NaN or empty boxes are skipped.
+        z: Effective z-index per element.
+        cell_size: Grid cell edge in CSS pixels; derived from the boxes if omitted.
+        max_cells: Elements covering more cells than this go on the large list.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        boxes: np.ndarray,
+        z: np.ndarray,
+        cell_size: Optional[float] = None,
+        max_cells: int = 64,
+    ):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        visible = np.isfinite(boxes).all(axis=1) & (boxes[:, 2] > 0) & (boxes[:, 3] > 0)
+        self.ids = np.asarray(ids, dtype=np.int64)[visible]
+        self.x1 = boxes[visible, 0]
+        self.y1 = boxes[visible, 1]
+        self.x2 = self.x1 + boxes[visible, 2]
+        self.y2 = self.y1 + boxes[visible, 3]
+        # Paint order: z-index first, document order second; higher paints on top
+        order = np.lexsort((self.ids, np.asarray(z, dtype=np.float64)[visible]))
+        self.rank = np.empty(len(order), np.int64)
+        self.rank[order] = np.arange(len(order))
+
+        if cell_size is None:
+            # Typical element size keeps most elements in a handful of cells
+            sizes = np.maximum(self.x2 - self.x1, self.y2 - self.y1)
+            cell_size = float(np.clip(np.median(sizes) * 2, 32, 512)) if len(sizes) else 128.0
+        self.cell_size = cell_size
+
+        cx1, cy1, cx2, cy2 = self._cells(self.x1, self.y1, self.x2, self.y2)
+        cells = (cx2 - cx1 + 1) * (cy2 - cy1 + 1)
+        large = cells > max_cells
+        self.large = np.flatnonzero(large)
+
+        # Bucket the rest: one (cell key, row) pair per covered cell, sorted by key
+        small = np.flatnonzero(~large)
+        heights = (cy2 - cy1 + 1)[small]
+        counts = cells[small]
+        all_rows = np.repeat(small, counts)
+        # Position of each pair within its element's cell block
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        column_height = np.repeat(heights, counts)
+        all_keys = _key(cx1[all_rows] + local // column_height, cy1[all_rows] + local % column_height)
+        order = np.argsort(all_keys, kind="stable")
+        self._keys = all_keys[order]
+        self._rows = all_rows[order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def within(self, rect: Rect) -> np.ndarray:
+        """IDs of elements entirely inside ``rect``, in document order."""
+        x1, y1, x2, y2 = rect
+        rows = self._candidates(rect)
+        inside = (
+            (self.x1[rows] >= x1)
+            & (self.y1[rows] >= y1)
+            & (self.x2[rows] <= x2)
+            & (self.y2[rows] <= y2)
+        )
+        return np.sort(self.ids[rows[inside]])
+
+    def intersecting(self, rect: Rect) -> np.ndarray:
+        """IDs of elements overlapping ``rect``, in document order."""
+        x1, y1, x2, y2 = rect
+        rows = self._candidates(rect)
+        overlap = (
+            (self.x1[rows] < x2)
+            & (self.x2[rows] > x1)
+            & (self.y1[rows] < y2)
+            & (self.y2[rows] > y1)
+        )
+        return np.sort(self.ids[rows[overlap]])
+
+    def at(self, x: float, y: float) -> List[int]:
+        """IDs of elements under a point, topmost first."""
+        rows = self._candidates((x, y, x, y))
+        hit = (
+            (self.x1[rows] <= x)
+            & (self.x2[rows] > x)
+            & (self.y1[rows] <= y)
+            & (self.y2[rows] > y)
+        )
+        rows = rows[hit]
+        return self.ids[rows[np.argsort(-self.rank[rows])]].tolist()
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[int]:
+        """IDs of the ``k`` elements closest to a point, nearest (then topmost) first.
+
+        Distance is measured to the box edge, so every element containing
+        the point is at distance zero.
+        """
+        if k <= 0 or not len(self.ids):
+            return []
+        # Grow a square search window until it holds k elements within its
+        # reach; anything outside the window is farther than those
+        reach = self.cell_size
+        extent = self._extent(x, y)
+        while True:
+            rows = self._candidates((x - reach, y - reach, x + reach, y + reach))
+            if reach >= extent or len(rows) == len(self.ids):
+                found = rows
+                break
+            found = rows[self._distance(rows, x, y) <= reach]
+            if len(found) >= k:
+                break
+            reach *= 2
+        distance = self._distance(found, x, y)
+        order = np.lexsort((-self.rank[found], distance))[:k]
+        return self.ids[found[order]].tolist()
+
+    def _distance(self, rows: np.ndarray, x: float, y: float) -> np.ndarray:
+        dx = np.maximum(np.maximum(self.x1[rows] - x, 0), x - self.x2[rows])
+        dy = np.maximum(np.maximum(self.y1[rows] - y, 0), y - self.y2[rows])
+        return np.hypot(dx, dy)
+
+    def _extent(self, x: float, y: float) -> float:
+        """Distance from the point to the far edge of all indexed boxes."""
+        if not len(self.ids):
+            return 0.0
+        return float(
+            max(
+                abs(x - self.x1.min()),
+                abs(self.x2.max() - x),
+                abs(y - self.y1.min()),
+                abs(self.y2.max() - y),
+            )
+        )
+
+    def _cells(self, x1, y1, x2, y2):
+        size = self.cell_size
+        return (
+            np.floor_divide(x1, size).astype(np.int64),
+            np.floor_divide(y1, size).astype(np.int64),
+            np.floor_divide(x2, size).astype(np.int64),
+            np.floor_divide(y2, size).astype(np.int64),
+        )
+
+    def _candidates(self, rect: Rect) -> np.ndarray:
+        """Rows that may touch ``rect``: the large list plus the covered cells."""
+        cx1, cy1, cx2, cy2 = (int(c) for c in self._cells(*map(np.float64, rect)))
+        parts = [self.large]
+        width = cx2 - cx1 + 1
+        if width * (cy2 - cy1 + 1) > len(self._keys):
+            # Bigger than the index itself, scanning everything is cheaper
+            return np.arange(len(self.ids))
+        for cx in range(cx1, cx2 + 1):
+            # Keys of one grid column are contiguous, from (cx, cy1) to (cx, cy2)
+            low = np.searchsorted(self._keys, _key(cx, cy1), "left")
+            high = np.searchsorted(self._keys, _key(cx, cy2), "right")
+            if high > low:
+                parts.append(self._rows[low:high])
+        return np.unique(np.concatenate(parts))
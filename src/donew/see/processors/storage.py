@@ -0,0 +1,107 @@
+"""Saved browser state: cookies, Web Storage and IndexedDB.
+
+A state file is Playwright's storage state (cookies, and localStorage and
+IndexedDB per origin) plus the sessionStorage of open tabs per origin. A new
+session started from one skips the login flow it captures.
+
+Playwright restores cookies, localStorage and IndexedDB when a context is
+created. sessionStorage, and state loaded into a running session, are
+seeded into each document of a saved origin by an init script instead;
+IndexedDB cannot be seeded that way and is only restored with a new context.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from playwright.async_api import BrowserContext
+
+# Prefix of the keys storage_seed.js marks seeded storage areas with
+MARKER = "__dosee_state__"
+
+StateSource = Union[str, "os.PathLike[str]", Dict[str, Any]]
+
+
+def read_state(source: StateSource) -> Dict[str, Any]:
+    """Load a saved state from a file, or check one given as a dict."""
+    if isinstance(source, dict):
+        state = source
+    else:
+        try:
+            state = json.loads(Path(source).read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot read browser state from {source}: {e}") from e
+    if not isinstance(state, dict) or not isinstance(state.get("cookies", []), list):
+        raise ValueError("Browser state must be a dict with a list of cookies")
+    return state
+
+
+def write_state(state: Dict[str, Any], path: Union[str, "os.PathLike[str]"]) -> None:
+    """Write a state file, replacing any previous one only once it is complete."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def context_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a saved state Playwright restores into a new context."""
+    return {"cookies": state.get("cookies", []), "origins": state.get("origins", [])}
+
+
+async def capture_state(context: BrowserContext) -> Dict[str, Any]:
+    """Capture cookies, localStorage and IndexedDB, and sessionStorage of open tabs."""
+    state: Dict[str, Any] = dict(await context.storage_state(indexed_db=True))
+    for origin in state.get("origins", []):
+        origin["localStorage"] = _unmarked(origin.get("localStorage", []))
+
+    sessions: Dict[str, List[Dict[str, str]]] = {}
+    for page in context.pages:
+        try:
+            origin, items = await page.evaluate(
+                "() => [location.origin, Object.entries(sessionStorage)]"
+            )
+        except Exception:
+            continue  # closed, or no storage for this document
+        items = _unmarked([{"name": name, "value": value} for name, value in items])
+        if origin != "null" and items:
+            sessions[origin] = items
+    state["sessionStorage"] = [
+        {"origin": origin, "sessionStorage": items} for origin, items in sessions.items()
+    ]
+    return state
+
+
+def seed_script(state: Dict[str, Any], source: str, local: bool = True) -> Optional[str]:
+    """Init script seeding the state's Web Storage, or None if there is nothing to seed.
+
+    Args:
+        source: The storage_seed.js function.
+        local: Seed localStorage too, when it was not restored with the context.
+    """
+    origins: Dict[str, Dict[str, List[Dict[str, str]]]] = {}
+    if local:
+        for entry in state.get("origins", []):
+            if entry.get("localStorage"):
+                origins.setdefault(entry["origin"], {})["localStorage"] = entry["localStorage"]
+    for entry in state.get("sessionStorage", []):
+        if entry.get("sessionStorage"):
+            origins.setdefault(entry["origin"], {})["sessionStorage"] = entry["sessionStorage"]
+    if not origins:
+        return None
+    payload = json.dumps(origins, sort_keys=True)
+    seed = {"id": hashlib.sha1(payload.encode()).hexdigest()[:16], "origins": origins}
+    return f"({source})({json.dumps(seed)})"
+
+
+def _unmarked(items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    return [item for item in items if not item["name"].startswith(MARKER)]
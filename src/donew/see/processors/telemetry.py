@@ -0,0 +1,81 @@
+"""Opt-in OpenTelemetry spans for the browser layer.
+
+Spans cover navigation, element detection, text, images, clicks and typing,
+with attributes for element counts, payload sizes and settle times. They
+are off until ``enable()`` is called (``donew.utils.enable_tracing`` does),
+and while off ``span()`` returns a shared no-op after a single flag check,
+so instrumented paths cost next to nothing.
+
+Attributes known only at the end of a block go through ``set_attributes``,
+and ones that are expensive to compute only when ``is_recording()`` is true.
+"""
+
+from typing import Any, ContextManager, Optional
+
+_tracer: Optional[Any] = None
+
+
+class _NoSpan:
+    """Stands in for a span, and its context manager, while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enable(tracer_provider: Optional[Any] = None) -> None:
+    """Start emitting spans, through ``tracer_provider`` or the global one."""
+    global _tracer
+    try:
+        from opentelemetry import trace
+    except ImportError as e:
+        raise ImportError(
+            "Browser tracing needs opentelemetry: pip install opentelemetry-sdk"
+        ) from e
+    _tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+
+
+def disable() -> None:
+    """Stop emitting spans."""
+    global _tracer
+    _tracer = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Any]:
+    """A span named ``donew.<name>`` made current for the block, or a no-op.
+
+    Attribute names are prefixed with ``donew.``; None values are left out.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_as_current_span(
+        f"donew.{name}",
+        attributes={f"donew.{k}": v for k, v in attributes.items() if v is not None},
+    )
+
+
+def set_attributes(active: Any, **attributes: Any) -> None:
+    """Set ``donew.``-prefixed attributes on a span, skipping None values."""
+    if not active.is_recording():
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            active.set_attribute(f"donew.{key}", value)
@@ -1,15 +1,34 @@
+import math
 import time
-from typing import List, Dict, Any, Sequence, Union, Optional, Tuple
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Any, Mapping, Sequence, Union, Optional, Tuple
 from dataclasses import dataclass, field
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, Page
 import asyncio
 import importlib.resources
 import os
 from pathlib import Path
-import random
 import logging
 
+import numpy as np
+
 from . import BaseProcessor, BaseTarget, StateDict, documentation, public
+from .actions import ActionTiming, BatchResult, parse_actions
+from .annotate import render_annotations
+from .cache import AssetCache, shared_cache
+from .capture import Frame, capture, check_image_options, crop_images, stream_screencast
+from .elements import HEAVY_FIELDS, ElementMetadata, ElementStore
+from .history import HistoryConfig, HistorySpill, PageSummary
+from .host import BrowserHost
+from .interactions import InteractionLog, InteractionRecord
+from .metrics import PageMetrics, StepTimings
+from .pool import ContextPool, shared_pool
+from .profiles import HumanProfile, InteractionProfile, pointer_target, resolve_interaction_profile
+from .routing import HarConfig, RequestRouter, RouteStats, resolve_profile
+from .settle import SettleConfig, SettleDetector, SettleTiming
+from .storage import StateSource, capture_state, context_state, read_state, seed_script, write_state
+from .telemetry import set_attributes, span
 
 logger = logging.getLogger(__name__)
 
@@ -56,25 +75,6 @@ def merge_args(default_args, user_args):
 
 
 
-@dataclass
-class ElementMetadata:
-    """Rich element metadata incorporating parsing patterns."""
-
-    element_id: int
-    element_name: str  # HTML tag name
-    element_label: Optional[str]  # HTML label attribute
-    element_html: str  # Opening tag HTML
-    xpath: str  # Unique XPath
-    bounding_box: Optional[Dict[str, float]]
-    is_interactive: bool
-    element_type: str  # button, link, input, icon, text
-    attributes: Dict[str, str]  # All HTML attributes
-    computed_styles: Optional[Dict[str, str]]  # Key CSS properties
-    listeners: List[str]  # Event listeners
-    parent_id: Optional[int]  # Parent element ID
-    children_ids: List[int]  # Child element IDs
-    state: Dict[str, Any]  # Element state
-
 class NavigationError(Exception):
     """Exception raised when navigation fails."""
     def __init__(self, url: str, message: str):
@@ -82,7 +82,7 @@ class NavigationError(Exception):
         self.message = message
         super().__init__(self.message)
 
-@dataclass
+@dataclass(slots=True)
 class Interaction:
     """Record of an interaction with a page element."""
 
@@ -96,12 +96,30 @@ class Interaction:
 class WebPage(BaseTarget):
     """Manages individual page state and elements."""
 
-    _elements: Dict[int, ElementMetadata] = field(default_factory=dict)
-    _interaction_history: List[Interaction] = field(default_factory=list)
+    _elements: ElementStore = field(default_factory=ElementStore)
     _page: Optional[Page] = None
     _headless: bool = True
     _annotation_enabled: bool = False
     _channel: str = "chromium"
+    _settler: Optional[SettleDetector] = None
+    _settle_timings: List[SettleTiming] = field(default_factory=list)
+    _detection_mode: str = "full"  # "full" or "incremental"
+    _generation: int = 0  # bumped on every full detection
+    _details: "OrderedDict[int, Dict[str, Any]]" = field(default_factory=OrderedDict)
+    _details_size: int = 512  # heavy element payloads kept in the LRU
+    _router: Optional[RequestRouter] = None
+    _url: str = ""  # document URL and title at the last detection
+    _title: str = ""
+    _spill: Optional[HistorySpill] = None
+    _spill_path: Optional[str] = None  # set while compacted out of the history window
+    _element_count: int = 0
+    _log: InteractionLog = field(default_factory=InteractionLog)  # session-wide, shared by the browser's pages
+    _number: int = -1  # order in which the session opened the page, tags its log records
+    _artifacts: Dict[Any, Any] = field(default_factory=dict)  # derived from the DOM at _artifacts_version
+    _artifacts_version: Optional[str] = None
+    _profile: InteractionProfile = field(default_factory=HumanProfile)  # how clicks and typing are done
+    _steps: StepTimings = field(default_factory=StepTimings)  # DoNew's evaluate calls, timed by step
+    _site_metrics: Optional[Dict[str, Any]] = None  # kept when the tab moved on to another document
 
     async def process(self, url: str) -> "WebPage":
         """Process a webpage and extract its elements.
@@ -122,7 +140,7 @@ class WebPage(BaseTarget):
                     "Navigation error with HTTP error responses (like 404, 501) due to a known Chromium bug. "
                     "See: https://github.com/microsoft/playwright/issues/33962"
                 )
-                self._interaction_history.append(
+                self._record(
                     Interaction(
                         element_id=-1,  # No element for navigation
                         interaction_type="navigation_error",
@@ -139,29 +157,347 @@ class WebPage(BaseTarget):
 
     def elements(
         self, bbox: Optional[Tuple[float, float, float, float]] = None
-    ) -> Dict[int, ElementMetadata]:
+    ) -> Mapping[int, ElementMetadata]:
         """Get all elements, optionally filtered by bounding box.
 **Inputs**
-    bbox (Tuple[float, float, float, float], optional): Bounding box filter (x1, y1, x2, y2).
+    bbox (Tuple[float, float, float, float], optional): Bounding box filter (x1, y1, x2, y2); keeps elements entirely inside it.
 **Outputs**
-    Dict[int, ElementMetadata]: A dictionary of element IDs to metadata.
+    Mapping[int, ElementMetadata]: A mapping of element IDs to metadata.
         """
         if bbox:
-            return {
-                id: elem
-                for id, elem in self._elements.items()
-                if elem.bounding_box
-                and all(
-                    elem.bounding_box[key] >= bbox[i]
-                    for i, key in enumerate(["x", "y", "width", "height"])
-                )
-            }
+            return self.elements_in(bbox)
         else:
-            return self._elements
+            return self._store()
+
+    def elements_in(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        """Get the elements lying entirely inside a region of the viewport.
+**Inputs**
+    rect (Tuple[float, float, float, float]): Region (x1, y1, x2, y2) in CSS pixels.
+**Outputs**
+    Dict[int, ElementMetadata]: Matching elements in document order.
+        """
+        store = self._store()
+        return store.subset(store.spatial().within(rect))
+
+    def elements_intersecting(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        """Get the elements overlapping a region of the viewport.
+**Inputs**
+    rect (Tuple[float, float, float, float]): Region (x1, y1, x2, y2) in CSS pixels.
+**Outputs**
+    Dict[int, ElementMetadata]: Matching elements in document order.
+        """
+        store = self._store()
+        return store.subset(store.spatial().intersecting(rect))
+
+    def element_at(self, x: float, y: float) -> Optional[ElementMetadata]:
+        """Get the topmost element at a point of the viewport.
+**Inputs**
+    x (float): Horizontal position in CSS pixels.
+    y (float): Vertical position in CSS pixels.
+**Outputs**
+    Optional[ElementMetadata]: The element painted on top at that point, if any.
+        """
+        store = self._store()
+        hits = store.spatial().at(x, y)
+        return store[hits[0]] if hits else None
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[ElementMetadata]:
+        """Get the elements closest to a point of the viewport.
+**Inputs**
+    x (float): Horizontal position in CSS pixels.
+    y (float): Vertical position in CSS pixels.
+    k (int): How many elements to return.
+**Outputs**
+    List[ElementMetadata]: Up to k elements, nearest first; elements under the point come first, topmost first.
+        """
+        store = self._store()
+        return [store[id] for id in store.spatial().nearest(x, y, k)]
 
     def interactions(self) -> List[Interaction]:
-        """Get all interactions"""
-        return self._interaction_history
+        """Get the interactions with this page still held by the session log"""
+        return [
+            Interaction(record.element_id, record.interaction_type, record.timestamp, record.data)
+            for record in self._records()
+        ]
+
+    def _records(self) -> List[InteractionRecord]:
+        return [record for record in self._log if record.page == self._number]
+
+    def _record(self, interaction: Interaction) -> None:
+        """Add an interaction to the session log, resolved against the page's elements."""
+        if interaction.element_id < 0:
+            element = None
+            url = interaction.data.get("url", self._url)
+        else:
+            element = self._elements.get(interaction.element_id)
+            url = self._page.url if self._page else self._url
+        self._log.append(
+            InteractionRecord(
+                timestamp=interaction.timestamp,
+                interaction_type=interaction.interaction_type,
+                url=url,
+                element_id=interaction.element_id,
+                data=dict(interaction.data),
+                element_type=element.element_type if element else None,
+                element_label=element.element_label if element else None,
+                xpath=element.xpath if element else None,
+                page=self._number,
+            )
+        )
+
+    async def detect(self) -> None:
+        """Run full element detection on the current document.
+
+        In incremental mode this also installs a MutationObserver so later
+        changes can be synced as deltas.
+        """
+        script = get_script_path("element_detection.js")
+        pw_page = self.pw_page()
+        with span("detect", url=pw_page.url, mode=self._detection_mode) as active:
+            self._generation += 1
+            self._details.clear()
+            elements = await self._evaluate(
+                "detect",
+                script,
+                {
+                    "observe": self._detection_mode == "incremental",
+                    "generation": self._generation,
+                },
+            )
+            self._elements = ElementStore(elements.values(), page=self)
+            set_attributes(active, element_count=len(self._elements), generation=self._generation)
+        self._discard_spill()
+        self._url = pw_page.url
+        try:
+            self._title = await pw_page.title()
+        except Exception as e:
+            logger.debug(f"Page title unavailable: {e}")
+
+    async def _sync_elements(self) -> None:
+        """Apply DOM changes since the last detection to the elements (incremental mode only).
+
+        Unchanged elements keep their IDs; only added, removed and changed
+        subtrees plus moved bounding boxes come back from the page.
+        """
+        if self._detection_mode != "incremental" or not self.is_live():
+            return
+        try:
+            delta = await self._evaluate(
+                "sync",
+                "() => window.DoSee && window.DoSee.observing ? window.DoSee.delta() : null"
+            )
+        except Exception as e:
+            logger.debug(f"Element sync skipped: {e}")
+            return
+
+        if delta is None:
+            # A new document without our observer, start over
+            await self.detect()
+            return
+
+        upserts = {**delta["added"], **delta["changed"]}
+        self._elements.apply(
+            removed=delta["removed"],
+            upserts=upserts.values(),
+            boxes={int(id): box for id, box in delta["boxes"].items()},
+        )
+        for id in [*delta["removed"], *upserts]:
+            self._details.pop(int(id), None)
+
+    async def details(self, element_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch the heavy metadata fields of several elements in one round trip.
+
+        Fetched entries go into the page's LRU, so later attribute access on
+        the elements does not hit the page again.
+        """
+        missing = [id for id in element_ids if id not in self._details]
+        fetched = None
+        if missing and self.is_live():
+            try:
+                fetched = await self._evaluate(
+                    "details",
+                    "([ids, generation]) => window.DoSee ? window.DoSee.details(ids, generation) : null",
+                    [missing, self._generation],
+                )
+            except Exception as e:
+                logger.debug(f"Element details unavailable: {e}")
+        # None means the document or its detection changed under us
+        for id in missing:
+            entry = (fetched or {}).get(str(id))
+            self._details[id] = entry if entry is not None else dict(HEAVY_FIELDS)
+        for id in element_ids:
+            self._details.move_to_end(id)
+
+        details = {id: self._details[id] for id in element_ids}
+        while len(self._details) > self._details_size:
+            self._details.popitem(last=False)
+        return details
+
+    def _element_details(self, element_id: int) -> Dict[str, Any]:
+        """Heavy fields of one element, from the LRU or fetched synchronously.
+
+        Inside an async context they cannot be fetched on attribute access;
+        they have to be loaded with ``a_details`` first.
+        """
+        entry = self._details.get(element_id)
+        if entry is not None:
+            self._details.move_to_end(element_id)
+            return entry
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._sync(self.details([element_id]))[element_id]
+        raise RuntimeError(
+            f"Details of element {element_id} are not loaded. Inside an async context, "
+            "await browser.a_details(element_ids) before reading element_html, "
+            "attributes, computed_styles, listeners or state."
+        )
+
+    async def dom_version(self) -> Optional[str]:
+        """Version of the page's document, or None if it cannot be told.
+
+        Changes with every navigation, DOM mutation, form input, viewport
+        resize and element detection; artifacts derived from the page stay
+        valid for as long as it does not change.
+        """
+        if not self.is_live():
+            return None
+        try:
+            version = await self._evaluate(
+                "dom_version",
+                "() => window.DoSeeDom ? `${DoSeeDom.document}:${DoSeeDom.version}` : null"
+            )
+        except Exception as e:
+            logger.debug(f"DOM version unavailable: {e}")
+            return None
+        return None if version is None else f"{version}:{self._generation}"
+
+    def _artifact(self, key: Any, version: Optional[str]) -> Any:
+        """A cached artifact, if it was derived from this version of the page."""
+        if version is None or version != self._artifacts_version:
+            return None
+        return self._artifacts.get(key)
+
+    def _keep_artifact(self, key: Any, value: Any, version: Optional[str]) -> None:
+        if version is None:
+            return
+        if version != self._artifacts_version:
+            # Everything derived from an older version is stale
+            self._artifacts.clear()
+            self._artifacts_version = version
+        self._artifacts[key] = value
+
+    def _store(self) -> ElementStore:
+        """The page's elements, reloaded from disk if the page was compacted."""
+        if self._spill_path:
+            self.restore()
+        return self._elements
+
+    def is_compacted(self) -> bool:
+        """Whether the page's elements were spilled out of memory"""
+        return self._spill_path is not None
+
+    def summary(self) -> PageSummary:
+        """Get the URL, title and timeline of the page, without loading its elements"""
+        return PageSummary(
+            url=self._url,
+            title=self._title,
+            timeline=self.interaction_history(),
+            element_count=self._element_count if self._spill_path else len(self._elements),
+            compacted=self._spill_path is not None,
+        )
+
+    def compact(self, spill: HistorySpill) -> None:
+        """Spill the page's elements and cached details to disk, keeping its summary.
+
+        The snapshot is reloaded the next time the elements are accessed.
+        """
+        if self._spill_path:
+            return
+        self._element_count = len(self._elements)
+        self._spill = spill
+        self._spill_path = spill.write(
+            {
+                "elements": self._elements,
+                "details": dict(self._details),
+                "images": (self._raw_image, self._annotated_image),
+            }
+        )
+        self._elements = ElementStore(page=self)
+        self._details.clear()
+        self._raw_image = self._annotated_image = b""
+        self._artifacts.clear()
+
+    def restore(self) -> None:
+        """Reload elements spilled by compact()."""
+        if not self._spill_path or not self._spill:
+            return
+        snapshot = self._spill.read(self._spill_path)
+        store = snapshot["elements"]
+        store._page = self
+        self._elements = store
+        self._details = OrderedDict(snapshot["details"])
+        self._raw_image, self._annotated_image = snapshot["images"]
+        self._discard_spill()
+
+    def _discard_spill(self) -> None:
+        if self._spill_path and self._spill:
+            self._spill.discard(self._spill_path)
+        self._spill_path = None
+
+    def settle_timings(self) -> List[SettleTiming]:
+        """Get how long each navigation on this page took to settle"""
+        return self._settle_timings
+
+    def route_stats(self) -> Optional[RouteStats]:
+        """Get the requests the routing profile allowed and blocked in this tab"""
+        if not self._router or not self._page:
+            return None
+        return self._router.stats(self._page)
+
+    async def _evaluate(self, step: str, expression: str, arg: Any = None) -> Any:
+        """Evaluate in the page, timed into the page's metrics under ``step``."""
+        pw_page = self.pw_page()
+        start = time.perf_counter()
+        try:
+            return await pw_page.evaluate(expression, arg)
+        finally:
+            self._steps.add(step, (time.perf_counter() - start) * 1000)
+
+    async def _site_timings(self) -> Dict[str, Any]:
+        """Performance API readings of the page's document, empty if unavailable."""
+        if self._site_metrics is not None:
+            return self._site_metrics
+        if not self.is_live():
+            return {}
+        try:
+            return await self.pw_page().evaluate(get_script_path("page_metrics.js"), 10)
+        except Exception as e:
+            logger.debug(f"Page timings unavailable: {e}")
+            return {}
+
+    async def metrics(self) -> PageMetrics:
+        """Get where time went on this page: the site's own timings and DoNew's steps."""
+        site = await self._site_timings()
+        return PageMetrics(
+            url=self._url or (self.pw_page().url if self.is_live() else ""),
+            navigation=site.get("navigation", {}),
+            resources=site.get("resources", {}),
+            slowest_resources=site.get("slowest", []),
+            long_tasks=site.get("longTasks", []),
+            steps=self._steps.snapshot(),
+            settle=list(self._settle_timings),
+        )
+
+    async def settle(self) -> Optional[SettleTiming]:
+        """Wait until the page's DOM, layout and network are quiet."""
+        if not self._settler:
+            return None
+        return await self._settler.wait()
 
     def pw_page(self) -> Page:
         if not self._page:
@@ -172,22 +508,33 @@ class WebPage(BaseTarget):
             return self._page
 
     async def click(self, element_id: int):
-        """Click an element by moving the pointer heuristically and performing mouse click.
+        """Click an element, the way the session's interaction profile does.
 **Inputs**
     element_id (int): The ID of the element to click.
         """
         if not self._page:
             raise ValueError("No live page connection")
 
+        await self._sync_elements()
         element = self._elements.get(element_id)
         if not element:
             raise ValueError(f"No element found with ID {element_id}")
 
-        x, y = await self.move_pointer(element_id)
-        await self._page.mouse.down()
-        await asyncio.sleep(0.1)
-        await self._page.mouse.up()
-        self._interaction_history.append(Interaction(element_id, "click", time.time()))
+        with span("click", element_id=element_id, element_type=element.element_type) as active:
+            start = time.perf_counter()
+            behavior = await self._profile.click(
+                self._page, element.bounding_box, self._page.locator(element.xpath)
+            )
+            timing = self._timing(behavior, start)
+            set_attributes(active, **timing)
+        self._record(Interaction(element_id, "click", time.time(), timing))
+
+    def _timing(self, behavior: str, start: float) -> Dict[str, Any]:
+        """Interaction data on how an action was performed and how long it took."""
+        return {
+            "profile": behavior,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
 
     async def move_pointer(self, element_id: int) -> Tuple[float, float]:
         """Move the mouse pointer heuristically to a random position within the element's bounding box.
@@ -202,22 +549,15 @@ class WebPage(BaseTarget):
         if not element.bounding_box:
             raise ValueError(f"Element with ID {element_id} does not have a bounding box")
 
-        bb = element.bounding_box
-        x_base = bb["x"]
-        y_base = bb["y"]
-        width = bb["width"]
-        height = bb["height"]
-
-        # Compute target coordinates roughly at center with slight randomness
-        target_x = x_base + width / 2 + random.uniform(-width * 0.1, width * 0.1)
-        target_y = y_base + height / 2 + random.uniform(-height * 0.1, height * 0.1)
+        # Roughly at the center, with slight randomness
+        target_x, target_y = pointer_target(element.bounding_box)
 
         # Move the mouse in multiple steps for human-like movement
         await self._page.mouse.move(target_x, target_y, steps=10)
         return target_x, target_y
 
     async def type(self, element_id: int, text: str):
-        """Type text into an element.
+        """Type text into an element, the way the session's interaction profile does.
 **Inputs**
     element_id (int): The ID of the input element.
     text (str): The text to type.
@@ -226,23 +566,19 @@ class WebPage(BaseTarget):
         if not self._page:
             raise ValueError("No live page connection")
 
+        await self._sync_elements()
         element = self._elements.get(element_id)
         if not element:
             raise ValueError(f"No element found with ID {element_id}")
-        
-
-        await self.move_pointer(element_id)
-        await asyncio.sleep(0.1)
-        await self._page.mouse.down()
-        await asyncio.sleep(0.1)
-        await self._page.mouse.up()
-        await asyncio.sleep(0.1)
 
-        await self._page.keyboard.type(text)
-
-        self._interaction_history.append(
-            Interaction(element_id, "type", time.time(), {"text": text})
-        )
+        with span("type", element_id=element_id, element_type=element.element_type) as active:
+            start = time.perf_counter()
+            behavior = await self._profile.type(
+                self._page, element.bounding_box, self._page.locator(element.xpath), text
+            )
+            timing = self._timing(behavior, start)
+            set_attributes(active, text_length=len(text), **timing)
+        self._record(Interaction(element_id, "type", time.time(), {"text": text, **timing}))
 
     def is_live(self) -> bool:
         try:
@@ -261,36 +597,207 @@ class WebPage(BaseTarget):
         element_id: Optional[int] = None,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         viewport: Optional[bool] = None,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
     ) -> bytes:
-        """Get element's image content in PNG format.
+        """Get element's image content.
 **Inputs**
     element_id: The ID of the element to get the image from. If None, gets the entire page.
     bbox: A tuple of (x1, y1, x2, y2) to crop the image to.
     viewport: Whether to get the image of the viewport or the entire page. Only applies if element_id is None.
+    format: "png", "jpeg" or "webp".
+    quality: Compression quality for jpeg and webp, 0-100.
+    max_dimension: Longest side of the image in pixels; larger images are scaled down by the browser.
 **Outputs**
     bytes: The image content.
         """
+        with span("image", element_id=element_id, format=format, full_page=bool(viewport)) as active:
+            result = await self._image(element_id, bbox, viewport, format, quality, max_dimension)
+            set_attributes(active, payload_bytes=len(result))
+            return result
+
+    async def _image(
+        self,
+        element_id: Optional[int],
+        bbox: Optional[Tuple[float, float, float, float]],
+        viewport: Optional[bool],
+        format: str,
+        quality: Optional[int],
+        max_dimension: Optional[int],
+    ) -> bytes:
+        check_image_options(format, quality, max_dimension)
+        # WebP and downscaling are done by Chromium itself, plain captures go through Playwright
+        encoded = format == "webp" or max_dimension is not None
+        pw_page = self.pw_page()
+
         if element_id:
+            await self._sync_elements()
             element = self._elements.get(element_id)
             if not element:
                 raise ValueError(f"No element found with ID {element_id}")
-            result = await self.pw_page().locator(element.xpath).screenshot()
+            locator = pw_page.locator(element.xpath)
+            if not encoded:
+                return await locator.screenshot(type=format, quality=quality)  # type: ignore
+            await locator.scroll_into_view_if_needed()
+            box = await locator.bounding_box()
+            if not box:
+                raise ValueError(f"Element {element_id} is not visible")
+            return await capture(pw_page, clip=box, format=format, quality=quality, max_dimension=max_dimension)
         elif element_id is None and bbox is None:
-            result = await self.pw_page().screenshot(full_page=viewport)
+            if self._annotation_enabled and self._headless:
+                return await self.annotated_image(bool(viewport), format, quality, max_dimension)
+            if encoded:
+                result = await capture(
+                    pw_page, full_page=bool(viewport), format=format, quality=quality, max_dimension=max_dimension
+                )
+            else:
+                result = await pw_page.screenshot(full_page=viewport, type=format, quality=quality)  # type: ignore
+            # Kept as bytes; image_base64() encodes on demand
+            self._raw_image = result
+            return result
         elif bbox is not None:
             # Calculate clip dimensions from bbox coordinates
             x1, y1, x2, y2 = bbox
-            width = x2 - x1
-            height = y2 - y1
+            clip = {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+            if encoded:
+                return await capture(pw_page, clip=clip, format=format, quality=quality, max_dimension=max_dimension)
 
             # Use Playwright's clip option for precise region capture
-            result = await self.pw_page().screenshot(
-                clip={"x": x1, "y": y1, "width": width, "height": height}
-            )
+            return await pw_page.screenshot(clip=clip, type=format, quality=quality)  # type: ignore
         else:
             raise ValueError("Either element_id or bbox must be provided")
 
-        return result
+    async def images(
+        self,
+        element_ids: Sequence[int],
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> Dict[int, bytes]:
+        """Get images of several elements from a single capture of the page.
+**Inputs**
+    element_ids (Sequence[int]): The IDs of the elements.
+    format (str): "png", "jpeg" or "webp".
+    quality (int, optional): Compression quality for jpeg and webp, 0-100.
+    max_dimension (int, optional): Longest side of each image in pixels.
+**Outputs**
+    Dict[int, bytes]: Image per element ID, in CSS pixels. Elements that are not visible are left out.
+        """
+        check_image_options(format, quality, max_dimension)
+        await self._sync_elements()
+        missing = [id for id in element_ids if id not in self._elements]
+        if missing:
+            raise ValueError(f"No elements found with IDs {missing}")
+
+        pw_page = self.pw_page()
+        boxes = (await self._evaluate("element_boxes", get_script_path("element_boxes.js"), list(element_ids)))["boxes"]
+        croppable: Dict[int, Dict[str, float]] = {}
+        separate: List[int] = []
+        for id in element_ids:
+            box = boxes.get(str(id))
+            if box and box.get("croppable"):
+                croppable[id] = box
+            elif not (box and box.get("hidden")):
+                separate.append(id)
+
+        images: Dict[int, bytes] = {}
+        if croppable:
+            # One capture of the page region covering every box, one pixel per CSS pixel
+            x1 = math.floor(min(b["x"] for b in croppable.values()))
+            y1 = math.floor(min(b["y"] for b in croppable.values()))
+            x2 = math.ceil(max(b["x"] + b["width"] for b in croppable.values()))
+            y2 = math.ceil(max(b["y"] + b["height"] for b in croppable.values()))
+            region = await pw_page.screenshot(
+                full_page=True,
+                clip={"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1},
+                scale="css",
+            )
+            images.update(
+                await asyncio.to_thread(
+                    crop_images, region, (x1, y1), croppable, format, quality, max_dimension
+                )
+            )
+
+        # Pinned, off-page and detached elements are captured one by one
+        for id in separate:
+            try:
+                images[id] = await self.image(
+                    id, format=format, quality=quality, max_dimension=max_dimension
+                )
+            except Exception as e:
+                logger.debug(f"Element {id} could not be captured: {e}")
+        return {id: images[id] for id in element_ids if id in images}
+
+    async def annotated_image(
+        self,
+        full_page: bool = False,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> bytes:
+        """Get a screenshot with interactive elements boxed and labeled with their IDs.
+**Inputs**
+    full_page (bool): Whether to capture the entire page instead of the viewport.
+    format (str): "png", "jpeg" or "webp".
+    quality (int, optional): Compression quality for jpeg and webp, 0-100.
+    max_dimension (int, optional): Longest side of the image in pixels.
+**Outputs**
+    bytes: The annotated image, in CSS pixels. The page itself is not modified.
+        """
+        check_image_options(format, quality, max_dimension)
+        await self._sync_elements()
+        columns = self._elements.columns()
+        marked = columns["interactive"] & ~np.isnan(columns["boxes"][:, 0])
+        ids = columns["ids"][marked].tolist()
+
+        pw_page = self.pw_page()
+        version = await self.dom_version()
+        view = await self._evaluate("element_boxes", get_script_path("element_boxes.js"), ids)
+        # A viewport capture also depends on where the page is scrolled to
+        origin = (0, 0) if full_page else (view["scrollX"], view["scrollY"])
+        key = ("annotated", full_page, format, quality, max_dimension, origin)
+        cached = self._artifact(key, version)
+        if cached is not None:
+            self._raw_image, self._annotated_image = cached
+            return self._annotated_image
+
+        shown = [
+            id for id in ids
+            if (box := view["boxes"].get(str(id))) and not box.get("hidden")
+        ]
+        boxes = np.array(
+            [[view["boxes"][str(id)][k] for k in ("x", "y", "width", "height")] for id in shown],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        types = [self._elements[id].element_type for id in shown]
+
+        raw = await pw_page.screenshot(full_page=full_page, scale="css")
+        start = time.perf_counter()
+        annotated = await asyncio.to_thread(
+            render_annotations, raw, origin, shown, boxes, types, format, quality, max_dimension
+        )
+        self._steps.add("annotate", (time.perf_counter() - start) * 1000)
+        self._raw_image, self._annotated_image = raw, annotated
+        self._keep_artifact(key, (raw, annotated), version)
+        return annotated
+
+    async def screencast(
+        self,
+        format: str = "jpeg",
+        quality: Optional[int] = 80,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        every_nth_frame: int = 1,
+    ) -> AsyncIterator[Frame]:
+        """Stream compressed frames of the viewport as the page repaints.
+
+        Frames are only produced on repaint; stop by breaking out of the loop.
+        """
+        async for frame in stream_screencast(
+            self.pw_page(), format, quality, max_width, max_height, every_nth_frame
+        ):
+            yield frame
 
     async def text(
         self,
@@ -300,41 +807,40 @@ class WebPage(BaseTarget):
 **Inputs**
     element_id: The ID of the element to get the text from. If None, gets the page content.
 **Outputs**
-    str: The text content with interactive elements marked with [id@type#subtype].
+    str: The text content, as rendered, with interactive elements replaced by "@id - text" markers.
 """
         if not self._page:
             raise ValueError("No live page connection")
-        
 
+        with span("text", element_id=element_id) as active:
+            # Nothing changed since the last read, the page is settled already
+            cached = self._artifact(("text", element_id), await self.dom_version())
+            if cached is not None:
+                set_attributes(active, cached=True)
+                return cached
 
-        # wait for navigation to settle
-        await asyncio.sleep(1)
+            # wait for navigation to settle
+            timing = await self.settle()
+            await self._sync_elements()
 
-        # First, temporarily modify interactive elements to show their IDs and types
-        script = get_script_path("text_markers.js")
-        num_modified = await self._page.evaluate(script)
-
-        await asyncio.sleep(0.5)
-
-        try:
-            # Get text content
-            if element_id:
-                element = self._elements.get(
-                    element_id
-                )  # Now using int directly since type hint enforces it
-                if not element:
-                    raise ValueError(f"No element found with ID {element_id}")
-                result = await self.pw_page().locator(element.xpath).inner_text()
-            else:
-                result = await self.pw_page().locator("body").inner_text()
+            if element_id is not None and element_id not in self._elements:
+                raise ValueError(f"No element found with ID {element_id}")
 
+            # One read-only pass over the DOM; interactive elements come back as markers
+            version = await self.dom_version()
+            result = await self._evaluate("text", get_script_path("text_content.js"), element_id)
+            if result is None:
+                raise ValueError(f"No element found with ID {element_id}")
+            self._keep_artifact(("text", element_id), result, version)
+            if active.is_recording():
+                set_attributes(
+                    active,
+                    cached=False,
+                    payload_bytes=len(result.encode()),
+                    settle_ms=round(timing.total_ms) if timing else None,
+                )
             return result
 
-        finally:
-            # Restore original state
-            restore_script = get_script_path("restore_text_markers.js")
-            await self._page.evaluate(restore_script)
-
     async def scroll(self, element_id: int):
         """Scroll element into view
 **Inputs**
@@ -344,14 +850,16 @@ class WebPage(BaseTarget):
         if not self._page:
             raise ValueError("No live page connection")
 
+        await self._sync_elements()
         element = self._elements.get(element_id)
         if not element:
             raise ValueError(f"No element found with ID {element_id}")
 
-        await self._page.evaluate(
-            f"document.querySelector(\"[data-dosee-element-id='{element_id}']\").scrollIntoView()"
+        await self._evaluate(
+            "scroll",
+            f"document.querySelector(\"[data-dosee-element-id='{element_id}']\").scrollIntoView()",
         )
-        self._interaction_history.append(Interaction(element_id, "scroll", time.time()))
+        self._record(Interaction(element_id, "scroll", time.time()))
 
     async def cookies(
         self, cookies: Optional[Dict[str, str]] = None
@@ -395,7 +903,7 @@ new_cookies = processor.cookies({
             "localStorage": {"key": "value", ...},
             "sessionStorage": {"key": "value", ...}
         }
-        If None, returns current storage state.
+        If None, returns current storage state. A None value removes the key.
 **Outputs**
     Dict[str, Any]
         Dictionary containing current localStorage and sessionStorage state:
@@ -421,38 +929,20 @@ page.storage({
         if not self._page:
             raise ValueError("No live page connection")
 
-        if storage_state is not None:
-            # Set localStorage
-            if "localStorage" in storage_state:
-                for key, value in storage_state["localStorage"].items():
-                    await self._page.evaluate(
-                        f"localStorage.setItem('{key}', '{value}')"
-                    )
-
-            # Set sessionStorage
-            if "sessionStorage" in storage_state:
-                for key, value in storage_state["sessionStorage"].items():
-                    await self._page.evaluate(
-                        f"sessionStorage.setItem('{key}', '{value}')"
-                    )
-
-        # Get current storage state
-        return await self._page.evaluate(
-            """() => {
-            return {
-                localStorage: Object.fromEntries(Object.entries(localStorage)),
-                sessionStorage: Object.fromEntries(Object.entries(sessionStorage))
-            };
-        }"""
-        )
+        # Every key is applied and the result read back in one round trip
+        return await self._evaluate("storage", get_script_path("storage.js"), storage_state)
 
     async def annotation(self, enabled: bool = True) -> None:
         """Toggle visual annotation of elements on the page.
+
+Headless pages stay untouched; their full-page and viewport images are annotated instead.
 **Inputs**
     enabled: Whether to enable or disable annotation
 """
         self._annotation_enabled = enabled
-        if self._page:
+        # Headless screenshots are annotated in Python (see annotated_image);
+        # overlays are only added for someone watching a headed browser
+        if self._page and not self._headless:
             if enabled:
                 await self._inject_annotation_styles()
                 await self._highlight_elements()
@@ -467,12 +957,12 @@ page.storage({
     async def _highlight_elements(self) -> None:
         """Add highlight overlays to all detected elements"""
         script = get_script_path("highlight_elements.js")
-        await self._page.evaluate(script)  # type: ignore
+        await self._evaluate("annotate", script)
 
     async def _remove_annotations(self) -> None:
         """Remove all element annotations from the page"""
-        await self._page.evaluate(  # type: ignore
-            "document.querySelectorAll('.DoSee-highlight').forEach(el => el.remove())"
+        await self._evaluate(
+            "annotate", "document.querySelectorAll('.DoSee-highlight').forEach(el => el.remove())"
         )
 
     async def close(self):
@@ -489,22 +979,19 @@ Metadata includes element info, data, and page URL
 """
         history = []
 
-        # Process all interactions including navigation
-        for interaction in self._interaction_history:
-            if interaction.interaction_type == "goto":
-                metadata = {"url": interaction.data["url"]}
+        # Records were resolved against the elements when they were logged
+        for record in self._records():
+            if record.interaction_type == "goto":
+                metadata = {"url": record.data["url"]}
             else:
-                element = self._elements.get(interaction.element_id)
                 metadata = {
-                    "element_type": element.element_type if element else None,
-                    "element_label": element.element_label if element else None,
-                    "xpath": element.xpath if element else None,
-                    "data": interaction.data,
+                    "element_type": record.element_type,
+                    "element_label": record.element_label,
+                    "xpath": record.xpath,
+                    "data": record.data,
                 }
 
-            history.append(
-                (interaction.timestamp, interaction.interaction_type, metadata)
-            )
+            history.append((record.timestamp, record.interaction_type, metadata))
 
         return history
 
@@ -526,7 +1013,7 @@ that are not serializable by `JSON`: `-0`, `NaN`, `Infinity`, `-Infinity`.
     Any: The value of the expression.
 """
 
-        return await self._page.evaluate(expression)  # type: ignore
+        return await self._evaluate("evaluate", expression)
 
 
 @dataclass
@@ -537,6 +1024,24 @@ class WebBrowser(BaseTarget):
     _pages: List[WebPage] = field(default_factory=list)
     _headless: bool = True
     _channel: str = "chromium"
+    _pool: Optional[ContextPool] = None
+    _host: Optional[BrowserHost] = None
+    _detections: Dict[int, "asyncio.Task[None]"] = field(default_factory=dict)
+    _settle_config: SettleConfig = field(default_factory=SettleConfig)
+    _detection_mode: str = "full"
+    _router: Optional[RequestRouter] = None
+    _cache: Optional[AssetCache] = None
+    _history: HistoryConfig = field(default_factory=HistoryConfig)
+    _spill: Optional[HistorySpill] = None
+    _log: InteractionLog = field(default_factory=InteractionLog)
+    _seed_script: Optional[str] = None
+    _profile: InteractionProfile = field(default_factory=HumanProfile)
+    _opened: int = 0  # pages created so far, numbers the next one
+    _collect_metrics: bool = False  # observe long tasks, keep a document's timings when the tab leaves it
+
+    def _next_number(self) -> int:
+        self._opened += 1
+        return self._opened - 1
     
     def _current_page(self) -> WebPage:
         """Internal method to get current page."""
@@ -546,80 +1051,104 @@ class WebBrowser(BaseTarget):
             )
         return self._pages[-1]
     
-    async def initialize(self, url: str) -> "WebPage":
-        """Process a webpage and extract its elements.
+    def _page_owner(self, pw_page: Page) -> Optional[WebPage]:
+        """Find the WebPage in history currently holding a Playwright page."""
+        for page in reversed(self._pages):
+            if page._page is pw_page:
+                return page
+        return None
+
+    def _enforce_history(self) -> None:
+        """Compact pages that fell out of the history window.
+
+        Pages still holding a tab are only compacted once they are outside
+        the window too, and never the current page.
         """
-        _page = await self._browser.new_page()
-        new_page = WebPage(
-            _page=_page,
-            _annotation_enabled=False,
-            _headless=self._headless,
-            _channel=self._channel,
-        )
-        self._pages.append(new_page)
+        keep = self._history.keep
+        if keep is None or len(self._pages) <= keep:
+            return
+        if self._spill is None:
+            self._spill = HistorySpill(self._history.spill_dir)
+        for page in self._pages[:-keep]:
+            page.compact(self._spill)
 
-        def handle_navigation_event():
-            asyncio.create_task(handle_navigation())
-        
- 
-        _page.on("domcontentloaded", handle_navigation_event)
+    def _watch_navigation(self, pw_page: Page, web_page: WebPage) -> None:
+        """Re-run element detection whenever the document in a tab changes."""
 
-        # Set up navigation handler
         async def handle_navigation():
-            
-            try:
-                await _page.wait_for_load_state("networkidle", timeout=5000)
-            except Exception as e:
-                logger.warning(f"Failed to wait for networkidle: {e}")
-                pass
-            
+            with span("navigation", url=pw_page.url) as active:
+                timing = await settler.wait()
+                set_attributes(
+                    active,
+                    settle_ms=round(timing.total_ms),
+                    mutations=timing.mutations,
+                    settle_timed_out=timing.timed_out,
+                )
 
-            # Log navigation as an interaction
-            self._current_page()._interaction_history.append(
-                Interaction(
-                    element_id=-1,  # No element for navigation
-                    interaction_type="goto",
-                    timestamp=time.time(),
-                    data={"url": _page.url},
+                # The tab may have moved on to a newer WebPage in history
+                page = self._page_owner(pw_page) or web_page
+                page._settle_timings.append(timing)
+
+                # Log navigation as an interaction
+                page._record(
+                    Interaction(
+                        element_id=-1,  # No element for navigation
+                        interaction_type="goto",
+                        timestamp=time.time(),
+                        data={"url": pw_page.url, "settle_ms": round(timing.total_ms)},
+                    )
                 )
-            )
 
-            # Re-inject and execute element detection script
-            script = get_script_path("element_detection.js")
-            elements = await _page.evaluate(script)
+                # Re-inject and execute element detection script
+                await page.detect()
+                set_attributes(active, element_count=len(page._elements))
 
-            # Update elements
-            self._current_page()._elements = {
-                int(id): ElementMetadata(**metadata)
-                for id, metadata in elements.items()
-            }
+                # Re-enable annotations if needed
+                if page._annotation_enabled:
+                    await page.annotation(True)
 
-            # Re-enable annotations if needed
-            if self._current_page()._annotation_enabled:
-                await self._current_page().annotation(True)
+        def handle_navigation_event():
+            self._detections[id(pw_page)] = asyncio.create_task(handle_navigation())
 
-        
+        settler = SettleDetector(
+            pw_page, get_script_path("settle.js"), self._settle_config
+        )
+        web_page._settler = settler
+        pw_page.on("domcontentloaded", handle_navigation_event)
 
-     
+    async def _wait_for_detection(
+        self, web_page: WebPage, previous: Optional["asyncio.Task[None]"] = None
+    ) -> None:
+        """Wait for the element detection triggered by the last navigation of a tab.
+
+        If no new document was loaded since ``previous``, only wait for the page to settle.
+        """
+        task = self._detections.get(id(web_page.pw_page()))
+        if task is None or task is previous:
+            timing = await web_page.settle()
+            if timing:
+                web_page._settle_timings.append(timing)
+            return
+        try:
+            await task
+        except Exception as e:
+            logger.warning(f"Element detection failed: {e}")
+
+    async def _load(self, web_page: WebPage, url: str) -> None:
+        """Navigate a fresh tab and wait for it to settle and be detected."""
+        _page = web_page.pw_page()
+        previous = self._detections.get(id(_page))
 
-    
         # Initial navigation with error handling
         try:
             await _page.goto(url, wait_until="load")
-            await asyncio.sleep(1)
-            try:
-                await _page.wait_for_load_state("networkidle", timeout=5000)
-            except Exception as e:
-                logger.warning(f"Failed to wait for networkidle: {e}")
-                pass
-            
         except Exception as e:
             if "net::ERR_HTTP_RESPONSE_CODE_FAILURE" in str(e):
                 logger.warning(
                     "Navigation error with HTTP error responses (like 404, 501) due to a known Chromium bug. "
                     "See: https://github.com/microsoft/playwright/issues/33962"
                 )
-                self._current_page()._interaction_history.append(
+                web_page._record(
                     Interaction(
                         element_id=-1,  # No element for navigation
                         interaction_type="navigation_error",
@@ -632,10 +1161,99 @@ class WebBrowser(BaseTarget):
             else:
                 raise
 
-  
+        await self._wait_for_detection(web_page, previous)
 
+    async def _open_page(self) -> WebPage:
+        """Open a new tab in the browser context, watched for navigations."""
+        _page = await self._browser.new_page()
+        await _page.add_init_script(script=get_script_path("dom_version.js"))
+        if self._collect_metrics:
+            # Observers the site can see, only installed when asked for
+            await _page.add_init_script(script=get_script_path("performance.js"))
+        if self._seed_script:
+            await _page.add_init_script(script=self._seed_script)
+        new_page = WebPage(
+            _page=_page,
+            _annotation_enabled=False,
+            _headless=self._headless,
+            _channel=self._channel,
+            _detection_mode=self._detection_mode,
+            _router=self._router,
+            _log=self._log,
+            _number=self._next_number(),
+            _profile=self._profile,
+        )
+        self._watch_navigation(_page, new_page)
+        return new_page
+
+    async def initialize(self, url: str) -> "WebPage":
+        """Process a webpage and extract its elements.
+        """
+        new_page = await self._open_page()
+        self._pages.append(new_page)
+        await self._load(new_page, url)
+        self._enforce_history()
         return self._current_page()
 
+    async def _goto_each(
+        self, urls: Sequence[str], concurrency: int
+    ) -> AsyncIterator[Tuple[int, Union[WebPage, BaseException]]]:
+        """Load URLs in parallel tabs, yielding (index, page or error) as they finish."""
+        if not self._browser:
+            raise ValueError("No browser session")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(index: int, url: str) -> Tuple[int, Union[WebPage, BaseException]]:
+            async with semaphore:
+                web_page = None
+                try:
+                    web_page = await self._open_page()
+                    await self._load(web_page, url)
+                    return index, web_page
+                except Exception as e:
+                    if web_page:
+                        await web_page.close()
+                    return index, e
+                except BaseException:
+                    # Cancelled half way, the tab is nobody's to close
+                    if web_page:
+                        await web_page.close()
+                    raise
+
+        tasks = [asyncio.create_task(load(i, url)) for i, url in enumerate(urls)]
+        yielded = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                yielded.add(index)
+                yield index, result
+        finally:
+            # Stopped early: cancel the pending loads and close the tabs
+            # that finished but were never handed out
+            for task in tasks:
+                task.cancel()
+            for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(outcome, tuple) and outcome[0] not in yielded:
+                    if isinstance(outcome[1], WebPage):
+                        await outcome[1].close()
+
+    async def a_stream_goto(
+        self, urls: Sequence[str], concurrency: int = 4
+    ) -> AsyncIterator[WebPage]:
+        """Open URLs in parallel tabs and yield each WebPage as soon as it is ready.
+
+        Pages are appended to history in completion order. Failed URLs raise.
+        """
+        async with aclosing(self._goto_each(urls, concurrency)) as loads:
+            async for _, result in loads:
+                if isinstance(result, BaseException):
+                    raise result
+                self._pages.append(result)
+                self._enforce_history()
+                yield result
 
     @public(order=1)
     def goto(self, url: str):
@@ -648,11 +1266,26 @@ class WebBrowser(BaseTarget):
     async def a_goto(self, url: str):
         if not self._browser:
             raise ValueError("No browser session")
-        
+        with span("goto", url=url) as active:
+            await self._goto(url)
+            if active.is_recording():
+                page = self._current_page()
+                timings = page._settle_timings
+                set_attributes(
+                    active,
+                    element_count=len(page._elements),
+                    settle_ms=round(timings[-1].total_ms) if timings else None,
+                )
+
+    async def _goto(self, url: str) -> None:
         if not self._pages:
            await self.initialize(url)
            return
         
+        previous = self._detections.get(id(self._current_page().pw_page()))
+        if self._collect_metrics:
+            # The tab moves on to the new document; keep the old one's timings
+            self._current_page()._site_metrics = await self._current_page()._site_timings()
         try:
             await self._current_page().process(url)
         except Exception as e:
@@ -665,17 +1298,56 @@ class WebBrowser(BaseTarget):
             _annotation_enabled=current_page._annotation_enabled,
             _headless=self._headless,
             _channel=self._channel,
+            _settler=current_page._settler,
+            _detection_mode=self._detection_mode,
+            _router=self._router,
+            _log=self._log,
+            _number=self._next_number(),
+            _profile=self._profile,
         )
         
         self._pages.append(new_page)
-        try:
-            await asyncio.sleep(1)
-            await self._current_page().pw_page().wait_for_load_state("networkidle", timeout=5000)
-        except Exception as e:
-            logger.warning(f"Failed to wait for networkidle: {e}")
-            pass
+        await self._wait_for_detection(new_page, previous)
+        self._enforce_history()
 
     @public(order=2)
+    def goto_many(
+        self, urls: Sequence[str], concurrency: int = 4, return_exceptions: bool = False
+    ) -> List[Union[WebPage, BaseException]]:
+        """Open several URLs in parallel tabs and detect their elements.
+**Inputs**
+    urls (Sequence[str]): The URLs to open, one tab each.
+    concurrency (int): How many tabs load at the same time.
+    return_exceptions (bool): Return errors in place of pages instead of raising.
+**Outputs**
+    List[WebPage]: One page per URL, in input order. The last one becomes the current page.
+        """
+        return self._sync(self.a_goto_many(urls, concurrency, return_exceptions))
+
+    async def a_goto_many(
+        self, urls: Sequence[str], concurrency: int = 4, return_exceptions: bool = False
+    ) -> List[Union[WebPage, BaseException]]:
+        results: List[Union[WebPage, BaseException]] = [None] * len(urls)  # type: ignore
+        try:
+            async with aclosing(self._goto_each(urls, concurrency)) as loads:
+                async for index, result in loads:
+                    results[index] = result
+        except BaseException:
+            # Cancelled before the pages made it into history
+            for result in results:
+                if isinstance(result, WebPage):
+                    await result.close()
+            raise
+
+        self._pages.extend(r for r in results if isinstance(r, WebPage))
+        self._enforce_history()
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    @public(order=3)
     @documentation(extends=WebPage.annotation)
     def annotation(self, enabled: bool = True) -> None:
         return self._sync(self.a_annotation(enabled))
@@ -684,7 +1356,7 @@ class WebBrowser(BaseTarget):
         if self._pages:
             await self._current_page().annotation(enabled)
 
-    @public(order=3)
+    @public(order=4)
     @documentation(extends=WebPage.cookies)
     def cookies(
         self, cookies: Optional[Dict[str, str]] = None
@@ -696,7 +1368,7 @@ class WebBrowser(BaseTarget):
     ) -> Sequence[Dict[str, str]]:
         return await self._current_page().cookies(cookies)
 
-    @public(order=4)
+    @public(order=5)
     @documentation(extends=WebPage.storage)
     def storage(
         self, storage_state: Optional[Dict[str, Any]] = None
@@ -708,7 +1380,7 @@ class WebBrowser(BaseTarget):
     ) -> Dict[str, Dict[str, str]]:
         return await self._current_page().storage(storage_state)
 
-    @public(order=5)
+    @public(order=6)
     @documentation(extends=WebPage.click)
     def click(self, element_id: int):
         return self._sync(self.a_click(element_id))
@@ -716,7 +1388,7 @@ class WebBrowser(BaseTarget):
     async def a_click(self, element_id: int):
         return await self._current_page().click(element_id)
 
-    @public(order=6)
+    @public(order=7)
     @documentation(extends=WebPage.type)
     def type(self, element_id: int, text: str):
         return self._sync(self.a_type(element_id, text))
@@ -724,26 +1396,160 @@ class WebBrowser(BaseTarget):
     async def a_type(self, element_id: int, text: str):
         return await self._current_page().type(element_id, text)
 
-    @public(order=7)
+    @public(order=8)
+    def run_actions(self, actions: Sequence[Dict[str, Any]]) -> BatchResult:
+        """Run several actions back to back, then wait for the page to settle once.
+**Inputs**
+    actions (List[Dict]): Actions in order, each {"action": "click" | "type" | "scroll", "element_id": int}.
+        "type" also takes "text".
+**Outputs**
+    BatchResult: Per-action timings and errors, the final settle wait, whether the page navigated,
+        and the element IDs added and removed by the batch.
+**Usage**
+```python
+result = browser.run_actions([
+    {"action": "type", "element_id": 3, "text": "jane"},
+    {"action": "type", "element_id": 4, "text": "secret"},
+    {"action": "click", "element_id": 5},
+])
+```
+The batch stops at the first action that fails or loads a new document; the rest are marked skipped.
+"""
+        return self._sync(self.a_run_actions(actions))
+
+    async def a_run_actions(self, actions: Sequence[Dict[str, Any]]) -> BatchResult:
+        steps = parse_actions(actions)
+        page = self._current_page()
+        pw_page = page.pw_page()
+        previous = self._detections.get(id(pw_page))
+        settled = len(page._settle_timings)
+        before = set(page._store().ids().tolist())
+        version = await page.dom_version()
+
+        start = time.perf_counter()
+        timings: List[ActionTiming] = []
+        stopped = False
+        for step in steps:
+            if stopped:
+                timings.append(ActionTiming(step.action, step.element_id, 0.0, skipped=True))
+                continue
+            began = time.perf_counter()
+            error = None
+            try:
+                await getattr(page, step.action)(step.element_id, **step.args)
+            except Exception as e:
+                error = str(e)
+            timings.append(
+                ActionTiming(step.action, step.element_id, round((time.perf_counter() - began) * 1000, 1), error)
+            )
+            # Later element IDs were read from the document the batch started on
+            stopped = error is not None or self._detections.get(id(pw_page)) is not previous
+
+        # One settle (and detection, after a navigation) for the whole batch
+        await self._wait_for_detection(page, previous)
+        await page._sync_elements()
+        navigated = self._detections.get(id(pw_page)) is not previous
+        after = set(page._store().ids().tolist())
+        new_version = await page.dom_version()
+        timings_after = page._settle_timings[settled:]
+        return BatchResult(
+            actions=timings,
+            total_ms=round((time.perf_counter() - start) * 1000, 1),
+            settle=timings_after[-1] if timings_after else None,
+            url=pw_page.url,
+            navigated=navigated,
+            dom_changed=navigated or version is None or new_version != version,
+            added=sorted(after - before),
+            removed=sorted(before - after),
+        )
+
+    @public(order=9)
     @documentation(extends=WebPage.image)
     def image(
         self,
         element_id: Optional[int] = None,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         viewport: Optional[bool] = None,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
     ) -> bytes:
         """Get image content from an element."""
-        return self._sync(self.a_image(element_id, bbox, viewport))
+        return self._sync(
+            self.a_image(element_id, bbox, viewport, format, quality, max_dimension)
+        )
 
     async def a_image(
         self,
         element_id: Optional[int] = None,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         viewport: Optional[bool] = None,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
     ) -> bytes:
-        return await self._current_page().image(element_id, bbox, viewport)
+        return await self._current_page().image(
+            element_id, bbox, viewport, format, quality, max_dimension
+        )
 
-    @public(order=8)
+    @public(order=10)
+    @documentation(extends=WebPage.images)
+    def images(
+        self,
+        element_ids: Sequence[int],
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> Dict[int, bytes]:
+        return self._sync(self.a_images(element_ids, format, quality, max_dimension))
+
+    async def a_images(
+        self,
+        element_ids: Sequence[int],
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> Dict[int, bytes]:
+        return await self._current_page().images(element_ids, format, quality, max_dimension)
+
+    @public(order=11)
+    @documentation(extends=WebPage.annotated_image)
+    def annotated_image(
+        self,
+        full_page: bool = False,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> bytes:
+        return self._sync(self.a_annotated_image(full_page, format, quality, max_dimension))
+
+    async def a_annotated_image(
+        self,
+        full_page: bool = False,
+        format: str = "png",
+        quality: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> bytes:
+        return await self._current_page().annotated_image(full_page, format, quality, max_dimension)
+
+    async def a_screencast(
+        self,
+        format: str = "jpeg",
+        quality: Optional[int] = 80,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        every_nth_frame: int = 1,
+    ) -> AsyncIterator[Frame]:
+        """Stream compressed frames of the current tab as it repaints.
+
+        Frames are only produced on repaint; stop by breaking out of the loop.
+        """
+        async for frame in self._current_page().screencast(
+            format, quality, max_width, max_height, every_nth_frame
+        ):
+            yield frame
+
+    @public(order=12)
     @documentation(extends=WebPage.text)
     def text(self, element_id: Optional[int] = None) -> str:
         return self._sync(self.a_text(element_id))
@@ -751,14 +1557,197 @@ class WebBrowser(BaseTarget):
     async def a_text(self, element_id: Optional[int] = None) -> str:
         return await self._current_page().text(element_id)
 
+    def settle_timings(self) -> List[SettleTiming]:
+        """Get settle timings for every navigation in the session, oldest first."""
+        return [timing for page in self._pages for timing in page.settle_timings()]
 
-    @public(order=9)
+    def history(self) -> List[PageSummary]:
+        """Get the URL, title and timeline of every page in the session, oldest first.
+
+        Pages outside the history window are summarized without reloading
+        their elements from disk.
+        """
+        return [page.summary() for page in self._pages]
+
+    def interaction_log(self, full: bool = False) -> List[InteractionRecord]:
+        """Get the session's interaction records, oldest first.
+
+        Only the most recent records are kept in memory; with ``full`` the
+        whole session is read back from the interaction sink, if one is set.
+        """
+        return self._log.records(full)
+
+    def metrics(self) -> List[PageMetrics]:
+        """Get where time went on every page in the session, oldest first.
+
+        Each record splits the site's own timings (navigation phases,
+        resources, long tasks) from DoNew's steps (timed evaluate calls and
+        settle waits); ``to_dict()`` gives a JSON-ready form for export.
+        Long tasks, and site timings of pages the tab has left, are only
+        collected with the ``metrics`` option.
+        """
+        return self._sync(self.a_metrics())
+
+    async def a_metrics(self) -> List[PageMetrics]:
+        return [await page.metrics() for page in self._pages]
+
+    def save_state(self, path: Optional[Union[str, os.PathLike]] = None) -> Dict[str, Any]:
+        """Capture cookies, localStorage, sessionStorage and IndexedDB of the session.
+
+        The state is written to ``path`` as JSON if given, for a later session
+        to start from with the ``state`` option or ``load_state()``.
+        """
+        return self._sync(self.a_save_state(path))
+
+    async def a_save_state(self, path: Optional[Union[str, os.PathLike]] = None) -> Dict[str, Any]:
+        if not self._browser:
+            raise ValueError("No browser session")
+        state = await capture_state(self._browser)  # type: ignore
+        if path is not None:
+            write_state(state, path)
+        return state
+
+    def load_state(self, state: StateSource) -> None:
+        """Load a state saved by ``save_state()`` into the running session.
+
+        Cookies apply at once. Web Storage is seeded into the current tab if it
+        shows a saved origin, and into every later document of one. IndexedDB
+        is only restored when a session starts from a state (the ``state`` option).
+        """
+        return self._sync(self.a_load_state(state))
+
+    async def a_load_state(self, state: StateSource) -> None:
+        if not self._browser:
+            raise ValueError("No browser session")
+        state = read_state(state)
+        if state.get("cookies"):
+            await self._browser.add_cookies(state["cookies"])  # type: ignore
+        if any(origin.get("indexedDB") for origin in state.get("origins", [])):
+            logger.warning("IndexedDB is only restored when a session starts from a saved state")
+        await self._seed(seed_script(state, get_script_path("storage_seed.js")))
+
+    async def _seed(self, script: Optional[str]) -> None:
+        """Seed Web Storage into open tabs now and into every later document."""
+        if script is None:
+            return
+        # Tabs opened later get the latest seed; earlier ones keep their own too
+        self._seed_script = script
+        tabs = {id(page._page): page._page for page in self._pages if page.is_live()}
+        for pw_page in tabs.values():
+            await pw_page.add_init_script(script=script)  # type: ignore
+            try:
+                await pw_page.evaluate(script)  # type: ignore
+            except Exception as e:
+                logger.debug(f"Failed to seed storage into the open tab: {e}")
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of the shared asset cache, empty if caching is off."""
+        return self._cache.stats() if self._cache else {}
+
+    def route_stats(self) -> List[RouteStats]:
+        """Get routing counters for every tab in the session, oldest first."""
+        stats: List[RouteStats] = []
+        for page in self._pages:
+            page_stats = page.route_stats()
+            if page_stats and all(page_stats is not s for s in stats):
+                stats.append(page_stats)
+        return stats
+
+
+    @public(order=13)
     @documentation(extends=WebPage.elements)
     def elements(
         self, bbox: Optional[Tuple[float, float, float, float]] = None
-    ) -> Dict[int, ElementMetadata]:
+    ) -> Mapping[int, ElementMetadata]:
         """Get all elements on the current page."""
-        return self._current_page().elements(bbox)
+        page = self._current_page()
+        if page._detection_mode != "incremental":
+            # Nothing to sync from the page, so no need for the event loop
+            return page.elements(bbox)
+        return self._sync(self.a_elements(bbox))
+
+    async def a_elements(
+        self, bbox: Optional[Tuple[float, float, float, float]] = None
+    ) -> Mapping[int, ElementMetadata]:
+        page = self._current_page()
+        await page._sync_elements()
+        return page.elements(bbox)
+
+    @public(order=14)
+    @documentation(extends=WebPage.elements_in)
+    def elements_in(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        page = self._current_page()
+        if page._detection_mode != "incremental":
+            return page.elements_in(rect)
+        return self._sync(self.a_elements_in(rect))
+
+    async def a_elements_in(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        page = self._current_page()
+        await page._sync_elements()
+        return page.elements_in(rect)
+
+    @public(order=15)
+    @documentation(extends=WebPage.elements_intersecting)
+    def elements_intersecting(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        page = self._current_page()
+        if page._detection_mode != "incremental":
+            return page.elements_intersecting(rect)
+        return self._sync(self.a_elements_intersecting(rect))
+
+    async def a_elements_intersecting(
+        self, rect: Tuple[float, float, float, float]
+    ) -> Dict[int, ElementMetadata]:
+        page = self._current_page()
+        await page._sync_elements()
+        return page.elements_intersecting(rect)
+
+    @public(order=16)
+    @documentation(extends=WebPage.element_at)
+    def element_at(self, x: float, y: float) -> Optional[ElementMetadata]:
+        page = self._current_page()
+        if page._detection_mode != "incremental":
+            return page.element_at(x, y)
+        return self._sync(self.a_element_at(x, y))
+
+    async def a_element_at(self, x: float, y: float) -> Optional[ElementMetadata]:
+        page = self._current_page()
+        await page._sync_elements()
+        return page.element_at(x, y)
+
+    @public(order=17)
+    @documentation(extends=WebPage.nearest)
+    def nearest(self, x: float, y: float, k: int = 1) -> List[ElementMetadata]:
+        page = self._current_page()
+        if page._detection_mode != "incremental":
+            return page.nearest(x, y, k)
+        return self._sync(self.a_nearest(x, y, k))
+
+    async def a_nearest(self, x: float, y: float, k: int = 1) -> List[ElementMetadata]:
+        page = self._current_page()
+        await page._sync_elements()
+        return page.nearest(x, y, k)
+
+    @public(order=18)
+    def details(self, element_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Load the heavy fields of several elements in one round trip.
+**Inputs**
+    element_ids (Sequence[int]): Elements of the current page.
+**Outputs**
+    Dict[int, Dict[str, Any]]: element_html, attributes, computed_styles, listeners and state by element ID.
+
+Loaded fields stay cached, so reading them from the elements afterwards does not hit the page.
+In async code, await a_details before reading those fields from an element.
+        """
+        return self._sync(self.a_details(element_ids))
+
+    async def a_details(self, element_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        return await self._current_page().details(element_ids)
 
     async def _get_state_dict(self) -> StateDict:
         """Get browser state including page history and interactions."""
@@ -767,47 +1756,33 @@ class WebBrowser(BaseTarget):
         # Get element type counts if we have a current page
         element_counts = {"buttons": 0, "inputs": 0, "links": 0, "text": 0, "images": 0}
         if current_page:
-            for elem in current_page._elements.values():
-                if elem.element_type == "button":
-                    element_counts["buttons"] += 1
-                elif elem.element_type == "input":
-                    element_counts["inputs"] += 1
-                elif elem.element_type == "link":
-                    element_counts["links"] += 1
-                elif elem.element_type == "icon":
-                    element_counts["images"] += 1
-                else:
-                    element_counts["text"] += 1
-
-        # Build timeline from all pages' histories
+            buckets = {"button": "buttons", "input": "inputs", "link": "links", "icon": "images"}
+            for element_type, count in current_page._elements.type_counts().items():
+                element_counts[buckets.get(element_type, "text")] += count
+
+        # Build timeline from the session's interaction log
         timeline_rows = []
-        for page in self._pages:
-            for timestamp, action_type, metadata in page.interaction_history():
-                time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-
-                # Format action based on type
-                if action_type == "goto":
-                    action = f"Goto to {metadata['url']}"
-                elif action_type == "type":
-                    text = metadata["data"].get("text", "")
-                    xpath = metadata.get("xpath", "unknown")
-                    label = metadata.get("element_label", "")
-                    element_desc = f'"{label}" ({xpath})' if label else xpath
-                    action = f'Typed value: "{text}" to {element_desc}'
-                elif action_type == "click":
-                    xpath = metadata.get("xpath", "unknown")
-                    label = metadata.get("element_label", "")
-                    element_desc = f'"{label}" ({xpath})' if label else xpath
-                    action = f"Clicked {element_desc}"
-                elif action_type == "navigation_error":
-                    action = f"Navigation error: {metadata['data']['url']}"
-                else:
-                    xpath = metadata.get("xpath", "unknown")
-                    label = metadata.get("element_label", "")
-                    element_desc = f'"{label}" ({xpath})' if label else xpath
-                    action = f"Interacted with {element_desc}"
-
-                timeline_rows.append([time_str, action])
+        for record in self._log:
+            time_str = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+            xpath = record.xpath or "unknown"
+            label = record.element_label
+            element_desc = f'"{label}" ({xpath})' if label else xpath
+
+            # Format action based on type
+            if record.interaction_type == "goto":
+                action = f"Goto to {record.url}"
+            elif record.interaction_type == "type":
+                action = f'Typed value: "{record.data.get("text", "")}" to {element_desc}'
+            elif record.interaction_type == "click":
+                action = f"Clicked {element_desc}"
+            elif record.interaction_type == "navigation_error":
+                action = f"Navigation error: {record.url}"
+            else:
+                action = f"Interacted with {element_desc}"
+
+            timeline_rows.append([time_str, action])
+        if self._log.dropped:
+            timeline_rows.insert(0, ["", f"... {self._log.dropped} earlier interactions"])
 
         return {
             "sections": [
@@ -853,7 +1828,7 @@ class WebBrowser(BaseTarget):
             ]
         }
 
-    @public(order=10)
+    @public(order=19)
     @documentation(
         template="{extendee}",
         extends=WebPage.evaluate,
@@ -866,7 +1841,7 @@ class WebBrowser(BaseTarget):
         """Async version of evaluate."""
         return await self._current_page().evaluate(expression)
 
-    @public(order=11)
+    @public(order=20)
     @documentation(extends=WebPage.close)
     def close(self):
         """Close the browser and clean up resources."""
@@ -875,20 +1850,46 @@ class WebBrowser(BaseTarget):
     async def a_close(self):
         """Async version of close."""
         if self._browser:
-            await self._browser.close()
+            if self._pool:
+                # Hand the context back to the pool instead of closing it
+                await self._pool.release(self._browser)
+            elif self._host:
+                # Release the shared browser and driver along with the context
+                await self._host.close_context(self._browser)
+            else:
+                await self._browser.close()
             self._browser = None
             self._pages.clear()
+            self._detections.clear()
+            if self._spill:
+                self._spill.cleanup()
+                self._spill = None
+            self._log.close()
 
-    @public(order=12)
+    @public(order=21)
     def state(self) -> str:
         """Get the current state of the page.
 it included interaction history, page element overview, and top page entities.
         
         """
         return super().state()
+
+    async def a_state(self) -> str:
+        """Async version of state, reused until the page, the log or the cookies change."""
+        page = self._current_page() if self._pages else None
+        if not page or not page.is_live():
+            return await super().a_state()
+        version = await page.dom_version()
+        # The URL can change without touching the DOM (history.pushState)
+        key = ("state", page.pw_page().url, len(await page.cookies()), self._log.total, len(self._pages))
+        state = page._artifact(key, version)
+        if state is None:
+            state = await super().a_state()
+            page._keep_artifact(key, state, version)
+        return state
     
 
-    @public(order=13)
+    @public(order=22)
     def analyze(self) -> str:
         """Analyze the current page.
 Page analysis will run a KG extraction and entity recognition.
@@ -926,6 +1927,61 @@ class WebProcessor(BaseProcessor[Union[str, Page]]):
             "bypass_csp": kwargs.get("bypass_csp", False),
             "args": merged_args
         }
+
+        # Context pooling: True for defaults, a dict of ContextPool options, or a ContextPool
+        pool = kwargs.get("pool", None)
+        if pool and self._kwargs["user_data_dir"]:
+            raise ValueError("pool cannot be used with user_data_dir")
+        self._pool = pool
+
+        # Attach to a browser served by another process instead of launching one
+        self._cdp_endpoint = kwargs.get("cdp_endpoint", None)
+        if self._cdp_endpoint and (pool or self._kwargs["user_data_dir"]):
+            raise ValueError("cdp_endpoint cannot be used with pool or user_data_dir")
+
+        # Page settle detection: a dict of SettleConfig options {quiet_ms, timeout_ms, ...}
+        self._settle_config = SettleConfig(**(kwargs.get("settle") or {}))
+
+        # Element detection: "full" re-detects per document, "incremental" also syncs DOM deltas
+        self._detection_mode = kwargs.get("detection", "full")
+        if self._detection_mode not in ("full", "incremental"):
+            raise ValueError("detection must be 'full' or 'incremental'")
+
+        # Request routing: a profile name ("text-only", "no-media", ...), a dict of
+        # {profile, allow, deny, block, third_party}, or a RouteProfile
+        self._route_profile = resolve_profile(kwargs.get("routing", None))
+
+        # Network recording and offline replay: a dict of HarConfig options {path, mode, url, not_found}
+        har = kwargs.get("har", None)
+        self._har = HarConfig(**har) if isinstance(har, dict) else har
+        if self._har and self._har.mode == "record" and pool:
+            raise ValueError("har recording cannot be used with pool")
+
+        # Shared disk cache for static assets: True for defaults, a dict of
+        # AssetCache options {path, max_bytes, resource_types}, or an AssetCache
+        self._cache = kwargs.get("cache", None)
+        if self._cache and self._har and self._har.mode == "replay":
+            raise ValueError("cache cannot be used with har replay")
+
+        # Page history window: a dict of HistoryConfig options {keep, spill_dir}
+        self._history = HistoryConfig(**(kwargs.get("history") or {}))
+
+        # Interaction log: a dict of {capacity, sink, format, batch_size, flush_interval}
+        self._interactions = kwargs.get("interactions", None)
+
+        # How clicks and typing are performed: "human" (default), "fast", "adaptive"
+        # or an InteractionProfile; checked here, built per session
+        self._interaction_profile = kwargs.get("interaction_profile", None)
+        resolve_interaction_profile(self._interaction_profile)
+
+        # Observe long tasks and keep the site timings of documents a tab navigates
+        # away from, at the cost of an init script on every page and one evaluate
+        # per navigation; navigation and resource timings of current pages are always read
+        self._metrics = kwargs.get("metrics", False)
+
+        # Saved browser state to start from: a save_state() file path or dict
+        state = kwargs.get("state", None)
+        self._state = read_state(state) if state is not None else None
         
 
     def documentation(self) -> List[str]:
@@ -934,19 +1990,40 @@ class WebProcessor(BaseProcessor[Union[str, Page]]):
         return docs
     
     async def _launch_browser(self):
-        playwright = await async_playwright().start()
+        host = BrowserHost.current()
+        record_kwargs = self._har.context_kwargs() if self._har else {}
         if self._kwargs["user_data_dir"]:
             self._kwargs["ignore_default_args"] = True
-            return await playwright.chromium.launch_persistent_context(**self._kwargs)
+            return await host.new_persistent_context(**self._kwargs, **record_kwargs)
         
         kwargs = {k: v for k, v in self._kwargs.items() if k in ["headless", "executable_path", "channel"]}
-
-        browser = await playwright.chromium.launch(
-            **kwargs
-        )
         context_kwargs = {k: v for k, v in self._kwargs.items() if k in ["screen","no_viewport","bypass_csp"]}
+        context_kwargs.update(record_kwargs)
+        if self._state:
+            # Cookies, localStorage and IndexedDB are restored by the new context itself
+            context_kwargs["storage_state"] = context_state(self._state)
             
-        return await browser.new_context(**context_kwargs)
+        return await host.new_context(kwargs, context_kwargs, cdp_endpoint=self._cdp_endpoint)
+
+    def _resolve_pool(self) -> Optional[ContextPool]:
+        """Get the context pool this processor draws from, if pooling is enabled."""
+        if not self._pool:
+            return None
+        if isinstance(self._pool, ContextPool):
+            return self._pool
+
+        options = self._pool if isinstance(self._pool, dict) else {}
+        launch_kwargs = {k: v for k, v in self._kwargs.items() if k in ["headless", "executable_path", "channel"]}
+        context_kwargs = {k: v for k, v in self._kwargs.items() if k in ["screen","no_viewport","bypass_csp"]}
+        return shared_pool(launch_kwargs, context_kwargs, **options)
+
+    def _resolve_cache(self) -> Optional[AssetCache]:
+        """Get the asset cache this processor routes through, if caching is enabled."""
+        if not self._cache:
+            return None
+        if isinstance(self._cache, AssetCache):
+            return self._cache
+        return shared_cache(**(self._cache if isinstance(self._cache, dict) else {}))
 
     async def a_process(self) -> WebBrowser:
         """Async version of process.
@@ -962,7 +2039,7 @@ class WebProcessor(BaseProcessor[Union[str, Page]]):
         await web_page.process()
 
         web_browser = WebBrowser(
-            _browser=browser, _pages=[web_page], _headless=self._kwargs["headless"]
+            _browser=browser, _pages=[web_page], _headless=self._kwargs["headless"], _host=BrowserHost.current()
         )
 
         return web_browser
@@ -973,12 +2050,50 @@ class WebProcessor(BaseProcessor[Union[str, Page]]):
         Returns:
             WebBrowser: A WebBrowser instance.
         """
-        # Initialize Playwright and browser
-        browser = await self._launch_browser()
+        # Take a warm context from the pool when pooling is enabled
+        pool = self._resolve_pool()
+        if pool:
+            browser = await pool.acquire()
+        else:
+            browser = await self._launch_browser()
+
+        # Replay routes go first so the routing profile, registered later, runs before them
+        if self._har:
+            await self._har.install(browser)
+        cache = self._resolve_cache()
+        if cache:
+            await cache.install(browser)
+
+        router = None
+        if self._route_profile:
+            router = RequestRouter(self._route_profile)
+            await router.install(browser)
+
         web_browser = WebBrowser(
-            _browser=browser, _pages=[], _headless=self._kwargs["headless"]
+            _browser=browser,
+            _pages=[],
+            _headless=self._kwargs["headless"],
+            _pool=pool,
+            _host=None if pool else BrowserHost.current(),
+            _settle_config=self._settle_config,
+            _detection_mode=self._detection_mode,
+            _router=router,
+            _cache=cache,
+            _history=self._history,
+            _log=InteractionLog.from_options(self._interactions),
+            _profile=resolve_interaction_profile(self._interaction_profile),
+            _collect_metrics=self._metrics,
         )
 
+        if self._state:
+            if pool or self._kwargs["user_data_dir"]:
+                # Shared and persistent contexts exist already, the state is loaded into them
+                await web_browser.a_load_state(self._state)
+            else:
+                await web_browser._seed(
+                    seed_script(self._state, get_script_path("storage_seed.js"), local=False)
+                )
+
         return web_browser
 
     def process(self) -> WebBrowser:
@@ -113,6 +113,11 @@ def enable_tracing():
     # Instrument after setting provider
     SmolagentsInstrumentor().instrument()
 
+    # Browser spans are opt-in, and on whenever tracing is
+    from donew.see.processors import telemetry
+
+    telemetry.enable()
+
     # Mark tracing as enabled
     enable_tracing._tracing_enabled = True
     print("✅ Tracing enabled - View traces at http://0.0.0.0:6006/projects")
@@ -0,0 +1,100 @@
+import numpy as np
+
+from donew.see.processors.elements import ElementStore
+
+
+def _record(element_id, **overrides):
+    record = {
+        "element_id": element_id,
+        "element_name": "button" if element_id % 3 == 0 else "div",
+        "element_label": f"Label {element_id}" if element_id % 2 == 0 else None,
+        "xpath": f"xpath=//html/body/div[{element_id}]",
+        "bounding_box": (
+            None
+            if element_id % 5 == 0
+            else {"x": float(element_id), "y": 2.0 * element_id, "width": 10.0, "height": 5.0}
+        ),
+        "is_interactive": element_id % 3 == 0,
+        "element_type": "button" if element_id % 3 == 0 else "text",
+        "parent_id": None if element_id == 1 else 1,
+        "children_ids": [element_id + 1, element_id + 2],
+        "z_index": 0,
+    }
+    record.update(overrides)
+    return record
+
+
+def test_element_store_views():
+    """Test that views round-trip the detection summaries"""
+    records = [_record(i) for i in range(1, 1001)]
+    store = ElementStore(records)
+
+    assert len(store) == 1000
+    assert list(store)[:3] == [1, 2, 3]
+    for record in records:
+        assert store[record["element_id"]].to_dict() == record
+    assert store.get(5000) is None
+    assert store.type_counts() == {"button": 333, "text": 667}
+
+
+def test_element_store_deltas():
+    """Test removals, upserts and box moves, including across compaction"""
+    store = ElementStore([_record(i) for i in range(1, 101)])
+    view = store[9]
+
+    store.apply(
+        removed=[5, 6],
+        upserts=[_record(7, element_label="Changed"), _record(500)],
+        boxes={8: {"x": 1.0, "y": 2.0, "width": 3.0, "height": 4.0}},
+    )
+    assert 5 not in store and 6 not in store
+    assert store[7].element_label == "Changed"
+    assert store[500].xpath == "xpath=//html/body/div[500]"
+    assert store[8].bounding_box == {"x": 1.0, "y": 2.0, "width": 3.0, "height": 4.0}
+
+    # Enough updates to force compaction; old views keep their snapshot
+    for i in range(10, 100):
+        store.apply(upserts=[_record(i, element_label=f"v{i}")])
+    assert store[10].element_label == "v10"
+    assert view.xpath == "xpath=//html/body/div[9]"
+    assert len(store) == 99
+
+
+def test_element_store_columns():
+    """Test vectorized filtering over the columns"""
+    store = ElementStore([_record(i) for i in range(1, 21)])
+    columns = store.columns()
+
+    interactive = columns["ids"][columns["interactive"]]
+    assert interactive.tolist() == [3, 6, 9, 12, 15, 18]
+    without_box = columns["ids"][np.isnan(columns["boxes"]).any(axis=1)]
+    assert without_box.tolist() == [5, 10, 15, 20]
+    buttons = columns["types"] == store.code("button")
+    assert set(store.subset(columns["ids"][buttons])) == set(interactive.tolist())
+
+
+def test_element_store_spatial():
+    """Test region, hit-test and nearest queries against z-order"""
+    records = [
+        _record(1, bounding_box={"x": 0.0, "y": 0.0, "width": 1000.0, "height": 1000.0}),
+        _record(2, bounding_box={"x": 10.0, "y": 10.0, "width": 100.0, "height": 20.0}),
+        _record(3, bounding_box={"x": 50.0, "y": 15.0, "width": 20.0, "height": 10.0}),
+        # Earlier in the document but stacked above via z-index
+        _record(4, bounding_box={"x": 200.0, "y": 200.0, "width": 50.0, "height": 50.0}, z_index=5),
+        _record(5, bounding_box={"x": 210.0, "y": 210.0, "width": 10.0, "height": 10.0}),
+        _record(6, bounding_box={"x": 0.0, "y": 0.0, "width": 0.0, "height": 0.0}),
+    ]
+    store = ElementStore(records)
+    index = store.spatial()
+
+    assert index.within((0, 0, 120, 40)).tolist() == [2, 3]
+    assert index.intersecting((60, 20, 65, 22)).tolist() == [1, 2, 3]
+    assert index.at(55, 20) == [3, 2, 1]
+    assert index.at(215, 215) == [4, 5, 1]
+    assert index.at(5000, 5000) == []
+    assert index.nearest(120, 20, k=2) == [1, 2]
+    assert index.nearest(-10, 20, k=2) == [1, 2]
+
+    # Updates rebuild the index
+    store.apply(removed=[3])
+    assert store.spatial().at(55, 20) == [2, 1]
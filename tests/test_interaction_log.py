@@ -0,0 +1,58 @@
+import pytest
+
+from donew.see.processors.interactions import (
+    InteractionLog,
+    InteractionRecord,
+    InteractionSink,
+)
+
+
+def _record(i):
+    return InteractionRecord(
+        timestamp=1000.0 + i,
+        interaction_type="click" if i % 2 else "goto",
+        url=f"https://example.com/{i}",
+        element_id=i if i % 2 else -1,
+        data={"n": i},
+        xpath=f"xpath=//div[{i}]" if i % 2 else None,
+    )
+
+
+def test_interaction_log_ring_buffer():
+    """Test that the log keeps only the most recent records in memory"""
+    log = InteractionLog(capacity=3)
+    log.extend(_record(i) for i in range(10))
+
+    assert len(log) == 3
+    assert log.total == 10
+    assert log.dropped == 7
+    assert [r.element_id for r in log] == [7, -1, 9]
+    # Without a sink the full history is what is buffered
+    assert log.records(full=True) == log.records()
+
+    with pytest.raises(ValueError):
+        InteractionLog(capacity=0)
+    with pytest.raises(ValueError):
+        InteractionLog.from_options({"batch_size": 10})
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.parquet"])
+def test_interaction_sink(tmp_path, name):
+    """Test streaming records to disk and reading the full session back"""
+    if name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    log = InteractionLog.from_options(
+        {"capacity": 2, "sink": str(tmp_path / name), "batch_size": 4}
+    )
+    records = [_record(i) for i in range(10)]
+    log.extend(records)
+
+    assert len(log) == 2
+    assert log.records(full=True) == records
+    log.close()
+
+    # A later session appends to the same sink
+    sink = InteractionSink(tmp_path / name)
+    sink.write(_record(10))
+    assert list(sink.read()) == records + [_record(10)]
+    sink.close()
@@ -0,0 +1,36 @@
+import pytest
+
+from donew.see.processors import telemetry
+
+
+def test_span_disabled_is_shared_noop():
+    """Test that spans cost one flag check while tracing is off"""
+    telemetry.disable()
+    first = telemetry.span("text", element_id=1)
+    second = telemetry.span("click")
+    assert first is second
+    with first as active:
+        assert not active.is_recording()
+        telemetry.set_attributes(active, payload_bytes=10)
+
+
+def test_span_enabled_records_attributes():
+    """Test that spans carry prefixed attributes once enabled"""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    telemetry.enable(provider)
+    try:
+        with telemetry.span("text", element_id=3, url=None) as active:
+            telemetry.set_attributes(active, payload_bytes=42, settle_ms=None)
+    finally:
+        telemetry.disable()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "donew.text"
+    assert dict(span.attributes) == {"donew.element_id": 3, "donew.payload_bytes": 42}
@@ -6,7 +6,8 @@ import asyncio
 import json
 from typing import cast, TypedDict, Dict, Any
 
-from donew.see.processors.web import NavigationError
+from donew.see.processors.interactions import InteractionLog
+from donew.see.processors.web import Interaction, NavigationError, WebPage, WebProcessor
 from donew.utils import run_sync
 
 
@@ -166,7 +167,7 @@ def test_status_codes(httpbin_url, httpbin_available):
             "window.performance.getEntries()[0].responseStatus"
         )
         assert status_code == 404
-        interaction_history = browser._current_page()._interaction_history
+        interaction_history = browser._current_page().interactions()
         assert interaction_history[-1].interaction_type == "navigation_error"
         #lets try again to check recovery
         browser.goto(f"{httpbin_url}/status/200")
@@ -203,7 +204,7 @@ def test_state_html(httpbin_url, httpbin_available):
             "window.performance.getEntries()[0].responseStatus"
         )
         assert status_code == 404
-        interaction_history = browser._current_page()._interaction_history
+        interaction_history = browser._current_page().interactions()
         assert interaction_history[-1].interaction_type == "navigation_error"
         # Navigate to HTML page
         browser.goto(f"{httpbin_url}/html")
@@ -416,3 +417,806 @@ def test_knowledge_graph_extraction(httpbin_url, httpbin_available):
 
     finally:
         browser.close()
+
+
+def test_context_pool(httpbin_url, httpbin_available):
+    """Test that pooled sessions reuse warm, reset contexts"""
+    pool = {"min_size": 1, "max_size": 2, "idle_timeout": 60}
+    browser = DO.Browse(pool=pool)
+    browser.goto(f"{httpbin_url}/cookies/set/pooled/yes")
+    assert any(c["name"] == "pooled" for c in browser.cookies())
+    context = browser._browser
+    browser.close()
+
+    browser = DO.Browse(pool=pool)
+    try:
+        assert browser._browser is context
+        browser.goto(f"{httpbin_url}/cookies")
+        assert not any(c["name"] == "pooled" for c in browser.cookies())
+    finally:
+        browser.close()
+
+
+def test_context_pool_recycles_indexed_db(httpbin_url, httpbin_available):
+    """Test that a pooled context holding IndexedDB data is not handed to the next session"""
+    pool = {"min_size": 1, "max_size": 2, "idle_timeout": 60}
+    browser = DO.Browse(pool=pool)
+    browser.goto(f"{httpbin_url}/html")
+    browser.evaluate(
+        """new Promise(resolve => {
+            const request = indexedDB.open('pooled');
+            request.onupgradeneeded = () => request.result.createObjectStore('items').put('yes', 'key');
+            request.onsuccess = () => { request.result.close(); resolve(); };
+        })"""
+    )
+    context = browser._browser
+    browser.close()
+
+    browser = DO.Browse(pool=pool)
+    try:
+        assert browser._browser is not context
+        browser.goto(f"{httpbin_url}/html")
+        names = browser.evaluate("indexedDB.databases().then(dbs => dbs.map(db => db.name))")
+        assert "pooled" not in names
+    finally:
+        browser.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_browser_host(httpbin_url, httpbin_available):
+    """Test that sessions share one driver and browser and release them on close"""
+    from donew.see.processors.host import BrowserHost
+
+    first = await DO.A_browse()
+    second = await DO.A_browse()
+    host = BrowserHost.current()
+    stats = host.stats()
+    assert stats["driver_running"]
+    assert stats["live_contexts"] == 2
+    assert list(stats["browsers"].values()) == [2]
+
+    await first.a_close()
+    await second.a_close()
+    stats = host.stats()
+    assert not stats["driver_running"]
+    assert stats["browsers_closed"] == stats["browsers_launched"]
+    assert stats["contexts_closed"] == stats["contexts_opened"]
+
+
+def test_goto_many(httpbin_url, httpbin_available):
+    """Test opening several URLs in parallel tabs"""
+    browser = DO.Browse()
+    urls = [f"{httpbin_url}/html", f"{httpbin_url}/forms/post", f"{httpbin_url}/links/3/0"]
+    try:
+        pages = browser.goto_many(urls, concurrency=2)
+        assert len(pages) == 3
+        for url, page in zip(urls, pages):
+            assert page.is_live()
+            assert page.pw_page().url == url
+            assert len(page.elements()) > 0
+        # The last URL becomes the current page
+        assert browser._current_page() is pages[-1]
+    finally:
+        browser.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_goto_closes_unused_tabs(httpbin_url, httpbin_available):
+    """Test that stopping a stream early closes the tabs it did not hand out"""
+    browser = await DO.A_browse()
+    urls = [f"{httpbin_url}/html", f"{httpbin_url}/delay/2", f"{httpbin_url}/delay/3", f"{httpbin_url}/links/3/0"]
+    try:
+        context = browser._browser
+        before = len(context.pages)
+        stream = browser.a_stream_goto(urls, concurrency=2)
+        async for page in stream:
+            break
+        await stream.aclose()
+
+        assert page.is_live()
+        assert len(context.pages) == before + 1
+    finally:
+        await browser.a_close()
+
+
+def test_settle_timings(httpbin_url, httpbin_available):
+    """Test that navigations settle without fixed sleeps and record timings"""
+    browser = DO.Browse(settle={"quiet_ms": 200, "timeout_ms": 3000})
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        browser.goto(f"{httpbin_url}/forms/post")
+        timings = browser.settle_timings()
+        assert len(timings) >= 2
+        assert any(t.url == f"{httpbin_url}/forms/post" for t in timings)
+        for timing in timings:
+            assert not timing.timed_out
+            assert timing.total_ms < 3000
+    finally:
+        browser.close()
+
+
+def test_incremental_detection(httpbin_url, httpbin_available):
+    """Test that incremental detection syncs DOM deltas and keeps IDs stable"""
+    browser = DO.Browse(detection="incremental")
+    browser.goto(f"{httpbin_url}/html")
+    try:
+        before = {id: elem.xpath for id, elem in browser.elements().items()}
+        browser.evaluate(
+            "document.body.appendChild(Object.assign(document.createElement('button'), {textContent: 'Added'}))"
+        )
+        after = browser.elements()
+        added = [id for id in after if id not in before]
+        assert len(added) == 1
+        assert after[added[0]].element_type == "button"
+        assert added[0] > max(before)
+        # Unchanged nodes keep their IDs
+        for id, xpath in before.items():
+            assert after[id].xpath == xpath
+
+        browser.evaluate("document.querySelector('button').remove()")
+        assert added[0] not in browser.elements()
+    finally:
+        browser.close()
+
+
+@pytest.mark.asyncio
+async def test_incremental_boxes_follow_late_loads(httpbin_url, httpbin_available):
+    """Test that a layout shift without DOM mutations, like an image loading, updates boxes"""
+    import io
+
+    from PIL import Image
+
+    png = io.BytesIO()
+    Image.new("RGB", (200, 200)).save(png, format="PNG")
+
+    async def slow_image(route):
+        await asyncio.sleep(1)
+        await route.fulfill(body=png.getvalue(), content_type="image/png")
+
+    browser = await DO.A_browse(detection="incremental")
+    try:
+        await browser.a_goto(f"{httpbin_url}/html")
+        pw_page = browser._current_page().pw_page()
+        await pw_page.route("**/slow.png", slow_image)
+        await browser.a_evaluate(
+            "document.body.insertAdjacentHTML('afterbegin', '<div><img src=\"/slow.png\"><p id=\"below\">below</p></div>')"
+        )
+        elements = await browser.a_elements()
+        below = int(await browser.a_evaluate("document.getElementById('below').dataset.doseeElementId"))
+        before = elements[below].bounding_box["y"]
+
+        await pw_page.wait_for_function("document.querySelector('img[src=\"/slow.png\"]').complete")
+        after = (await browser.a_elements())[below].bounding_box["y"]
+        assert after >= before + 200
+        assert after == await browser.a_evaluate("document.getElementById('below').getBoundingClientRect().y")
+    finally:
+        await browser.a_close()
+
+
+def test_xpath_uniqueness(httpbin_url, httpbin_available):
+    """Test that every detected XPath resolves to exactly its own element"""
+    browser = DO.Browse()
+    browser.goto(f"{httpbin_url}/forms/post")
+    try:
+        # Duplicate IDs must not be used as anchors
+        browser.evaluate(
+            "document.body.insertAdjacentHTML('afterbegin', '<div id=\"dup\"><span>a</span></div><div id=\"dup\"><span>b</span></div>')"
+        )
+        page = browser._current_page()
+        run_sync(page.detect())
+        mismatches = browser.evaluate(
+            """() => Object.entries(window.DoSeeElements).filter(([id, el]) => {
+                const found = document.evaluate(el.xpath.slice(6), document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                return found.snapshotLength !== 1
+                    || found.snapshotItem(0).dataset.doseeElementId !== id;
+            }).map(([id]) => id)"""
+        )
+        assert mismatches == []
+    finally:
+        browser.close()
+
+
+def test_lazy_element_details(httpbin_url, httpbin_available):
+    """Test that heavy element fields stay in the page until accessed"""
+    browser = DO.Browse()
+    browser.goto(f"{httpbin_url}/forms/post")
+    try:
+        page = browser._current_page()
+        elements = browser.elements()
+        assert not page._details
+
+        inputs = [e for e in elements.values() if e.element_type == "input"]
+        assert inputs
+        first = inputs[0]
+        assert "name" in first.attributes
+        assert first.element_html.startswith(f"<{first.element_name}")
+        assert first.state["isVisible"]
+        assert list(page._details) == [first.element_id]
+
+        # Bulk prefetch in one round trip
+        details = run_sync(page.details([e.element_id for e in inputs]))
+        assert set(details) == {e.element_id for e in inputs}
+    finally:
+        browser.close()
+
+
+@pytest.mark.asyncio
+async def test_async_element_details(httpbin_url, httpbin_available):
+    """Test that heavy element fields are loaded with a_details in async code"""
+    browser = await DO.A_browse()
+    try:
+        await browser.a_goto(f"{httpbin_url}/forms/post")
+        elements = await browser.a_elements()
+        first = next(e for e in elements.values() if e.element_type == "input")
+        with pytest.raises(RuntimeError, match="a_details"):
+            first.attributes
+
+        details = await browser.a_details([first.element_id])
+        assert "name" in details[first.element_id]["attributes"]
+        assert first.attributes == details[first.element_id]["attributes"]
+    finally:
+        await browser.a_close()
+
+
+def test_spatial_queries(httpbin_url, httpbin_available):
+    """Test geometric element lookups on the current page"""
+    browser = DO.Browse()
+    browser.goto(f"{httpbin_url}/forms/post")
+    try:
+        elements = browser.elements()
+        button = next(e for e in elements.values() if e.element_type == "button")
+        box = button.bounding_box
+        center = (box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+
+        assert browser.element_at(*center).element_id == button.element_id
+        assert browser.nearest(*center, k=1)[0].element_id == button.element_id
+        region = (box["x"] - 1, box["y"] - 1, box["x"] + box["width"] + 1, box["y"] + box["height"] + 1)
+        assert button.element_id in browser.elements_in(region)
+        assert button.element_id in browser.elements(bbox=region)
+        overlapping = browser.elements_intersecting(region)
+        assert button.element_id in overlapping
+        assert button.parent_id in overlapping
+    finally:
+        browser.close()
+
+
+def test_routing_profiles(httpbin_url, httpbin_available):
+    """Test that routing profiles block resources and count them per tab"""
+    with pytest.raises(ValueError):
+        DO.Browse(routing="no-such-profile")
+
+    browser = DO.Browse(routing={"profile": "text-only", "deny": [r"/deny-me"]})
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        blocked = browser.evaluate(
+            """async () => {
+                const image = await fetch('/image/png').then(() => 'loaded', () => 'blocked');
+                const denied = await fetch('/deny-me').then(() => 'loaded', () => 'blocked');
+                const allowed = await fetch('/get').then(r => r.status, () => 'blocked');
+                return [image, denied, allowed];
+            }"""
+        )
+        # fetch() is not an image request; only the deny pattern applies to it
+        assert blocked == ["loaded", "blocked", 200]
+
+        browser.evaluate(
+            "new Promise(r => { const i = new Image(); i.onload = i.onerror = r; i.src = '/image/png'; })"
+        )
+        stats = browser.route_stats()
+        assert len(stats) == 1
+        assert stats[0].blocked_requests >= 2
+        assert stats[0].blocked_by_type.get("image", 0) >= 1
+        assert stats[0].blocked_bytes > 0
+        assert stats[0].allowed_requests > 0
+    finally:
+        browser.close()
+
+
+def test_har_record_replay(httpbin_url, httpbin_available, tmp_path):
+    """Test recording a session to HAR and replaying it without the network"""
+    har = tmp_path / "session.har"
+    with pytest.raises(ValueError):
+        DO.Browse(har={"path": str(tmp_path / "missing.har")})
+
+    browser = DO.Browse(har={"path": str(har), "mode": "record"})
+    browser.goto(f"{httpbin_url}/html")
+    text = browser.text()
+    browser.close()
+    assert har.exists()
+
+    browser = DO.Browse(har={"path": str(har)})
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        assert browser.text() == text
+        # Anything not in the archive is aborted instead of fetched
+        with pytest.raises(Exception):
+            browser.goto(f"{httpbin_url}/forms/post")
+    finally:
+        browser.close()
+
+
+def test_asset_cache(httpbin_url, httpbin_available, tmp_path):
+    """Test that cacheable assets are served from disk in later sessions"""
+    url = f"{httpbin_url}/response-headers?Cache-Control=max-age%3D60"
+    load = (
+        "new Promise(r => { const s = document.createElement('script'); "
+        f"s.onload = s.onerror = r; s.src = '{url}'; document.head.appendChild(s); }})"
+    )
+    for _ in range(2):
+        browser = DO.Browse(cache={"path": str(tmp_path)})
+        try:
+            browser.goto(f"{httpbin_url}/html")
+            browser.evaluate(load)
+            stats = browser.cache_stats()
+        finally:
+            browser.close()
+
+    assert stats["stored"] >= 1
+    assert stats["hits"] >= 1
+    assert stats["entries"] >= 1
+    assert any((tmp_path / "blobs").rglob("*"))
+
+
+def test_asset_cache_drops_cookies(httpbin_url, httpbin_available, tmp_path):
+    """Test that cookies set by a cached asset are not replayed to other sessions"""
+    url = f"{httpbin_url}/response-headers?Cache-Control=max-age%3D60&Set-Cookie=cached%3Dyes"
+    load = (
+        "new Promise(r => { const s = document.createElement('script'); "
+        f"s.onload = s.onerror = r; s.src = '{url}'; document.head.appendChild(s); }})"
+    )
+    names = []
+    for _ in range(2):
+        browser = DO.Browse(cache={"path": str(tmp_path)})
+        try:
+            browser.goto(f"{httpbin_url}/html")
+            browser.evaluate(load)
+            names.append({cookie["name"] for cookie in browser.cookies()})
+            stats = browser.cache_stats()
+        finally:
+            browser.close()
+
+    # The network response set it, the cached one served to a fresh context did not
+    assert "cached" in names[0]
+    assert stats["hits"] >= 1
+    assert "cached" not in names[1]
+
+
+def test_history_window(httpbin_url, httpbin_available, tmp_path):
+    """Test that pages outside the history window are spilled and reloaded"""
+    browser = DO.Browse(history={"keep": 1, "spill_dir": str(tmp_path)})
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        first = browser._current_page()
+        count = len(first.elements())
+        browser.goto(f"{httpbin_url}/forms/post")
+        browser.goto(f"{httpbin_url}/links/3/0")
+
+        history = browser.history()
+        assert [page.compacted for page in history] == [True, True, False]
+        assert history[0].url.endswith("/html")
+        assert history[0].element_count == count
+        assert any(action == "goto" for _, action, _ in history[0].timeline)
+        assert len(list(tmp_path.iterdir())) == 2
+
+        # Accessing an old page reloads its snapshot from disk
+        assert len(first.elements()) == count
+        assert not first.is_compacted()
+        assert len(list(tmp_path.iterdir())) == 1
+    finally:
+        browser.close()
+
+
+def test_interaction_log(httpbin_url, httpbin_available, tmp_path):
+    """Test the bounded interaction log and its JSONL sink"""
+    sink = tmp_path / "interactions.jsonl"
+    browser = DO.Browse(interactions={"capacity": 2, "sink": str(sink)})
+    try:
+        for path in ("html", "forms/post", "links/3/0"):
+            browser.goto(f"{httpbin_url}/{path}")
+
+        recent = browser.interaction_log()
+        assert len(recent) == 2
+        assert recent[-1].url.endswith("/links/3/0")
+        full = browser.interaction_log(full=True)
+        assert [r.interaction_type for r in full] == ["goto"] * 3
+        assert full[0].url.endswith("/html")
+        assert "1 earlier interactions" in browser.state()
+    finally:
+        browser.close()
+    assert len(sink.read_text().splitlines()) == 3
+
+
+def test_text_markers(httpbin_url, httpbin_available):
+    """Test that text extraction marks interactive elements without touching the page"""
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        html = browser.evaluate("document.body.innerHTML")
+        text = browser.text()
+        assert browser.evaluate("document.body.innerHTML") == html
+
+        interactive = [e for e in browser.elements().values() if e.is_interactive]
+        assert interactive
+        for element in interactive[:5]:
+            assert f"@{element.element_id}" in text
+        element = interactive[0]
+        assert browser.text(element.element_id).startswith(f"@{element.element_id}")
+        with pytest.raises(ValueError):
+            browser.text(10**6)
+    finally:
+        browser.close()
+
+
+def test_dom_version_cache(httpbin_url, httpbin_available):
+    """Test that text and state are reused until the DOM changes"""
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        page = browser._current_page()
+        version = page._sync(page.dom_version())
+        assert version is not None
+
+        text = browser.text()
+        assert page._artifact(("text", None), version) == text
+        assert browser.text() == text
+        state = browser.state()
+        assert browser.state() == state
+        # Element IDs written by detection do not count as changes
+        assert page._sync(page.dom_version()) == version
+
+        browser.evaluate("document.querySelector('h1').textContent = 'Changed'")
+        assert page._sync(page.dom_version()) != version
+        assert "Changed" in browser.text()
+    finally:
+        browser.close()
+
+
+def test_image_formats(httpbin_url, httpbin_available):
+    """Test compressed and downscaled screenshots"""
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        png = browser.image()
+        assert png.startswith(b"\x89PNG")
+        assert browser._current_page().image_base64()
+
+        jpeg = browser.image(format="jpeg", quality=50)
+        assert jpeg.startswith(b"\xff\xd8")
+        webp = browser.image(format="webp", quality=50, max_dimension=320)
+        assert webp[:4] == b"RIFF" and webp[8:12] == b"WEBP"
+        assert len(webp) < len(png)
+
+        small = browser.image(max_dimension=100)
+        width, height = int.from_bytes(small[16:20], "big"), int.from_bytes(small[20:24], "big")
+        assert max(width, height) <= 100
+
+        with pytest.raises(ValueError):
+            browser.image(format="gif")
+        with pytest.raises(ValueError):
+            browser.image(quality=80)
+    finally:
+        browser.close()
+
+
+@pytest.mark.asyncio
+async def test_screencast(httpbin_url, httpbin_available):
+    """Test streaming frames while the page repaints"""
+    browser = await DO.A_browse()
+    try:
+        await browser.a_goto(f"{httpbin_url}/html")
+        await browser.a_evaluate(
+            "setInterval(() => document.body.style.background = "
+            "`hsl(${Date.now() % 360}, 50%, 50%)`, 50)"
+        )
+        frames = []
+        async for frame in browser.a_screencast(max_width=400):
+            frames.append(frame)
+            if len(frames) == 3:
+                break
+        assert all(f.data.startswith(b"\xff\xd8") for f in frames)
+        assert frames[0].width > 0
+    finally:
+        await browser.a_close()
+
+
+def test_batch_images(httpbin_url, httpbin_available):
+    """Test cropping many element images out of one capture"""
+    from io import BytesIO
+
+    from PIL import Image
+
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        visible = [
+            e.element_id
+            for e in browser.elements().values()
+            if e.bounding_box and e.bounding_box["width"] >= 2 and e.bounding_box["height"] >= 2
+        ][:20]
+        images = browser.images(visible, format="jpeg", quality=70)
+        assert list(images) == visible
+        for id in visible:
+            box = browser.elements()[id].bounding_box
+            width, height = Image.open(BytesIO(images[id])).size
+            assert abs(width - box["width"]) <= 2 and abs(height - box["height"]) <= 2
+
+        small = browser.images(visible[:3], max_dimension=16)
+        assert all(max(Image.open(BytesIO(b)).size) <= 16 for b in small.values())
+        with pytest.raises(ValueError):
+            browser.images([10**6])
+    finally:
+        browser.close()
+
+
+def test_annotated_image(httpbin_url, httpbin_available):
+    """Test annotated screenshots rendered without touching the page"""
+    from io import BytesIO
+
+    from PIL import Image
+
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        page = browser._current_page()
+        version = page._sync(page.dom_version())
+        browser.annotation(True)
+        assert browser.evaluate("document.querySelectorAll('.DoSee-highlight').length") == 0
+
+        annotated = browser.annotated_image()
+        raw = page._raw_image
+        assert annotated != raw
+        assert Image.open(BytesIO(annotated)).size == Image.open(BytesIO(raw)).size
+        assert page.image_base64(annotated=True)
+        assert page._sync(page.dom_version()) == version
+
+        # Reused until the page changes, and what image() returns while annotating
+        assert browser.annotated_image() is annotated
+        assert browser.image() is annotated
+        browser.evaluate("document.body.appendChild(document.createElement('hr'))")
+        assert browser.annotated_image() is not annotated
+    finally:
+        browser.close()
+
+
+def test_save_load_state(httpbin_url, httpbin_available, tmp_path):
+    """Test bulk storage and warm-starting a session from a saved state"""
+    path = tmp_path / "state.json"
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/cookies/set/session/abc")
+        storage = browser.storage(
+            {
+                "localStorage": {"quote": "it's \"quoted\"", "gone": "x"},
+                "sessionStorage": {"tab": "1"},
+            }
+        )
+        assert storage["localStorage"]["quote"] == "it's \"quoted\""
+        assert "gone" not in browser.storage({"localStorage": {"gone": None}})["localStorage"]
+
+        state = browser.save_state(path)
+        assert any(c["name"] == "session" for c in state["cookies"])
+        assert path.exists()
+    finally:
+        browser.close()
+
+    # A new session starts logged in, without replaying anything
+    warm = DO.Browse(state=str(path))
+    try:
+        warm.goto(f"{httpbin_url}/html")
+        assert any(c["name"] == "session" and c["value"] == "abc" for c in warm.cookies())
+        storage = warm.storage()
+        assert storage["localStorage"] == {"quote": "it's \"quoted\""}
+        assert storage["sessionStorage"] == {"tab": "1"}
+
+        # Seeded once; what the page changes afterwards sticks
+        warm.storage({"sessionStorage": {"tab": "2"}})
+        warm.goto(f"{httpbin_url}/forms/post")
+        assert warm.storage()["sessionStorage"]["tab"] == "2"
+    finally:
+        warm.close()
+
+    with pytest.raises(ValueError):
+        DO.Browse(state=str(tmp_path / "missing.json"))
+
+
+@pytest.mark.parametrize("profile", ["human", "fast", "adaptive"])
+def test_interaction_profiles(httpbin_url, httpbin_available, profile):
+    """Test that every profile types and clicks, recording how long each action took"""
+    browser = DO.Browse(interaction_profile=profile)
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        elements = browser.elements()
+        input_id = next(
+            id
+            for id, elem in elements.items()
+            if elem.element_type == "input" and elem.attributes.get("type") in ["text", "tel", "email"]
+        )
+        browser.type(input_id, "it's fast")
+        browser.click(input_id)
+        value = browser.evaluate(
+            f"document.querySelector(\"[data-dosee-element-id='{input_id}']\").value"
+        )
+        assert value == "it's fast"
+
+        records = [r for r in browser.interaction_log() if r.interaction_type in ("type", "click")]
+        assert [r.interaction_type for r in records] == ["type", "click"]
+        expected = "human" if profile == "human" else "fast"
+        for record in records:
+            assert record.data["profile"] == expected
+            assert record.data["latency_ms"] >= 0
+        if profile == "human":
+            # Stepped moves and pauses are what the other profiles skip
+            assert records[0].data["latency_ms"] >= 300
+    finally:
+        browser.close()
+
+    with pytest.raises(ValueError):
+        DO.Browse(interaction_profile="instant")
+
+
+def test_run_actions(httpbin_url, httpbin_available):
+    """Test running a batch of actions with a single settle at the end"""
+    browser = DO.Browse(interaction_profile="fast")
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        elements = browser.elements()
+        inputs = [
+            id
+            for id, elem in elements.items()
+            if elem.element_type == "input"
+            and elem.attributes.get("type") in ["text", "tel", "email"]
+        ][:2]
+        settles = len(browser.settle_timings())
+
+        result = browser.run_actions(
+            [{"action": "type", "element_id": id, "text": f"v{id}"} for id in inputs]
+            + [{"action": "scroll", "element_id": inputs[0]}]
+        )
+        assert result.ok
+        assert [a.action for a in result.actions] == ["type", "type", "scroll"]
+        assert all(a.ms >= 0 for a in result.actions)
+        assert not result.navigated
+        assert result.dom_changed  # typing changes form values
+        assert len(browser.settle_timings()) == settles + 1
+        for id in inputs:
+            value = browser.evaluate(f"document.querySelector(\"[data-dosee-element-id='{id}']\").value")
+            assert value == f"v{id}"
+
+        # A failing action stops the batch
+        result = browser.run_actions(
+            [{"action": "click", "element_id": 10**6}, {"action": "click", "element_id": inputs[0]}]
+        )
+        assert not result.ok
+        assert result.actions[0].error and result.actions[1].skipped
+
+        # Nothing runs if the batch is malformed
+        with pytest.raises(ValueError):
+            browser.run_actions([{"action": "type", "element_id": inputs[0]}])
+        with pytest.raises(ValueError):
+            browser.run_actions([{"action": "hover", "element_id": inputs[0]}])
+    finally:
+        browser.close()
+
+
+def test_page_metrics(httpbin_url, httpbin_available):
+    """Test per-page timings of the site and of DoNew's own steps"""
+    import json
+
+    browser = DO.Browse(metrics=True)
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        browser.text()
+        browser.goto(f"{httpbin_url}/forms/post")
+
+        metrics = browser.metrics()
+        assert [m.url for m in metrics] == [f"{httpbin_url}/html", f"{httpbin_url}/forms/post"]
+        first, current = metrics
+        # The first document's timings were kept when the tab moved on
+        assert first.navigation["load"] > 0
+        assert first.steps["detect"].count >= 1
+        assert first.steps["text"].count == 1
+        assert current.navigation["ttfb"] >= 0
+        assert isinstance(current.long_tasks, list)
+        assert current.settle
+
+        exported = json.loads(json.dumps(current.to_dict()))
+        assert exported["steps"]["detect"]["total_ms"] >= 0
+    finally:
+        browser.close()
+
+
+def test_page_metrics_off(httpbin_url, httpbin_available):
+    """Test that site timings are neither observed nor kept unless metrics are on"""
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/html")
+        browser.goto(f"{httpbin_url}/forms/post")
+
+        first, current = browser.metrics()
+        assert first.navigation == {}
+        assert current.long_tasks == []
+        # No observers were installed in the page
+        assert browser.evaluate("window.DoSeePerf === undefined")
+        assert first.steps["detect"].count >= 1
+        assert current.navigation["ttfb"] >= 0
+    finally:
+        browser.close()
+
+
+def test_browser_spans(httpbin_url, httpbin_available):
+    """Test that navigation, detection, text and actions emit spans when tracing is on"""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    from donew.see.processors import telemetry
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    telemetry.enable(provider)
+    browser = DO.Browse()
+    try:
+        browser.goto(f"{httpbin_url}/forms/post")
+        browser.text()
+        browser.image()
+        input_id = next(
+            id for id, elem in browser.elements().items() if elem.element_type == "input"
+        )
+        browser.click(input_id)
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert {"donew.goto", "donew.navigation", "donew.detect", "donew.text", "donew.image", "donew.click"} <= set(spans)
+        assert spans["donew.detect"].attributes["donew.element_count"] > 0
+        assert spans["donew.text"].attributes["donew.payload_bytes"] > 0
+        assert spans["donew.image"].attributes["donew.payload_bytes"] > 0
+        assert "donew.settle_ms" in spans["donew.navigation"].attributes
+        assert spans["donew.click"].attributes["donew.profile"] == "human"
+    finally:
+        browser.close()
+        telemetry.disable()
+
+
+def test_none_options_use_defaults():
+    """Test that None for a config option means its defaults"""
+    processor = WebProcessor(settle=None, history=None)
+    assert processor._settle_config.quiet_ms == 300
+    assert processor._history.keep is None
+
+
+def test_page_history_from_interaction_log():
+    """Test that a page's history is read back from the bounded session log"""
+    log = InteractionLog(capacity=3)
+    first = WebPage(_log=log, _number=0)
+    second = WebPage(_log=log, _number=1)
+    first._record(Interaction(-1, "goto", 1.0, {"url": "https://example.com/a"}))
+    second._record(Interaction(-1, "goto", 2.0, {"url": "https://example.com/b"}))
+    first._record(Interaction(5, "click", 3.0))
+    first._record(Interaction(5, "click", 4.0))
+
+    # The first record fell out of the ring buffer
+    assert [entry[0] for entry in first.interaction_history()] == [3.0, 4.0]
+    assert [i.interaction_type for i in second.interactions()] == ["goto"]
+    assert second.interaction_history()[0][2] == {"url": "https://example.com/b"}
+
+
+def test_settle_zero_timeout():
+    """Test that an explicit zero timeout checks the page without waiting"""
+    from donew.see.processors.settle import SettleConfig, SettleDetector
+
+    class QuietPage:
+        url = "about:blank"
+
+        def on(self, event, handler):
+            pass
+
+        async def evaluate(self, script, arg):
+            raise AssertionError("a zero timeout must not wait on the page")
+
+    detector = SettleDetector(QuietPage(), "", SettleConfig(timeout_ms=5000))
+    timing = run_sync(detector.wait(timeout_ms=0))
+    assert timing.timed_out
+    assert timing.total_ms < 100
+    assert timing.pending_requests == 0